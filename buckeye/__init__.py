@@ -1,9 +1,18 @@
 from __future__ import absolute_import
 
 from .buckeye import SPEAKERS
-from .buckeye import Speaker, Track
-from .buckeye import corpus
+from .buckeye import Speaker, Track, LazyTracks, TrackCache
+from .buckeye import corpus, corpus_parallel
 from .buckeye import process_logs, process_phones, process_words
+from .buckeye import align_words
+
+from .db import CorpusDB
+
+from .index import CorpusIndex
+
+from .search import PhoneSearch, PhoneMatch
+
+from .table import TrackTable, Vocabulary
 
 from .utterance import Utterance
-from .utterance import words_to_utterances
+from .utterance import words_to_utterances, utterance_bounds
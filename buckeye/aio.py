@@ -0,0 +1,277 @@
+"""Load the corpus from asyncio code without blocking the event loop.
+
+Reading and parsing the zipped archives happens in an executor (a pool of
+threads by default), and the number of archives that are loaded at once
+is limited by a semaphore that is shared by every call on the same
+`AsyncLoader`::
+
+    from buckeye.aio import AsyncLoader
+
+    loader = AsyncLoader(limit=4)
+
+    async def main():
+        speaker = await loader.speaker_from_zip('s01.zip')
+
+        async for track in loader.tracks('s02.zip'):
+            ...
+
+This module requires Python 3.6 or later, and it is not imported by
+``import buckeye``.
+
+"""
+
+import asyncio
+import functools
+import glob
+import os
+import re
+import zipfile
+
+from .buckeye import Speaker, Track, TRACK_RE
+from .buckeye import _open_track
+
+
+class AsyncLoader(object):
+    """Load speaker and track archives in an executor, with a limit on how
+    many are loaded at once.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        Executor that reads and parses the archives. Default is None,
+        which uses the default executor of the event loop (a pool of
+        threads).
+
+    limit : int, optional
+        Maximum number of archives that are read and parsed at once, over
+        every call on this loader in the same event loop. Default is 4.
+
+    Attributes
+    ----------
+    executor : concurrent.futures.Executor or None
+
+    limit : int
+
+    """
+
+    def __init__(self, executor=None, limit=4):
+        if limit < 1:
+            raise ValueError('limit must be at least 1')
+
+        self.executor = executor
+        self.limit = limit
+
+        # a semaphore belongs to one event loop, so it is created on first
+        # use, and again if the loader is used from another loop
+        self._loop = None
+        self._semaphore = None
+
+    def __repr__(self):
+        return 'AsyncLoader(executor={}, limit={})'.format(self.executor,
+                                                          self.limit)
+
+    async def _run(self, func, *args, **kwargs):
+        """Call a function in the executor, once the semaphore allows."""
+
+        loop = _running_loop()
+
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs))
+
+    async def track_from_zip(self, path, data=None, load_wav=False,
+                             cache_dir=None, align_phones=True,
+                             parser='default', stream=False):
+        """Return a Track instance from a zip file, as in
+        `Track.from_zip`, without blocking the event loop.
+
+        If `data` is given, it must not be used by anything else while
+        the track is loaded.
+
+        Returns
+        -------
+        Track
+
+        """
+
+        return await self._run(Track.from_zip, path, data, load_wav,
+                               cache_dir, align_phones, parser, stream)
+
+    async def speaker_from_zip(self, path, load_wavs=False, cache_dir=None,
+                               stream=False):
+        """Return a Speaker instance from a zip file, as in
+        `Speaker.from_zip`, without blocking the event loop.
+
+        The track archives are loaded concurrently, up to the limit of
+        this loader.
+
+        Parameters
+        ----------
+        path : str
+            Path to a zipped speaker archive (e.g., 's01.zip').
+
+        load_wavs : bool or str, optional
+            Whether to read or extract the .wav files (see
+            `Speaker.from_zip`). Default is False.
+
+        cache_dir : str, optional
+            Directory for a persistent cache of the parsed annotations
+            (see `Speaker.from_zip`). Default is None.
+
+        stream : bool, optional
+            If True, the annotation files are decoded and parsed as they
+            are read (see `Speaker.from_zip`). Default is False.
+
+        Returns
+        -------
+        Speaker
+
+        """
+
+        tracks = [track async for track in
+                  self.tracks(path, load_wavs, cache_dir, stream)]
+
+        return Speaker(_speaker_name(path), tracks)
+
+    async def tracks(self, path, load_wavs=False, cache_dir=None,
+                     stream=False):
+        """Yield Track instances from a zipped speaker archive, in the
+        same order as `Speaker.from_zip`.
+
+        Every track archive is scheduled at once, so later tracks are
+        loaded (up to the limit of this loader) while earlier ones are
+        being used. Tracks that are not reached are cancelled if the
+        iteration stops early.
+
+        Parameters
+        ----------
+        path : str
+            Path to a zipped speaker archive (e.g., 's01.zip').
+
+        load_wavs, cache_dir, stream
+            See `speaker_from_zip`.
+
+        Yields
+        ------
+        Track
+
+        """
+
+        zip_paths = await self._run(_track_paths, path)
+
+        jobs = [asyncio.ensure_future(self._run(_open_track, path, zip_path,
+                                                load_wavs, cache_dir,
+                                                stream))
+                for zip_path in zip_paths]
+
+        try:
+            for job in jobs:
+                yield await job
+
+        finally:
+            for job in jobs:
+                job.cancel()
+
+    async def corpus(self, path, load_wavs=False, cache_dir=None,
+                     stream=False):
+        """Yield Speaker instances from a folder of zipped speaker
+        archives, as in `buckeye.corpus`, without blocking the event loop.
+
+        Parameters
+        ----------
+        path : str
+            Path to a directory containing the zipped speaker archives.
+
+        load_wavs, cache_dir, stream
+            See `speaker_from_zip`.
+
+        Yields
+        ------
+        Speaker
+
+        """
+
+        zip_paths = sorted(glob.glob(os.path.join(path, 's[0-4][0-9].zip')))
+
+        for zip_path in zip_paths:
+            yield await self.speaker_from_zip(zip_path, load_wavs, cache_dir,
+                                              stream)
+
+
+async def track_from_zip(path, data=None, load_wav=False, cache_dir=None,
+                         align_phones=True, parser='default', stream=False):
+    """Return a Track instance from a zip file, as in `Track.from_zip`,
+    in the default executor of the event loop.
+
+    Returns
+    -------
+    Track
+
+    """
+
+    return await AsyncLoader(limit=1).track_from_zip(
+        path, data, load_wav, cache_dir, align_phones, parser, stream)
+
+
+async def speaker_from_zip(path, load_wavs=False, cache_dir=None,
+                           stream=False, limit=4):
+    """Return a Speaker instance from a zip file, as in
+    `Speaker.from_zip`, loading up to `limit` track archives at once.
+
+    Returns
+    -------
+    Speaker
+
+    """
+
+    return await AsyncLoader(limit=limit).speaker_from_zip(
+        path, load_wavs, cache_dir, stream)
+
+
+async def corpus(path, load_wavs=False, cache_dir=None, stream=False,
+                 limit=4):
+    """Yield Speaker instances from a folder of zipped speaker archives,
+    as in `buckeye.corpus`, loading up to `limit` track archives at once.
+
+    Yields
+    ------
+    Speaker
+
+    """
+
+    async for speaker in AsyncLoader(limit=limit).corpus(path, load_wavs,
+                                                         cache_dir, stream):
+        yield speaker
+
+
+def _running_loop():
+    """Return the event loop that is running the current coroutine."""
+
+    # get_running_loop is new in Python 3.7, and get_event_loop is
+    # deprecated in coroutines in later versions
+    try:
+        get_loop = asyncio.get_running_loop
+
+    except AttributeError:
+        get_loop = asyncio.get_event_loop
+
+    return get_loop()
+
+
+def _speaker_name(path):
+    """Return the name of a speaker from the path to its archive."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _track_paths(path):
+    """Return the sorted names of the track archives in a speaker
+    archive."""
+
+    with zipfile.ZipFile(path) as speaker:
+        return [zip_path for zip_path in sorted(speaker.namelist())
+                if re.match(TRACK_RE, zip_path)]
+
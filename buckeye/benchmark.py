@@ -0,0 +1,624 @@
+"""Benchmarks for parsing, alignment, segmentation, clipping and cached
+loading, using synthetic tracks and speaker archives (see
+`buckeye.synth`).
+
+Run from the command line with ``python -m buckeye.benchmark``. Use the
+``--json`` option to print the results in a form that can be saved and
+compared between versions.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from . import fastparse
+from .buckeye import Speaker, Track, corpus
+from .buckeye import process_logs, process_phones, process_words
+from .containers import Word, Pause, LogEntry, Phone
+from .stats import clock
+from .synth import synthetic_speaker, synthetic_track, synthetic_wav
+from .utterance import Utterance, words_to_utterances, _utterance_ranges
+
+
+def measure(func, *args, **kwargs):
+    """Call a function and return its result, with the elapsed wall time
+    and the memory allocated during the call.
+
+    The function is called twice: once to time it, and once more with
+    `tracemalloc` running to measure memory, since tracing slows down
+    allocation-heavy code considerably.
+
+    Parameters
+    ----------
+    func : callable
+
+    *args, **kwargs
+        Arguments to pass to `func`. They must be reusable, so pass a
+        function that opens any files itself.
+
+    Returns
+    -------
+    result
+        The value returned by `func`.
+
+    stats : dict
+        Elapsed wall time in 'seconds', peak memory in 'peak_bytes', and
+        memory that is still allocated after the call (mostly the result)
+        in 'retained_bytes'. The memory values are None if `tracemalloc`
+        is not available.
+
+    """
+
+    gc.collect()
+
+    start = clock()
+    result = func(*args, **kwargs)
+    stats = {'seconds': clock() - start,
+             'peak_bytes': None, 'retained_bytes': None}
+
+    if tracemalloc is None:
+        return result, stats
+
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+
+    try:
+        result = func(*args, **kwargs)
+        stats['retained_bytes'], stats['peak_bytes'] = \
+            tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return result, stats
+
+
+def bench_parse(words=100000, seed=0):
+    """Return timing and memory results for parsing the annotation files
+    of one synthetic track, without constructing a Track.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+
+    def parse():
+        return (list(process_words(io.StringIO(files['.words']))) +
+                list(process_phones(io.StringIO(files['.phones']))) +
+                list(process_logs(io.StringIO(files['.log']))))
+
+    entries, stats = measure(parse)
+
+    stats['stage'] = 'parse'
+    stats['entries'] = len(entries)
+    stats['entries_per_second'] = len(entries) / stats['seconds']
+
+    return stats
+
+
+def bench_track(words=100000, seed=0):
+    """Return timing and memory results for constructing one synthetic
+    Track from its annotation files.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+
+    def load():
+        return Track('bench',
+                     io.StringIO(files['.words']),
+                     io.StringIO(files['.phones']),
+                     io.StringIO(files['.log']),
+                     io.StringIO(files['.txt']))
+
+    track, stats = measure(load)
+
+    entries = len(track.words) + len(track.phones) + len(track.log)
+
+    stats['stage'] = 'track'
+    stats['entries'] = entries
+    stats['entries_per_second'] = entries / stats['seconds']
+
+    if stats['retained_bytes'] is not None:
+        stats['bytes_per_entry'] = stats['retained_bytes'] / entries
+
+    return stats
+
+
+def bench_entries(words=100000, seed=0, baseline=False):
+    """Return timing and memory results for constructing the Word, Pause,
+    Phone and LogEntry instances of one synthetic track from parsed
+    columns.
+
+    The columns are parsed before the measurement, so 'bytes_per_entry'
+    is the size of the instances themselves.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    baseline : bool, optional
+        If True, the instances are built with `__init__` from copies of
+        the classes without `__slots__`, which store their attributes in
+        a `__dict__` as the classes did before. Default is False.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+
+    word_columns = fastparse.parse_words(files['.words'])
+    phone_columns = fastparse.parse_phones(files['.phones'])
+    log_columns = fastparse.parse_logs(files['.log'])
+
+    # the timestamps are converted first, so that they aren't counted
+    for columns in (word_columns, phone_columns, log_columns):
+        columns['beg'] = columns['beg'].tolist()
+        columns['end'] = columns['end'].tolist()
+
+    if baseline:
+        new_word, new_pause, new_phone, new_log_entry = (
+            _unslotted(cls) for cls in (Word, Pause, Phone, LogEntry))
+
+    else:
+        new_word, new_pause, new_phone, new_log_entry = (
+            Word._new, Pause._new, Phone._new, LogEntry._new)
+
+    def build():
+        return ([new_pause(label, beg, end) if pause else
+                 new_word(label, beg, end, phonemic, phonetic, pos)
+                 for label, beg, end, phonemic, phonetic, pos, pause in
+                 zip(word_columns['label'], word_columns['beg'],
+                     word_columns['end'], word_columns['phonemic'],
+                     word_columns['phonetic'], word_columns['pos'],
+                     word_columns['pause'])] +
+                list(map(new_phone, phone_columns['seg'],
+                         phone_columns['beg'], phone_columns['end'])) +
+                list(map(new_log_entry, log_columns['entry'],
+                         log_columns['beg'], log_columns['end'])))
+
+    entries, stats = measure(build)
+
+    stats['stage'] = 'entries_baseline' if baseline else 'entries'
+    stats['entries'] = len(entries)
+    stats['entries_per_second'] = len(entries) / stats['seconds']
+
+    if stats['retained_bytes'] is not None:
+        stats['bytes_per_entry'] = stats['retained_bytes'] / len(entries)
+
+    return stats
+
+
+def bench_align(words=100000, seed=0):
+    """Return timing results for linking the words in one synthetic track
+    to their phones (see `Track.align_phones`).
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+    track = Track('bench', *(io.StringIO(files[extension]) for extension in
+                             ('.words', '.phones', '.log', '.txt')),
+                  align_phones=False)
+
+    _, stats = measure(track.align_phones)
+
+    entries = len(track.words) + len(track.phones)
+
+    stats['stage'] = 'align'
+    stats['entries'] = entries
+    stats['entries_per_second'] = entries / stats['seconds']
+
+    return stats
+
+
+def bench_utterances(words=100000, seed=0, sep=float('inf'),
+                     baseline=False):
+    """Return timing results for segmenting one synthetic track into
+    utterances.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    sep : float, optional
+        Pause duration that separates utterances (see
+        `words_to_utterances`). The default of infinity puts the whole
+        track into one utterance, which is the worst case for building
+        long utterances. Default is inf.
+
+    baseline : bool, optional
+        If True, each utterance is built with the `Utterance.append`
+        method from before it had a fast path for items in order, which
+        scans and sorts the whole utterance for each item. This takes
+        quadratic time, so use a small number of `words`. Default is
+        False.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+    entries = list(process_words(io.StringIO(files['.words'])))
+
+    if baseline:
+        segment = _sorting_utterances
+
+    else:
+        segment = words_to_utterances
+
+    utterances, stats = measure(lambda: list(segment(entries, sep)))
+
+    stats['stage'] = 'utterances_baseline' if baseline else 'utterances'
+    stats['entries'] = len(entries)
+    stats['utterances'] = len(utterances)
+    stats['entries_per_second'] = len(entries) / stats['seconds']
+
+    return stats
+
+
+def bench_clips(words=2000, seed=0, batch=False):
+    """Return timing results for writing a .wav clip of every word in one
+    synthetic track.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the synthetic .words file. The .wav file
+        takes about 10 kB per word. Default is 2000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    batch : bool, optional
+        If True, the clips are written with one call to
+        `Track.clip_wavs`, instead of one call to `Track.clip_wav` for
+        each clip. Default is False.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    files = synthetic_track(words, seed)
+    duration = max(word.end for word in
+                   process_words(io.StringIO(files['.words'])))
+    wav = synthetic_wav(duration + 1.0, seed=seed)
+
+    track = Track('bench', *(io.StringIO(files[extension]) for extension in
+                             ('.words', '.phones', '.log', '.txt')),
+                  wav=io.BytesIO(wav))
+
+    intervals = [('{:06d}'.format(i), word.beg, word.end)
+                 for i, word in enumerate(track.words)]
+
+    folder = tempfile.mkdtemp()
+
+    def clip():
+        if batch:
+            track.clip_wavs(intervals, folder)
+
+        else:
+            for name, beg, end in intervals:
+                track.clip_wav(os.path.join(folder, name + '.wav'), beg, end)
+
+    try:
+        _, stats = measure(clip)
+
+    finally:
+        shutil.rmtree(folder)
+
+    stats['stage'] = 'clips_batch' if batch else 'clips'
+    stats['clips'] = len(intervals)
+    stats['clips_per_second'] = len(intervals) / stats['seconds']
+
+    return stats
+
+
+def bench_speaker(words=10000, seed=0, tracks=3, wav=True, stream=False):
+    """Return timing and memory results for loading a synthetic zipped
+    speaker archive with nested track archives.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in each synthetic .words file. Default is 10000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    tracks : int, optional
+        Number of tracks in the speaker archive. Default is 3.
+
+    wav : bool, optional
+        If True, the track archives include .wav files, which are not
+        loaded but take up most of the space in the archive, as in the
+        Buckeye Corpus. Default is True.
+
+    stream : bool, optional
+        Passed to `Speaker.from_zip`. Default is False.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    folder = tempfile.mkdtemp()
+
+    try:
+        path = synthetic_speaker(folder, tracks=tracks, words=words,
+                                 seed=seed, wav=wav)
+
+        speaker, stats = measure(Speaker.from_zip, path, stream=stream)
+
+    finally:
+        shutil.rmtree(folder)
+
+    entries = sum(len(track.words) + len(track.phones) + len(track.log)
+                  for track in speaker)
+
+    stats['stage'] = 'speaker_stream' if stream else 'speaker'
+    stats['tracks'] = len(speaker.tracks)
+    stats['tracks_per_second'] = len(speaker.tracks) / stats['seconds']
+    stats['entries'] = entries
+    stats['entries_per_second'] = entries / stats['seconds']
+
+    return stats
+
+
+def bench_cache(words=10000, seed=0, speakers=2, tracks=3):
+    """Return timing and memory results for loading a folder of
+    synthetic speaker archives from a warm cache (see `buckeye.cache`).
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in each synthetic .words file. Default is 10000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    speakers : int, optional
+        Number of speaker archives. Default is 2.
+
+    tracks : int, optional
+        Number of tracks in each speaker archive. Default is 3.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    folder = tempfile.mkdtemp()
+    cache_dir = os.path.join(folder, 'cache')
+
+    def load():
+        return list(corpus(folder, cache_dir=cache_dir))
+
+    try:
+        for i in range(speakers):
+            synthetic_speaker(folder, 's{:02d}'.format(i + 1), tracks=tracks,
+                              words=words, seed=seed + i * tracks)
+
+        # the first load parses the tracks and fills the cache
+        load()
+        loaded, stats = measure(load)
+
+    finally:
+        shutil.rmtree(folder)
+
+    entries = sum(len(track.words) + len(track.phones) + len(track.log)
+                  for speaker in loaded for track in speaker)
+
+    stats['stage'] = 'cache'
+    stats['tracks'] = sum(len(speaker.tracks) for speaker in loaded)
+    stats['tracks_per_second'] = stats['tracks'] / stats['seconds']
+    stats['entries'] = entries
+    stats['entries_per_second'] = entries / stats['seconds']
+
+    return stats
+
+
+def run(words=100000, seed=0, clip_words=2000, speaker_words=10000,
+        baseline_words=2000):
+    """Run every benchmark and return a list of the results.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of .words entries in the synthetic track for the parsing,
+        alignment and segmentation benchmarks. Default is 100000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    clip_words : int, optional
+        Number of .words entries for the clipping benchmarks. Default is
+        2000.
+
+    speaker_words : int, optional
+        Number of .words entries in each track for the speaker archive
+        benchmarks. Default is 10000.
+
+    baseline_words : int, optional
+        Number of .words entries for the 'utterances_baseline' stage,
+        which takes quadratic time. Default is 2000.
+
+    Returns
+    -------
+    results : list of dict
+        One dict for each stage, with the name of the stage in 'stage'.
+
+    """
+
+    return [bench_parse(words, seed),
+            bench_track(words, seed),
+            bench_entries(words, seed),
+            bench_entries(words, seed, baseline=True),
+            bench_align(words, seed),
+            bench_utterances(words, seed),
+            bench_utterances(baseline_words, seed, baseline=True),
+            bench_clips(clip_words, seed),
+            bench_clips(clip_words, seed, batch=True),
+            bench_speaker(speaker_words, seed),
+            bench_speaker(speaker_words, seed, stream=True),
+            bench_cache(speaker_words, seed)]
+
+
+def main(argv=None):
+    """Run the benchmarks and print the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--words', type=int, default=100000,
+                        help='number of .words entries in the synthetic track')
+    parser.add_argument('--clip-words', type=int, default=2000,
+                        help='number of .words entries for the clip stages')
+    parser.add_argument('--speaker-words', type=int, default=10000,
+                        help='number of .words entries in each track for the '
+                             'speaker stages')
+    parser.add_argument('--baseline-words', type=int, default=2000,
+                        help='number of .words entries for the utterance '
+                             'baseline stage')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed for the synthetic annotations')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+
+    args = parser.parse_args(argv)
+
+    results = run(args.words, args.seed, args.clip_words, args.speaker_words,
+                  args.baseline_words)
+
+    if args.json:
+        report = {'python': platform.python_version(),
+                  'platform': platform.platform(),
+                  'options': vars(args),
+                  'results': results}
+
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+        return
+
+    for stats in results:
+        for key in sorted(stats):
+            print('{:>20}: {}'.format(key, stats[key]))
+
+        print()
+
+
+def _unslotted(cls):
+    """Return a copy of a container class without `__slots__`, so that
+    its instances store their attributes in a `__dict__`."""
+
+    namespace = dict((name, value) for name, value in vars(cls).items()
+                     if name not in cls.__slots__ and name != '__slots__')
+
+    return type(str(cls.__name__), (object,), namespace)
+
+
+class _SortingUtterance(Utterance):
+    """Utterance with the `append` method from before it had a fast path
+    for items in chronological order."""
+
+    def append(self, item):
+        beg = float(item.beg)
+        end = float(item.end)
+
+        if beg > end:
+            raise ValueError('Item beg timestamp: {0} is after item end '
+                             'timestamp: {1}'.format(item.beg, item.end))
+
+        for word in self._words:
+            if float(word.beg) > beg and float(word.beg) <= end:
+                raise ValueError('Item overlaps with existing items in '
+                                 'utterance')
+
+        self._words.append(item)
+        self._words = sorted(self._words, key=lambda word: float(word.beg))
+
+
+def _sorting_utterances(words, sep=0.5):
+    """Yield the same utterances as `words_to_utterances`, appending each
+    item with `_SortingUtterance.append`."""
+
+    for start, stop in _utterance_ranges(words, sep):
+        utt = _SortingUtterance()
+
+        for word in words[start:stop]:
+            utt.append(word)
+
+        yield utt
+
+
+if __name__ == '__main__':
+    main()
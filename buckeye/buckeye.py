@@ -8,15 +8,49 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 
+import array
 import bisect
+import collections
+import errno
 import glob
 import io
+import mmap
 import os.path
 import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
 import wave
 import zipfile
 
-from .containers import Word, Pause, LogEntry, Phone
+from concurrent import futures
+
+from . import cache
+from . import fastparse
+from . import stats
+from .containers import Word, Pause, LogEntry, Phone, SYLLABIC
+from .containers import _phone_range
+from .index import IntervalIndex
+from .table import TrackTable
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+# on Python 2, mmap objects don't support memoryview, and NumPy can't read
+# from a memoryview, so frames are returned as buffer objects instead
+try:
+    buffer_type = buffer
+except NameError:
+    buffer_type = None
 
 
 SPEAKERS = {'s01': ('f', 'y', 'f'), 's02': ('f', 'o', 'm'),
@@ -84,7 +118,8 @@ class Speaker(object):
         self.tracks = tracks
 
     @classmethod
-    def from_zip(cls, path, load_wavs=False):
+    def from_zip(cls, path, load_wavs=False, workers=None, cache_dir=None,
+                 lazy=False, max_tracks=None, threads=None, stream=False):
         """Return a Speaker instance from a zip file.
 
         Parameters
@@ -92,9 +127,54 @@ class Speaker(object):
         path : str
             Path to a zipped speaker archive (e.g., 's01.zip').
 
-        load_wavs : bool, optional
+        load_wavs : bool or str, optional
             If True, the .wav files in the archive are read into the Track
-            instances, in addition to the text annotations. Default is False.
+            instances, in addition to the text annotations. If a path to a
+            directory, the .wav files are extracted there instead (see
+            `Track.from_zip`). Default is False.
+
+        workers : int, optional
+            If given, the tracks in the archive are parsed in a pool of
+            this many processes instead of one after another. Default is
+            None.
+
+        cache_dir : str, optional
+            Directory for a persistent cache of the parsed annotations (see
+            `buckeye.cache`). Tracks that are already in the cache are not
+            parsed again, unless the speaker archive has changed since they
+            were stored. Default is None.
+
+        lazy : bool, optional
+            If True, only the names of the track archives are read, and
+            each Track is parsed the first time it is accessed through
+            the Speaker instance. `workers` is ignored. Default is False.
+
+        max_tracks : int, optional
+            If `lazy` is True, the maximum number of parsed Track
+            instances that the Speaker keeps a reference to. The least
+            recently used Track is dropped when another one is parsed.
+            Default is None, which keeps every parsed Track.
+
+        threads : int, optional
+            If given, the track archives are read, decompressed and
+            parsed in a pool of this many threads, each with its own
+            handle on the speaker archive. zlib releases the GIL while it
+            decompresses, so the decompression of one track (and
+            especially of its .wav files) can overlap with the parsing of
+            another, but only one thread at a time runs the parser. Use
+            `workers` to parse in parallel. Ignored if `workers` or `lazy`
+            is given. Default is None.
+
+        stream : bool, optional
+            If True, each track archive is opened directly from the
+            speaker archive, and its annotation files are decoded and
+            parsed as they are read (see `Track.from_zip`), instead of
+            copying the track archive and then each annotation file into
+            memory first. The .wav files are not read unless `load_wavs`
+            is given. This keeps peak memory for each track close to the
+            size of its annotations, but seeking inside a compressed
+            track archive may take more time. Ignored if `workers` is
+            given. Default is False.
 
         Returns
         -------
@@ -104,16 +184,61 @@ class Speaker(object):
 
         name = os.path.splitext(os.path.basename(path))[0]
 
-        tracks = []
-
         speaker = zipfile.ZipFile(path)
 
-        for zip_path in sorted(speaker.namelist()):
-            if re.match(TRACK_RE, zip_path):
-                data = zipfile.ZipFile(io.BytesIO(speaker.read(zip_path)))
-                tracks.append(Track.from_zip(zip_path, data, load_wavs))
+        zip_paths = [zip_path for zip_path in sorted(speaker.namelist())
+                     if re.match(TRACK_RE, zip_path)]
+
+        if lazy:
+            speaker.close()
+
+            return cls(name, LazyTracks(path, zip_paths, load_wavs,
+                                        cache_dir, max_tracks, stream))
+
+        # the entries of a speaker don't form reference cycles, so the
+        # cyclic garbage collector only slows down building them
+        with stats.call('Speaker.from_zip', name), cache._paused_gc():
+            if cache_dir is None:
+                tracks = [None] * len(zip_paths)
+
+            else:
+                tracks = [_read_cached_track(speaker, path, zip_path,
+                                             load_wavs, cache_dir)
+                          for zip_path in zip_paths]
+
+            missing = [i for i, track in enumerate(tracks) if track is None]
+
+            if workers is None and threads is not None and missing:
+                with futures.ThreadPoolExecutor(threads) as executor:
+                    jobs = [executor.submit(_read_track, path, zip_paths[i],
+                                            load_wavs, stream)
+                            for i in missing]
+
+                    for i, job in zip(missing, jobs):
+                        tracks[i] = job.result()
+
+            elif workers is None:
+                for i in missing:
+                    data = _open_archive(speaker, zip_paths[i], stream)
+                    tracks[i] = Track.from_zip(zip_paths[i], data, load_wavs,
+                                               stream=stream)
+
+            elif missing:
+                with futures.ProcessPoolExecutor(workers) as executor:
+                    jobs = [executor.submit(_load_track, zip_paths[i],
+                                            speaker.read(zip_paths[i]),
+                                            load_wavs)
+                            for i in missing]
+
+                    for i, job in zip(missing, jobs):
+                        tracks[i] = _unpack_track(job.result())
+
+            speaker.close()
 
-        speaker.close()
+            if cache_dir is not None:
+                for i in missing:
+                    _store_cached_track(cache_dir, path, zip_paths[i],
+                                        tracks[i])
 
         return cls(name, tracks)
 
@@ -130,6 +255,313 @@ class Speaker(object):
         return '<Speaker {} ({}, {})>'.format(self.name, self.sex, self.age)
 
 
+class LazyTracks(object):
+    """Sequence of Track instances that are parsed when first accessed.
+
+    Used for the `tracks` attribute of a Speaker instance that is created
+    with `Speaker.from_zip(path, lazy=True)`.
+
+    Parameters
+    ----------
+    path : str
+        Path to a zipped speaker archive (e.g., 's01.zip').
+
+    zip_paths : list of str
+        Paths of the zipped track archives inside the speaker archive
+        (e.g., 's01/s0101a.zip'), in order.
+
+    load_wavs : bool or str, optional
+        If True, the .wav files are read into the Track instances. If a
+        path to a directory, they are extracted there and memory-mapped.
+        Default is False.
+
+    cache_dir : str, optional
+        Directory for a persistent cache of the parsed annotations.
+        Default is None.
+
+    max_tracks : int, optional
+        Maximum number of parsed Track instances to keep a reference to.
+        The least recently used Track is closed when it is dropped.
+        Default is None, which keeps every parsed Track.
+
+    stream : bool, optional
+        If True, each track archive is decoded and parsed as it is read
+        (see `Speaker.from_zip`). Default is False.
+
+    Attributes
+    ----------
+    names : list of str
+        Names of the tracks (e.g., 's0101a'), in order.
+
+    """
+
+    def __init__(self, path, zip_paths, load_wavs=False, cache_dir=None,
+                 max_tracks=None, stream=False):
+        self._path = path
+        self._zip_paths = zip_paths
+        self._load_wavs = load_wavs
+        self._cache_dir = cache_dir
+        self._max_tracks = max_tracks
+        self._stream = stream
+
+        self._loaded = collections.OrderedDict()
+
+        self.names = [os.path.splitext(os.path.basename(zip_path))[0]
+                      for zip_path in zip_paths]
+
+    def __repr__(self):
+        return 'LazyTracks({}, {})'.format(repr(self._path),
+                                           repr(self._zip_paths))
+
+    def __len__(self):
+        return len(self._zip_paths)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        zip_path = self._zip_paths[i]
+
+        try:
+            track = self._loaded.pop(zip_path)
+
+        except KeyError:
+            track = self._load(zip_path)
+
+        # keep the most recently used track at the end
+        self._loaded[zip_path] = track
+
+        if self._max_tracks is not None:
+            while len(self._loaded) > self._max_tracks:
+                _, evicted = self._loaded.popitem(last=False)
+                evicted.close()
+
+        return track
+
+    def _load(self, zip_path):
+        """Parse and return the Track for one of the track archives."""
+        return _open_track(self._path, zip_path, self._load_wavs,
+                           self._cache_dir, self._stream)
+
+
+class TrackCache(object):
+    """Least-recently-used cache of Track instances, opened by name from
+    a folder of zipped speaker archives.
+
+    Parameters
+    ----------
+    path : str
+        Path to a directory containing the zipped speaker archives in the
+        Buckeye Corpus (s01.zip, s02.zip, ..., s40.zip).
+
+    load_wavs : bool or str, optional
+        If True, the .wav files are read into the Track instances. If a
+        path to a directory, they are extracted there and memory-mapped
+        (see `Track.from_zip`). Default is False.
+
+    max_tracks : int, optional
+        Maximum number of Track instances to keep. Default is None, which
+        sets no limit.
+
+    max_bytes : int, optional
+        Maximum estimated memory use of the Track instances to keep (see
+        `track_size`). Default is None, which sets no limit.
+
+    cache_dir : str, optional
+        Directory for a persistent cache of the parsed annotations (see
+        `Speaker.from_zip`). Default is None.
+
+    stream : bool, optional
+        If True, each track archive is decoded and parsed as it is read
+        (see `Speaker.from_zip`). Default is False.
+
+    Attributes
+    ----------
+    hits : int
+        Number of calls to `get` that returned a cached Track.
+
+    misses : int
+        Number of calls to `get` that loaded a Track.
+
+    evictions : int
+        Number of Track instances that were dropped to stay under the
+        limits.
+
+    size : int
+        Estimated memory use of the cached Track instances, in bytes.
+
+    Notes
+    -----
+    When a Track is dropped from the cache, its .wav file is closed (see
+    `Track.close`), so keep a Track for no longer than it is needed after
+    calling `get`. The most recently used Track is always kept, even if
+    it is over `max_bytes` by itself.
+
+    """
+
+    def __init__(self, path, load_wavs=False, max_tracks=None,
+                 max_bytes=None, cache_dir=None, stream=False):
+        self.path = path
+        self._load_wavs = load_wavs
+        self._max_tracks = max_tracks
+        self._max_bytes = max_bytes
+        self._cache_dir = cache_dir
+        self._stream = stream
+
+        self._loaded = collections.OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+    def __repr__(self):
+        return 'TrackCache({})'.format(repr(self.path))
+
+    def __str__(self):
+        return '<TrackCache of {} tracks ({} hits, {} misses)>'.format(
+            len(self), self.hits, self.misses)
+
+    def __len__(self):
+        return len(self._loaded)
+
+    def __contains__(self, name):
+        return name in self._loaded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.clear()
+
+    def get(self, name):
+        """Return a Track by name, loading it if it isn't cached.
+
+        Parameters
+        ----------
+        name : str
+            Name of the track (e.g., 's0101a').
+
+        Returns
+        -------
+        Track
+
+        """
+
+        if not re.match(r's[0-4][0-9]0[0-6][ab]$', name):
+            raise ValueError('Not a track name: {}'.format(name))
+
+        with self._lock:
+            track = self._loaded.pop(name, None)
+
+            if track is not None:
+                self._loaded[name] = track
+                self.hits += 1
+
+                return track
+
+            self.misses += 1
+
+        path = os.path.join(self.path, name[:3] + '.zip')
+        zip_path = '{}/{}.zip'.format(name[:3], name)
+
+        # load outside the lock, so that hits aren't held up by a miss
+        track = _open_track(path, zip_path, self._load_wavs, self._cache_dir,
+                            self._stream)
+        size = track_size(track)
+
+        with self._lock:
+            # another thread may have loaded the same track meanwhile
+            if name in self._loaded:
+                track.close()
+                track = self._loaded.pop(name)
+
+            else:
+                self._sizes[name] = size
+                self.size += size
+
+            self._loaded[name] = track
+            self._evict()
+
+        return track
+
+    def clear(self):
+        """Drop every Track from the cache, closing their .wav files.
+
+        Returns
+        -------
+        None
+
+        """
+
+        with self._lock:
+            while self._loaded:
+                self._drop()
+
+    def _evict(self):
+        """Drop the least recently used Track instances until the cache is
+        under its limits."""
+
+        while len(self._loaded) > 1 and (
+                (self._max_tracks is not None and
+                 len(self._loaded) > self._max_tracks) or
+                (self._max_bytes is not None and
+                 self.size > self._max_bytes)):
+            self._drop()
+            self.evictions += 1
+
+    def _drop(self):
+        """Drop and close the least recently used Track."""
+        name, track = self._loaded.popitem(last=False)
+        self.size -= self._sizes.pop(name)
+        track.close()
+
+
+def track_size(track):
+    """Return an estimate of the memory used by a Track instance.
+
+    Counts the entry instances, their lists of transcribed segments, and
+    a .wav file that is read into memory. Strings that are shared between
+    entries and memory-mapped .wav files are not counted.
+
+    Parameters
+    ----------
+    track : Track
+
+    Returns
+    -------
+    size : int
+        Estimated size in bytes.
+
+    """
+
+    size = sys.getsizeof(track)
+
+    for entries in (track.words, track.phones, track.log):
+        size += sys.getsizeof(entries)
+        size += sum(sys.getsizeof(entry) for entry in entries)
+
+    for word in track.words:
+        for transcription in (getattr(word, '_phonemic', None),
+                              getattr(word, '_phonetic', None)):
+            if transcription is not None:
+                size += sys.getsizeof(transcription)
+
+    wav = getattr(track, 'wav', None)
+
+    if wav is not None and not hasattr(track, '_wav_map'):
+        size += (wav.getnframes() * wav.getsampwidth() *
+                 wav.getnchannels())
+
+    return size
+
+
 class Track(object):
     """Corpus data from one track archive file (e.g., s0101a.zip).
 
@@ -158,7 +590,21 @@ class Track(object):
 
     wav : str or file, optional
         Path to the .wav file associated with this track (e.g.,
-        's0101a.wav'), or an open file(-like) object.
+        's0101a.wav'), or an open file(-like) object. If a path is given,
+        the file is memory-mapped, so that `frames`, `samples` and
+        `clip_wav` only read the requested frames from disk.
+
+    align_phones : bool, optional
+        If True, each Word and Pause is linked to its Phone instances
+        (see `align_phones`). If False, the `phones` attribute of every
+        Word and Pause is None until `align_phones` is called. Default is
+        True.
+
+    parser : str, optional
+        If 'fast', the .words, .phones and .log files are read at once
+        and parsed with `buckeye.fastparse`, instead of one line at a time
+        with `process_words`, `process_phones` and `process_logs`. The
+        entries are the same either way. Default is 'default'.
 
     Attributes
     ----------
@@ -188,53 +634,154 @@ class Track(object):
 
     """
 
-    def __init__(self, name, words, phones, log, txt, wav=None):
-        self.name = name
+    def __init__(self, name, words, phones, log, txt, wav=None,
+                 align_phones=True, parser='default'):
+        if parser not in ('default', 'fast'):
+            raise ValueError('unknown parser: {}'.format(parser))
+
+        with stats.call('Track.__init__', name):
+            # read and store text info
+            if not hasattr(words, 'readline'):
+                words = io.open(words, encoding='latin-1')
+
+            word_entries = _parse(words, parser, process_words,
+                                  fastparse.parse_words, fastparse.to_words)
+            words.close()
 
-        # read and store text info
-        if not hasattr(words, 'readline'):
-            words = io.open(words, encoding='latin-1')
+            if not hasattr(phones, 'readline'):
+                phones = io.open(phones, encoding='latin-1')
 
-        self.words = list(process_words(words))
-        words.close()
+            phone_entries = _parse(phones, parser, process_phones,
+                                   fastparse.parse_phones, fastparse.to_phones)
+            phones.close()
 
-        if not hasattr(phones, 'readline'):
-            phones = io.open(phones, encoding='latin-1')
+            if not hasattr(log, 'readline'):
+                log = io.open(log, encoding='latin-1')
 
-        self.phones = list(process_phones(phones))
-        phones.close()
+            log_entries = _parse(log, parser, process_logs,
+                                 fastparse.parse_logs, fastparse.to_logs)
+            log.close()
 
-        if not hasattr(log, 'readline'):
-            log = io.open(log, encoding='latin-1')
+            if not hasattr(txt, 'readline'):
+                txt = io.open(txt, encoding='latin-1')
+
+            txt_lines = txt.read().splitlines()
+            txt.close()
+
+            self._set_entries(name, word_entries, phone_entries, log_entries,
+                              txt_lines, wav, align_phones)
+
+    def _set_entries(self, name, words, phones, log, txt, wav=None,
+                     align_phones=True):
+        """
+        Private method used to store parsed entries in this track and
+        cross-reference them.
 
-        self.log = list(process_logs(log))
-        log.close()
+        """
 
-        if not hasattr(txt, 'readline'):
-            txt = io.open(txt, encoding='latin-1')
+        self.name = name
 
-        self.txt = txt.read().splitlines()
-        txt.close()
+        self.words = words
+        self.phones = phones
+        self.log = log
+        self.txt = txt
 
         # optionally store the sound file
         if wav is not None:
+            if isinstance(wav, string_types):
+                self._map_wav(wav)
+
             self.wav = wave.open(wav)
 
         # add references in self.words to the corresponding self.phones
-        self._set_phones()
+        if align_phones:
+            with stats.stage('align') as stage:
+                self._set_phones()
+                stage.add(entries=len(self.words))
 
         # make a list of the log entry timestamps to quickly search later
         self._log_begs = [l.beg for l in self.log]
         self._log_ends = [l.end for l in self.log]
 
+    @classmethod
+    def _from_entries(cls, name, words, phones, log, txt, wav=None,
+                      align_phones=True):
+        """Return a Track instance from lists of already-parsed entries."""
+        track = cls.__new__(cls)
+        track._set_entries(name, words, phones, log, txt, wav, align_phones)
+
+        return track
+
     def __repr__(self):
         return 'Track("{}")'.format(self.name)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # indexes are rebuilt on demand by `query`
+        state.pop('_indexes', None)
+
+        # an open wave.Wave_read can't be pickled, so store the path to a
+        # memory-mapped .wav file, or the .wav file contents otherwise
+        if '_wav_path' in state:
+            del state['wav']
+            del state['_wav_map']
+
+        elif 'wav' in state:
+            state['wav'] = _wav_bytes(self.wav)
+
+        return state
+
+    def __setstate__(self, state):
+        if '_wav_path' in state:
+            self._map_wav(state['_wav_path'])
+            state['wav'] = wave.open(state['_wav_path'])
+
+        elif 'wav' in state:
+            state['wav'] = wave.open(io.BytesIO(state['wav']))
+
+        self.__dict__.update(state)
+
+    def _map_wav(self, path):
+        """
+        Private method used to memory-map the .wav file at `path` and
+        find the sample data in it.
+
+        """
+
+        with io.open(path, 'rb') as wav:
+            self._wav_map = mmap.mmap(wav.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._wav_path = path
+        self._wav_data = _wav_data_range(self._wav_map)
+
+    def close(self):
+        """Close the .wav file in this track, if there is one.
+
+        Returns
+        -------
+        None
+
+        """
+
+        if hasattr(self, 'wav'):
+            self.wav.close()
+
+        if hasattr(self, '_wav_map'):
+            try:
+                self._wav_map.close()
+
+            # arrays from `frames` or `samples` still refer to the map, so
+            # leave it open until they are garbage-collected
+            except BufferError:
+                pass
+
     def __str__(self):
         return '<Track {}>'.format(self.name)
 
     @classmethod
-    def from_zip(cls, path, data=None, load_wav=False):
+    def from_zip(cls, path, data=None, load_wav=False, cache_dir=None,
+                 align_phones=True, parser='default', stream=False):
         """Return a Track instance from a zip file.
 
         Parameters
@@ -247,9 +794,30 @@ class Track(object):
             points to a zipped archive nested inside another archive. Default
             is None.
 
-        load_wav : bool, optional
+        load_wav : bool or str, optional
             If True, the .wav file will be read into the Track instance, in
-            addition to the text annotations. Default is False.
+            addition to the text annotations. If a path to a directory,
+            the .wav file is extracted there (unless it has already been
+            extracted) and memory-mapped, instead of being held in memory.
+            Default is False.
+
+        cache_dir : str, optional
+            Directory for a persistent cache of the parsed annotations (see
+            `buckeye.cache`). The cache is only used for track archives that
+            are not nested, when `data` is None. Default is None.
+
+        align_phones : bool, optional
+            If False, Word and Pause instances are not linked to their
+            Phone instances until `Track.align_phones` is called. Default
+            is True.
+
+        parser : str, optional
+            'default' or 'fast' (see `Track`). Default is 'default'.
+
+        stream : bool, optional
+            If True, the annotation files are decoded and parsed as they
+            are read from the archive, instead of being copied into memory
+            first. Ignored on Python 2. Default is False.
 
         Returns
         -------
@@ -257,134 +825,1253 @@ class Track(object):
 
         """
 
-        if data is None:
-            data = zipfile.ZipFile(path)
-
         name = os.path.splitext(os.path.basename(path))[0]
 
-        words = io.StringIO(data.read(name + '.words').decode('latin-1'))
-        phones = io.StringIO(data.read(name + '.phones').decode('latin-1'))
-        log = io.StringIO(data.read(name + '.log').decode('latin-1'))
-        txt = io.StringIO(data.read(name + '.txt').decode('latin-1'))
+        with stats.call('Track.from_zip', name):
+            if data is None and cache_dir is not None:
+                entries = _load_cached_entries(cache_dir, path, path)
 
-        if load_wav:
-            wav = io.BytesIO(data.read(name + '.wav'))
+                if entries is None:
+                    track = cls.from_zip(path, load_wav=load_wav,
+                                         align_phones=align_phones,
+                                         parser=parser, stream=stream)
+                    cache.store_entries(cache_dir, path, path, track.words,
+                                        track.phones, track.log, track.txt)
 
-        else:
-            wav = None
+                    return track
 
-        return cls(name, words, phones, log, txt, wav)
+                with zipfile.ZipFile(path) as data:
+                    wav = _read_wav(data, name, load_wav)
 
-    def _set_phones(self):
-        """
-        Private method used to add references in each Word and Pause
-        instance to the corresponding Phone instances in this track.
+                return _cached_track(name, entries, wav, align_phones)
 
-        Notes
-        -----
-        A Phone is counted as belonging to a Word or Pause if at least
-        half of the Phone's duration occurs between the `beg` and `end`
-        timestamps of the Word or Pause.
+            if data is None:
+                data = zipfile.ZipFile(path)
 
-        """
+            if stream:
+                words = _open_text(data, name + '.words')
+                phones = _open_text(data, name + '.phones')
+                log = _open_text(data, name + '.log')
+                txt = _open_text(data, name + '.txt')
 
-        phone_mids = [p.beg + 0.5 * p.dur for p in self.phones]
+            else:
+                words = _read_text(data, name + '.words')
+                phones = _read_text(data, name + '.phones')
+                log = _read_text(data, name + '.log')
+                txt = _read_text(data, name + '.txt')
 
-        for word in self.words:
-            left = bisect.bisect_left(phone_mids, word.beg)
-            right = bisect.bisect_left(phone_mids, word.end)
+            wav = _read_wav(data, name, load_wav)
 
-            word._phones = self.phones[left:right]
+            return cls(name, words, phones, log, txt, wav, align_phones,
+                       parser)
 
-    def clip_wav(self, clip, beg, end):
-        """Write a new .wav file containing a clip from this track.
+    @classmethod
+    def iter_aligned(cls, path, data=None):
+        """Yield Word and Pause instances from a zipped track archive, one
+        at a time, with their Phone instances attached.
+
+        The .words and .phones files are decoded and parsed as they are
+        read, and the entries are never collected into lists, so memory
+        use stays constant over the track. See `align_words`.
 
         Parameters
         ----------
-        clip : str
-            Path to the new .wav file.
-
-        beg : float
-            Time in the track .wav file where the clip should begin.
+        path : str
+            Path to a zipped track archive (e.g., 's01/s0101a.zip').
 
-        end : float
-            Time in the track .wav file where the clip should end.
+        data : zipfile.ZipFile, optional
+            ZipFile instance containing track data, as in `from_zip`.
+            Default is None.
 
-        Returns
-        -------
-        None
+        Yields
+        ------
+        Word, Pause
+            One instance for each entry in the .words file, in
+            chronological order, with the `phones` attribute set.
 
         """
 
-        framerate = self.wav.getframerate()
-        length = end - beg
+        if data is None:
+            with zipfile.ZipFile(path) as data:
+                for word in cls.iter_aligned(path, data):
+                    yield word
 
-        frames = int(round(length * framerate))
-        beg_frame = int(round(beg * framerate))
+            return
 
-        wav_out = wave.open(clip, 'wb')
+        name = os.path.splitext(os.path.basename(path))[0]
 
-        wav_out.setparams(self.wav.getparams())
-        self.wav.setpos(beg_frame)
-        wav_out.writeframes(self.wav.readframes(frames))
+        words = _open_text(data, name + '.words')
+        phones = _open_text(data, name + '.phones')
 
-        wav_out.close()
+        try:
+            for word in align_words(process_words(words),
+                                    process_phones(phones)):
+                yield word
 
-    def get_logs(self, beg, end):
-        """Return log entries that overlap with a given interval.
+        finally:
+            words.close()
+            phones.close()
 
-        The interval does not include the log entry boundaries. For
-        example, calling `get_logs(1.5, 2)` will not return a log entry
-        that extends from 1.25 seconds to 1.5 seconds, or one that
-        extends from 2 seconds to 2.5 seconds.
+    def as_table(self, labels=None):
+        """Return a column-oriented copy of the entries in this track.
 
         Parameters
         ----------
-        beg : float
-            Beginning of the interval.
-
-        end : float
-            End of the interval.
+        labels : buckeye.table.Vocabulary, optional
+            Vocabulary for the string fields, which can be shared between
+            the tables for several tracks. Default is None, which creates
+            a new one.
 
         Returns
         -------
-        logs : list of LogEntry
-            List of references to the LogEntry instances in this track
-            that overlap with the interval given by `[beg, end]`.
+        TrackTable
 
         """
 
-        left_idx = bisect.bisect(self._log_ends, beg)
-        right_idx = bisect.bisect_left(self._log_begs, end)
-
-        return self.log[left_idx:right_idx]
-
+        return TrackTable.from_track(self, labels)
 
-def corpus(path, load_wavs=False):
-    """Yield Speaker instances from a folder of zipped speaker archives.
+    def align_phones(self):
+        """Link each Word and Pause in this track to its Phone instances.
 
-    Parameters
-    ----------
-    path : str
-        Path to a directory containing all of the zipped speaker archives
-        in the Buckeye Corpus (s01.zip, s02.zip, ..., s40.zip).
+        This is done when the track is constructed, unless it was
+        constructed with `align_phones=False`. Call this again after
+        changing any timestamps.
 
-    load_wavs : bool, optional
-        If True, the .wav files are read into the Track instances in the
-        yielded Speaker instances. Default is False.
+        Notes
+        -----
+        A Phone is counted as belonging to a Word or Pause if at least
+        half of the Phone's duration occurs between the `beg` and `end`
+        timestamps of the Word or Pause.
 
-    Yields
-    ------
-    Speaker
-        One Speaker instance for each zipped speaker archive in the
-        folder given by `path`.
+        Returns
+        -------
+        None
 
-    """
+        """
 
-    zip_paths = sorted(glob.glob(os.path.join(path, 's[0-4][0-9].zip')))
+        self._set_phones()
 
-    for zip_path in zip_paths:
-        yield Speaker.from_zip(zip_path, load_wavs)
+    def _set_phones(self):
+        """
+        Private method used to add references in each Word and Pause
+        instance to the corresponding Phone instances in this track.
+
+        Each entry stores the range of its phones in `self.phones`, and
+        slices it when its `phones` attribute is accessed.
+
+        Notes
+        -----
+        A Phone is counted as belonging to a Word or Pause if at least
+        half of the Phone's duration occurs between the `beg` and `end`
+        timestamps of the Word or Pause.
+
+        """
+
+        phones = self.phones
+        begs, ends = _phone_ranges(phones, self.words)
+
+        for word, left, right in zip(self.words, begs, ends):
+            word._phones = phones
+            word._phone_beg = left
+            word._phone_end = right
+
+            # clear any flags cached by `word_flags`
+            if isinstance(word, Word):
+                word._misaligned = None
+                word._syllables = None
+
+        self.__dict__.pop('_word_flags', None)
+
+    def word_flags(self):
+        """Return the `misaligned` flag and the syllable counts of every
+        entry in this track, and cache them in each Word.
+
+        Everything is computed in one pass over `words`, and syllable
+        counts are only computed once for each distinct transcription.
+        Afterwards, the `misaligned` attribute and the `syllables` method
+        of each Word read from the cache, until `align_phones` is called
+        again.
+
+        Returns
+        -------
+        flags : dict
+            Mapping with one array per key, each with one value for each
+            entry in `words`:
+
+            'misaligned'
+                1 if the entry's `misaligned` attribute is True, else 0.
+
+            'syllables'
+                The result of `syllables()`, or -1 for Pause entries and
+                Word entries without a phonemic transcription.
+
+            'phonetic_syllables'
+                The result of `syllables(phonetic=True)`, or -1 for Pause
+                entries and Word entries without phones or a phonetic
+                transcription.
+
+        """
+
+        if '_word_flags' in self.__dict__:
+            return self._word_flags
+
+        counts = {None: -1}
+
+        def count(transcription):
+            if transcription is not None:
+                transcription = tuple(transcription)
+
+            if transcription not in counts:
+                counts[transcription] = sum(1 for seg in transcription
+                                            if seg in SYLLABIC)
+
+            return counts[transcription]
+
+        misaligned = array.array(str('b'))
+        syllables = array.array(str('i'))
+        phonetic_syllables = array.array(str('i'))
+
+        for word in self.words:
+            if isinstance(word, Pause):
+                misaligned.append(word.misaligned)
+                syllables.append(-1)
+                phonetic_syllables.append(-1)
+                continue
+
+            span = _phone_range(word)
+            phonetic = word._phonetic
+
+            if span is None:
+                phones = None
+
+            else:
+                phones, beg, end = span
+                phones = tuple(phones[i].seg for i in range(beg, end))
+
+            if word._end - word._beg < 0:
+                flag = True
+
+            elif phones is None:
+                flag = False
+
+            elif phonetic is None:
+                flag = True
+
+            else:
+                flag = phones != tuple(phonetic)
+
+            word._misaligned = flag
+            word._syllables = (count(word._phonemic),
+                               count(phonetic if phones is None else phones))
+
+            misaligned.append(flag)
+            syllables.append(word._syllables[0])
+            phonetic_syllables.append(word._syllables[1])
+
+        self._word_flags = {'misaligned': misaligned,
+                            'syllables': syllables,
+                            'phonetic_syllables': phonetic_syllables}
+
+        return self._word_flags
+
+    def frames(self, beg, end):
+        """Return the raw sample data for an interval of this track.
+
+        If the .wav file is memory-mapped (see the `wav` parameter), this
+        is a view into the map, and no data is copied.
+
+        Parameters
+        ----------
+        beg : float
+            Time in the track .wav file where the interval begins.
+
+        end : float
+            Time in the track .wav file where the interval ends.
+
+        Returns
+        -------
+        frames : memoryview
+            Little-endian sample data, interleaved by channel, as stored
+            in the .wav file. Empty if `end` is before `beg`. On Python 2,
+            this is a buffer object.
+
+        """
+
+        beg_frame, end_frame = self._frame_range(beg, end)
+
+        return self._read_frames(beg_frame, end_frame)
+
+    def samples(self, beg, end, dtype=None):
+        """Return the samples for an interval of this track as an array.
+
+        Requires NumPy. If the .wav file is memory-mapped and `dtype` is
+        None, the array is a read-only view into the map.
+
+        Parameters
+        ----------
+        beg : float
+            Time in the track .wav file where the interval begins.
+
+        end : float
+            Time in the track .wav file where the interval ends.
+
+        dtype : numpy.dtype or str, optional
+            If None, the samples have the integer type that they are
+            stored as (e.g., int16). If a floating-point type (e.g.,
+            'float32'), the samples are scaled to the range [-1.0, 1.0).
+            Default is None.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+            Array of samples, with one column per channel if there is
+            more than one channel.
+
+        """
+
+        return self._frames_to_samples(self.frames(beg, end), dtype)
+
+    def samples_batch(self, intervals, dtype=None, chunk=60.0):
+        """Return the samples for many intervals of this track at once,
+        as one ragged array.
+
+        The intervals are read in large sequential chunks, as in
+        `clip_wavs`. Requires NumPy.
+
+        Parameters
+        ----------
+        intervals : iterable
+            One `(beg, end)` tuple of times in the track .wav file for
+            each interval, or instances with `beg` and `end` attributes
+            (e.g., Word, Phone or Utterance instances).
+
+        dtype : numpy.dtype or str, optional
+            Type of the samples (see `samples`). Default is None.
+
+        chunk : float, optional
+            Maximum number of seconds between the beginnings of the first
+            and last intervals that are read in one chunk. Default is
+            60.0.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+            The samples for every interval, concatenated in the same
+            order as `intervals`.
+
+        offsets : numpy.ndarray
+            Array of ``len(intervals) + 1`` indices into `samples`, so
+            that the samples for interval `i` are
+            ``samples[offsets[i]:offsets[i + 1]]``.
+
+        """
+
+        intervals = [(item.beg, item.end) if hasattr(item, 'beg') else item
+                     for item in intervals]
+
+        clips = [self._frames_to_samples(clip, dtype) for clip in
+                 self._read_intervals(intervals, chunk)]
+
+        offsets = numpy.zeros(len(clips) + 1, dtype=numpy.intp)
+        numpy.cumsum([len(clip) for clip in clips], out=offsets[1:])
+
+        if clips:
+            samples = numpy.concatenate(clips)
+
+        else:
+            samples = self._frames_to_samples(b'', dtype)
+
+        return samples, offsets
+
+    def clip_wavs(self, intervals, out_dir=None, workers=4, chunk=60.0):
+        """Extract many clips from this track at once.
+
+        The intervals are sorted by their position in the .wav file and
+        read in large sequential chunks, and the clips are written from a
+        pool of threads. This is much faster than calling `clip_wav`
+        once for each clip.
+
+        Parameters
+        ----------
+        intervals : iterable of tuple
+            One `(name, beg, end)` tuple for each clip, where `name` is
+            the name of the new .wav file without the extension, and
+            `beg` and `end` are times in the track .wav file.
+
+        out_dir : str, optional
+            Directory where the new .wav files are written. If None, the
+            clips are returned as arrays instead (see `samples`), which
+            requires NumPy. Default is None.
+
+        workers : int, optional
+            Number of threads that write the new .wav files. Default is 4.
+
+        chunk : float, optional
+            Maximum number of seconds between the beginnings of the first
+            and last clips that are read in one chunk. Default is 60.0.
+
+        Returns
+        -------
+        clips : list of str or list of numpy.ndarray
+            The paths to the new .wav files, or arrays of samples if
+            `out_dir` is None, in the same order as `intervals`.
+
+        """
+
+        intervals = list(intervals)
+        clips = self._read_intervals([(beg, end) for name, beg, end in
+                                      intervals], chunk)
+
+        if out_dir is None:
+            return [self._frames_to_samples(clip) for clip in clips]
+
+        paths = [os.path.join(out_dir, name + '.wav')
+                 for name, beg, end in intervals]
+
+        params = [self.wav.getparams()] * len(paths)
+
+        with futures.ThreadPoolExecutor(workers) as executor:
+            list(executor.map(_write_wav, paths, params, clips))
+
+        return paths
+
+    def _read_intervals(self, intervals, chunk):
+        """
+        Private method used to read the frames for a list of `(beg, end)`
+        intervals in large sequential chunks.
+
+        """
+
+        width = self.wav.getsampwidth() * self.wav.getnchannels()
+
+        spans = sorted(self._frame_range(beg, end) + (i,)
+                       for i, (beg, end) in enumerate(intervals))
+
+        clips = [None] * len(spans)
+        chunk_frames = int(chunk * self.wav.getframerate())
+
+        first = 0
+
+        while first < len(spans):
+            chunk_beg = chunk_end = spans[first][0]
+            last = first
+
+            while (last < len(spans) and
+                   spans[last][0] - chunk_beg <= chunk_frames):
+                chunk_end = max(chunk_end, spans[last][1])
+                last += 1
+
+            data = self._read_frames(chunk_beg, chunk_end)
+
+            for beg_frame, end_frame, i in spans[first:last]:
+                clips[i] = data[(beg_frame - chunk_beg) * width:
+                                (end_frame - chunk_beg) * width]
+
+            first = last
+
+        return clips
+
+    def _frame_range(self, beg, end):
+        """
+        Private method used to convert an interval in seconds to a range
+        of frame indices in the .wav file.
+
+        """
+
+        framerate = self.wav.getframerate()
+        length = end - beg
+
+        frames = max(int(round(length * framerate)), 0)
+        beg_frame = int(round(beg * framerate))
+
+        if beg_frame < 0 or beg_frame > self.wav.getnframes():
+            raise wave.Error('position not in range')
+
+        return beg_frame, min(beg_frame + frames, self.wav.getnframes())
+
+    def _read_frames(self, beg_frame, end_frame):
+        """
+        Private method used to read a range of frames from the .wav file,
+        without copying if it is memory-mapped.
+
+        """
+
+        if not hasattr(self, '_wav_map'):
+            self.wav.setpos(beg_frame)
+            frames = self.wav.readframes(end_frame - beg_frame)
+
+            return _view(frames, 0, len(frames))
+
+        offset, size = self._wav_data
+        width = self.wav.getsampwidth() * self.wav.getnchannels()
+
+        start = offset + beg_frame * width
+        stop = min(offset + end_frame * width, offset + size)
+
+        return _view(self._wav_map, start, stop)
+
+    def _frames_to_samples(self, frames, dtype=None):
+        """
+        Private method used to convert raw sample data from this track to
+        a NumPy array, optionally scaled to floating-point values.
+
+        """
+
+        if numpy is None:
+            raise ImportError('Track.samples() requires NumPy')
+
+        dtypes = {1: numpy.uint8, 2: numpy.dtype('<i2'),
+                  4: numpy.dtype('<i4')}
+
+        width = self.wav.getsampwidth()
+
+        try:
+            stored = dtypes[width]
+
+        except KeyError:
+            raise ValueError('Unsupported sample width: {}'.format(width))
+
+        samples = numpy.frombuffer(frames, dtype=stored)
+        channels = self.wav.getnchannels()
+
+        if channels > 1:
+            samples = samples.reshape(-1, channels)
+
+        if dtype is None:
+            return samples
+
+        dtype = numpy.dtype(dtype)
+
+        if dtype.kind != 'f':
+            raise ValueError('dtype must be None or a floating-point type, '
+                             'not {}'.format(dtype))
+
+        # 8-bit samples are unsigned, with silence at 128
+        offset = 128 if width == 1 else 0
+        scale = float(1 << (8 * width - 1))
+
+        return (samples.astype(dtype) - offset) / dtype.type(scale)
+
+    def clip_wav(self, clip, beg, end):
+        """Write a new .wav file containing a clip from this track.
+
+        Parameters
+        ----------
+        clip : str
+            Path to the new .wav file.
+
+        beg : float
+            Time in the track .wav file where the clip should begin.
+
+        end : float
+            Time in the track .wav file where the clip should end.
+
+        Returns
+        -------
+        None
+
+        """
+
+        _write_wav(clip, self.wav.getparams(), self.frames(beg, end))
+
+    def get_logs(self, beg, end):
+        """Return log entries that overlap with a given interval.
+
+        The interval does not include the log entry boundaries. For
+        example, calling `get_logs(1.5, 2)` will not return a log entry
+        that extends from 1.25 seconds to 1.5 seconds, or one that
+        extends from 2 seconds to 2.5 seconds.
+
+        Parameters
+        ----------
+        beg : float
+            Beginning of the interval.
+
+        end : float
+            End of the interval.
+
+        Returns
+        -------
+        logs : list of LogEntry
+            List of references to the LogEntry instances in this track
+            that overlap with the interval given by `[beg, end]`.
+
+        """
+
+        left_idx = bisect.bisect(self._log_ends, beg)
+        right_idx = bisect.bisect_left(self._log_begs, end)
+
+        return self.log[left_idx:right_idx]
+
+    def query(self, beg, end, tiers=('words', 'phones', 'log')):
+        """Return the entries in each tier that overlap with a given
+        interval.
+
+        Unlike `get_logs`, this does not assume that the entries in a
+        tier are ordered or non-overlapping, so it also returns
+        misaligned entries, and entries whose `end` is before their `beg`
+        (which are treated as if their timestamps were swapped). As in
+        `get_logs`, the interval does not include the entry boundaries.
+
+        Each tier is indexed the first time it is queried, and later
+        queries take O((k + 1) log n) time for k results (see
+        `IntervalIndex`).
+
+        Parameters
+        ----------
+        beg : float
+            Beginning of the interval.
+
+        end : float
+            End of the interval.
+
+        tiers : sequence of str, optional
+            Tiers to search, out of 'words' (which includes Pause
+            entries), 'phones' and 'log'. Default is all three.
+
+        Returns
+        -------
+        entries : dict
+            Mapping from each tier name to a list of references to the
+            entries in that tier that overlap with the interval given by
+            `[beg, end]`, in their order in the tier.
+
+        """
+
+        entries = {}
+
+        for tier in tiers:
+            items = self._tier(tier)
+            entries[tier] = [items[i] for i in
+                             self._index(tier).overlapping(beg, end)]
+
+        return entries
+
+    def _tier(self, tier):
+        """Private method used to return the list of entries in a tier."""
+
+        if tier not in ('words', 'phones', 'log'):
+            raise ValueError('unknown tier: {}'.format(tier))
+
+        return getattr(self, tier)
+
+    def _index(self, tier):
+        """
+        Private method used to return the IntervalIndex for a tier,
+        building it on first use.
+
+        """
+
+        if '_indexes' not in self.__dict__:
+            self._indexes = {}
+
+        if tier not in self._indexes:
+            items = self._tier(tier)
+            self._indexes[tier] = IntervalIndex([item.beg for item in items],
+                                                [item.end for item in items])
+
+        return self._indexes[tier]
+
+
+def corpus(path, load_wavs=False, workers=None, cache_dir=None, lazy=False,
+           max_tracks=None, threads=None, stream=False):
+    """Yield Speaker instances from a folder of zipped speaker archives.
+
+    Parameters
+    ----------
+    path : str
+        Path to a directory containing all of the zipped speaker archives
+        in the Buckeye Corpus (s01.zip, s02.zip, ..., s40.zip).
+
+    load_wavs : bool or str, optional
+        If True, the .wav files are read into the Track instances in the
+        yielded Speaker instances. If a path to a directory, they are
+        extracted there and memory-mapped (see `Track.from_zip`). Default
+        is False.
+
+    workers : int, optional
+        If given, the speaker archives are parsed in a pool of this many
+        processes (see `corpus_parallel`). Can't be combined with `lazy`
+        or `threads`. Default is None.
+
+    cache_dir : str, optional
+        Directory for a persistent cache of the parsed annotations (see
+        `Speaker.from_zip`). Default is None.
+
+    lazy : bool, optional
+        If True, each Track is parsed the first time it is accessed
+        through its Speaker instance (see `Speaker.from_zip`). Default is
+        False.
+
+    max_tracks : int, optional
+        If `lazy` is True, the maximum number of parsed Track instances
+        that each Speaker keeps a reference to. Default is None.
+
+    threads : int, optional
+        If given, the track archives of each speaker are read,
+        decompressed and parsed in a pool of this many threads (see
+        `Speaker.from_zip`). Default is None.
+
+    stream : bool, optional
+        If True, the annotation files are decoded and parsed as they are
+        read (see `Speaker.from_zip`). Default is False.
+
+    Yields
+    ------
+    Speaker
+        One Speaker instance for each zipped speaker archive in the
+        folder given by `path`.
+
+    """
+
+    if workers is not None:
+        if lazy or threads is not None:
+            raise ValueError('workers can not be combined with lazy or '
+                             'threads')
+
+        for speaker in corpus_parallel(path, load_wavs, workers,
+                                       cache_dir=cache_dir, stream=stream):
+            yield speaker
+
+        return
+
+    zip_paths = sorted(glob.glob(os.path.join(path, 's[0-4][0-9].zip')))
+
+    for zip_path in zip_paths:
+        yield Speaker.from_zip(zip_path, load_wavs, cache_dir=cache_dir,
+                               lazy=lazy, max_tracks=max_tracks,
+                               threads=threads, stream=stream)
+
+
+def corpus_parallel(path, load_wavs=False, workers=None, ordered=True,
+                    cache_dir=None, stream=False):
+    """Yield Speaker instances that are parsed in a pool of processes.
+
+    The workers send the parsed entries back as packed columns (as in the
+    persistent cache), and the Track instances are rebuilt from them in
+    this process.
+
+    Parameters
+    ----------
+    path : str
+        Path to a directory containing all of the zipped speaker archives
+        in the Buckeye Corpus (s01.zip, s02.zip, ..., s40.zip).
+
+    load_wavs : bool or str, optional
+        If True, the .wav files are read into the Track instances in the
+        yielded Speaker instances. If a path to a directory, they are
+        extracted there and memory-mapped (see `Track.from_zip`). Default
+        is False.
+
+    workers : int, optional
+        Number of worker processes. If None, the number of processors on
+        the machine is used. Default is None.
+
+    ordered : bool, optional
+        If True, Speaker instances are yielded in sorted order (s01, s02,
+        ..., s40), as in `corpus`. If False, each Speaker instance is
+        yielded as soon as it has been parsed. Default is True.
+
+    cache_dir : str, optional
+        Directory for a persistent cache of the parsed annotations (see
+        `Speaker.from_zip`). Default is None.
+
+    stream : bool, optional
+        If True, the annotation files are decoded and parsed as they are
+        read in the workers (see `Speaker.from_zip`). Default is False.
+
+    Yields
+    ------
+    Speaker
+        One Speaker instance for each zipped speaker archive in the
+        folder given by `path`.
+
+    """
+
+    zip_paths = sorted(glob.glob(os.path.join(path, 's[0-4][0-9].zip')))
+
+    with futures.ProcessPoolExecutor(workers) as executor:
+        jobs = [executor.submit(_load_speaker, zip_path, load_wavs, cache_dir,
+                                stream)
+                for zip_path in zip_paths]
+
+        if not ordered:
+            jobs = futures.as_completed(jobs)
+
+        for job in jobs:
+            name, tracks = job.result()
+            yield Speaker(name, [_unpack_track(track) for track in tracks])
+
+
+def _load_speaker(path, load_wavs, cache_dir, stream):
+    """Worker function for `corpus_parallel`, which returns the name of
+    the speaker and its packed tracks (see `_pack_track`)."""
+
+    speaker = Speaker.from_zip(path, load_wavs, cache_dir=cache_dir,
+                               stream=stream)
+
+    return speaker.name, [_pack_track(track) for track in speaker]
+
+
+def _load_track(path, data, load_wav):
+    """Worker function for `Speaker.from_zip`, where `data` is the
+    contents of a zipped track archive, which returns the packed track
+    (see `_pack_track`)."""
+
+    track = Track.from_zip(path, zipfile.ZipFile(io.BytesIO(data)), load_wav)
+
+    return _pack_track(track)
+
+
+def _pack_track(track):
+    """Return a Track as builtin types that are quick to send between
+    processes, and close it.
+
+    Pickling the Track itself means pickling every entry instance, which
+    is several times slower than parsing the track again.
+
+    """
+
+    wav_path = getattr(track, '_wav_path', None)
+    wav_data = None
+
+    if wav_path is None and hasattr(track, 'wav'):
+        wav_data = _wav_bytes(track.wav)
+
+    packed = cache._pack(track.words, track.phones, track.log, track.txt)
+    track.close()
+
+    return track.name, packed, wav_path, wav_data
+
+
+def _unpack_track(packed):
+    """Return a Track from the result of `_pack_track`."""
+
+    name, columns, wav_path, wav_data = packed
+
+    if wav_data is not None:
+        wav = io.BytesIO(wav_data)
+
+    else:
+        wav = wav_path
+
+    with cache._paused_gc():
+        entries = cache._unpack(columns)
+
+    return _cached_track(name, entries, wav)
+
+
+def _open_track(path, zip_path, load_wav, cache_dir, stream):
+    """Parse and return the Track for a track archive inside a speaker
+    archive, through the persistent cache if `cache_dir` is given."""
+
+    speaker = zipfile.ZipFile(path)
+
+    track = None
+
+    if cache_dir is not None:
+        track = _read_cached_track(speaker, path, zip_path, load_wav,
+                                   cache_dir)
+
+    if track is None:
+        data = _open_archive(speaker, zip_path, stream)
+        track = Track.from_zip(zip_path, data, load_wav, stream=stream)
+
+        if cache_dir is not None:
+            _store_cached_track(cache_dir, path, zip_path, track)
+
+    speaker.close()
+
+    return track
+
+
+def _read_track(path, zip_path, load_wav, stream):
+    """Thread pool function for `Speaker.from_zip`, which opens the
+    speaker archive separately in each thread."""
+
+    with zipfile.ZipFile(path) as speaker:
+        data = _open_archive(speaker, zip_path, stream)
+        return Track.from_zip(zip_path, data, load_wav, stream=stream)
+
+
+def _view(data, start, stop):
+    """Return the bytes of `data` from `start` to `stop` without copying,
+    as a memoryview, or a buffer object on Python 2."""
+
+    if buffer_type is not None:
+        return buffer_type(data, start, max(stop - start, 0))
+
+    return memoryview(data)[start:stop]
+
+
+def _open_archive(speaker, zip_path, stream):
+    """Return a ZipFile for a track archive inside an open speaker
+    archive, either read into memory or, if `stream` is True and the
+    member can seek, opened directly."""
+
+    if stream:
+        member = speaker.open(zip_path)
+
+        # members can seek in Python 3.7 and later
+        if getattr(member, 'seekable', lambda: False)():
+            return zipfile.ZipFile(member)
+
+        member.close()
+
+    with stats.stage('inflate') as stage:
+        raw = speaker.read(zip_path)
+        stage.add(bytes=len(raw))
+
+    return zipfile.ZipFile(io.BytesIO(raw))
+
+
+def _read_cached_track(speaker, path, zip_path, load_wav, cache_dir):
+    """Return a Track for a nested track archive from the cache, or None
+    if it isn't cached. `speaker` is the open ZipFile for `path`."""
+
+    entries = _load_cached_entries(cache_dir, path, zip_path)
+
+    if entries is None:
+        return None
+
+    name = os.path.splitext(os.path.basename(zip_path))[0]
+
+    if load_wav:
+        data = zipfile.ZipFile(io.BytesIO(speaker.read(zip_path)))
+        wav = _read_wav(data, name, load_wav)
+
+    else:
+        wav = None
+
+    return _cached_track(name, entries, wav)
+
+
+def _cached_track(name, entries, wav, align_phones=True):
+    """Return a Track from cached entries, aligning the words to the
+    phones only if the cache didn't store the alignment."""
+
+    words = entries[0]
+    aligned = bool(words) and words[0]._phone_beg is not None
+
+    if aligned and not align_phones:
+        for word in words:
+            word._phones = None
+            word._phone_beg = None
+
+    return Track._from_entries(name, *entries, wav=wav,
+                               align_phones=align_phones and not aligned)
+
+
+def _store_cached_track(cache_dir, path, zip_path, track):
+    """Write the parsed entries of a nested track archive to the cache."""
+    cache.store_entries(cache_dir, path, zip_path, track.words, track.phones,
+                        track.log, track.txt)
+
+
+def _parse(entries, parser, process, parse, build):
+    """Return a list of the entries in an open .words, .phones or .log
+    file, using the line-by-line or the fast parser."""
+
+    if parser == 'fast':
+        with stats.stage('parse'):
+            columns = parse(entries.read())
+
+        with stats.stage('construct') as stage:
+            parsed = build(columns)
+            stage.add(entries=len(parsed))
+
+        return parsed
+
+    with stats.stage('parse') as stage:
+        parsed = list(process(entries))
+        stage.add(entries=len(parsed))
+
+    return parsed
+
+
+def _read_text(data, member):
+    """Return a text stream with the decoded contents of a member of a
+    ZipFile."""
+
+    with stats.stage('inflate') as stage:
+        raw = data.read(member)
+        stage.add(bytes=len(raw))
+
+    with stats.stage('decode') as stage:
+        text = raw.decode('latin-1')
+        stage.add(bytes=len(raw))
+
+    return io.StringIO(text)
+
+
+def _load_cached_entries(cache_dir, path, member):
+    """Return the parsed entries for a track archive from the cache, or
+    None if they aren't cached."""
+
+    with stats.stage('cache') as stage:
+        entries = cache.load_entries(cache_dir, path, member)
+
+        if entries is not None:
+            stage.add(entries=sum(len(entries[i]) for i in range(3)))
+
+    return entries
+
+
+def _open_text(data, member):
+    """Return a text stream that decodes a member of a ZipFile as it is
+    read, splitting lines the same way as `io.StringIO`."""
+
+    # on Python 2, open members of a ZipFile that was given a file object
+    # share its position, so several members can't be read in turns
+    if sys.version_info[0] < 3:
+        return _read_text(data, member)
+
+    return io.TextIOWrapper(data.open(member), encoding='latin-1',
+                            newline='\n')
+
+
+def _read_wav(data, name, load_wav):
+    """Return the `wav` argument for a Track from an open track archive,
+    as a file-like object or a path, or None if `load_wav` is False."""
+
+    if not load_wav:
+        return None
+
+    if not isinstance(load_wav, string_types):
+        with stats.stage('wav') as stage:
+            raw = data.read(name + '.wav')
+            stage.add(bytes=len(raw))
+
+        return io.BytesIO(raw)
+
+    path = os.path.join(load_wav, name + '.wav')
+    size = data.getinfo(name + '.wav').file_size
+
+    if os.path.isfile(path) and os.path.getsize(path) == size:
+        return path
+
+    # other threads or processes may be creating the same directory
+    try:
+        os.makedirs(load_wav)
+
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    # copy to a temporary file first, so that other processes never map a
+    # partial file
+    handle, temp_path = tempfile.mkstemp(dir=load_wav, suffix='.tmp')
+
+    try:
+        with stats.stage('wav') as stage, os.fdopen(handle, 'wb') as wav:
+            member = data.open(name + '.wav')
+
+            try:
+                shutil.copyfileobj(member, wav, 1 << 20)
+
+            finally:
+                member.close()
+
+            stage.add(bytes=size)
+
+        replace = getattr(os, 'replace', os.rename)
+        replace(temp_path, path)
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return path
+
+
+def _write_wav(path, params, frames):
+    """Write a .wav file with the given parameters and sample data."""
+    wav_out = wave.open(path, 'wb')
+
+    wav_out.setparams(params)
+    wav_out.writeframes(frames)
+
+    wav_out.close()
+
+
+def _wav_data_range(wav):
+    """Return the offset and size of the sample data in a .wav file."""
+
+    if wav[:4] != b'RIFF' or wav[8:12] != b'WAVE':
+        raise wave.Error('file does not start with RIFF id')
+
+    pos = 12
+
+    while pos + 8 <= len(wav):
+        chunk_id = wav[pos:pos + 4]
+        size = struct.unpack(str('<I'), wav[pos + 4:pos + 8])[0]
+
+        if chunk_id == b'data':
+            return pos + 8, min(size, len(wav) - pos - 8)
+
+        # chunks are padded to an even number of bytes
+        pos += 8 + size + (size & 1)
+
+    raise wave.Error('data chunk not found')
+
+
+def _wav_bytes(wav):
+    """Return the contents of an open wave.Wave_read as a .wav file."""
+    pos = wav.tell()
+    wav.rewind()
+
+    wav_file = io.BytesIO()
+    wav_out = wave.open(wav_file, 'wb')
+
+    wav_out.setparams(wav.getparams())
+    wav_out.writeframes(wav.readframes(wav.getnframes()))
+    wav_out.close()
+
+    wav.setpos(pos)
+
+    return wav_file.getvalue()
+
+
+def align_words(words, phones, window=10.0):
+    """Yield Word and Pause instances with references to their Phone
+    instances, merging two chronological streams in one pass.
+
+    A Phone is counted as belonging to a Word or Pause if at least half
+    of the Phone's duration occurs between the `beg` and `end` timestamps
+    of the Word or Pause, as in `Track._set_phones`. Only the phones that
+    overlap the current entry, and the phones from the last `window`
+    seconds, are buffered.
+
+    Parameters
+    ----------
+    words : iterable of Word and Pause
+        Chronological entries, such as from `process_words()`, where each
+        entry begins where the previous one ends.
+
+    phones : iterable of Phone
+        Chronological entries, such as from `process_phones()`.
+
+    window : float, optional
+        Number of seconds of phones to keep after the entries that they
+        overlap, in case a later entry begins before them. Timestamps go
+        backwards in a few tracks (e.g., s2801a), by much less than a
+        second. Default is 10.0.
+
+    Yields
+    ------
+    Word, Pause
+        Each item in `words`, with the `phones` attribute set. As long as
+        the phone midpoints are in chronological order, the phones are
+        the same as in a Track.
+
+    Raises
+    ------
+    ValueError
+        If an entry begins more than `window` seconds before an earlier
+        entry, so that some of its phones may have been dropped already.
+
+    """
+
+    phones = iter(phones)
+    pending = collections.deque()
+    exhausted = False
+
+    # phones dropped from `pending` in the last `window` seconds, and the
+    # latest midpoint of any phone dropped from there in turn
+    dropped = collections.deque()
+    horizon = float('-inf')
+    lost = float('-inf')
+
+    for word in words:
+        beg = word.beg
+        end = word.end
+        low = min(beg, end)
+
+        # this entry begins before an earlier one, so restore the phones
+        # that were dropped after it
+        if dropped and dropped[-1][0] >= low:
+            if low <= lost:
+                raise ValueError('Entry at {} begins more than {} seconds '
+                                 'before an earlier entry'.format(beg,
+                                                                  window))
+
+            while dropped and dropped[-1][0] >= low:
+                pending.appendleft(dropped.pop())
+
+        # drop phones that can't belong to this entry or any later entry
+        # that begins where this one ends
+        while pending and pending[0][0] < low:
+            dropped.append(pending.popleft())
+
+        horizon = max(horizon, low)
+
+        while dropped and dropped[0][0] < horizon - window:
+            lost = max(lost, dropped.popleft()[0])
+
+        # read ahead until the first phone past the end of this entry
+        while not exhausted and (not pending or pending[-1][0] < end):
+            try:
+                phone = next(phones)
+
+            except StopIteration:
+                exhausted = True
+                break
+
+            pending.append((phone.beg + 0.5 * phone.dur, phone))
+
+        word._phones = [phone for mid, phone in pending if beg <= mid < end]
+        word._phone_beg = None
+
+        yield word
+
+
+def _phone_ranges(phones, words):
+    """Return lists of the first and one past the last index in `phones`
+    of the phones that belong to each Word or Pause in `words` (see
+    `Track._set_phones`)."""
+
+    phone_mids = [p.beg + 0.5 * p.dur for p in phones]
+
+    # the timestamps of each entry are found by merging them with the
+    # phone midpoints, which only works if the midpoints are sorted
+    if any(left > right for left, right in zip(phone_mids, phone_mids[1:])):
+        search = _bisect_offsets
+
+    else:
+        search = _merge_offsets
+
+    begs = search(phone_mids, [word.beg for word in words])
+    ends = search(phone_mids, [word.end for word in words])
+
+    return begs, ends
+
+
+def _merge_offsets(values, keys):
+    """Return `bisect_left(values, key)` for each key, where `values` is
+    sorted, in one pass through both lists if `keys` is also sorted."""
+
+    offsets = []
+    size = len(values)
+    i = 0
+    previous = None
+
+    for key in keys:
+        if previous is not None and key < previous:
+            i = bisect.bisect_left(values, key, 0, i)
+
+        else:
+            while i < size and values[i] < key:
+                i += 1
+
+        offsets.append(i)
+        previous = key
+
+    return offsets
+
+
+def _bisect_offsets(values, keys):
+    """Return `bisect_left(values, key)` for each key."""
+    return [bisect.bisect_left(values, key) for key in keys]
 
 
 def process_logs(logs):
@@ -404,6 +2091,8 @@ def process_logs(logs):
 
     """
 
+    new_log_entry = LogEntry._new
+
     # skip the header
     line = logs.readline()
 
@@ -431,7 +2120,7 @@ def process_logs(logs):
             entry = None
 
         time = float(time)
-        yield LogEntry(entry, previous, time)
+        yield new_log_entry(entry, previous, time)
 
         previous = time
         line = logs.readline()
@@ -454,6 +2143,8 @@ def process_phones(phones):
 
     """
 
+    new_phone = Phone._new
+
     # skip the header
     line = phones.readline()
 
@@ -488,7 +2179,7 @@ def process_phones(phones):
             phone = None
 
         time = float(time)
-        yield Phone(phone, previous, time)
+        yield new_phone(phone, previous, time)
 
         previous = time
         line = phones.readline()
@@ -513,6 +2204,9 @@ def process_words(words):
 
     """
 
+    new_pause = Pause._new
+    new_word = Word._new
+
     # skip the header
     line = words.readline()
 
@@ -562,10 +2256,10 @@ def process_words(words):
         # for these entries, the misaligned attribute will be set to True
 
         if word.startswith('<') or word.startswith('{'):
-            yield Pause(word, previous, time)
+            yield new_pause(word, previous, time)
 
         else:
-            yield Word(word, previous, time, phonemic, phonetic, pos)
+            yield new_word(word, previous, time, phonemic, phonetic, pos)
 
         previous = time
         line = words.readline()
@@ -0,0 +1,267 @@
+"""Persistent on-disk cache of parsed track annotations.
+
+Loading a track from the cache is dominated by constructing its Word,
+Pause, Phone and LogEntry instances. The cyclic garbage collector is
+paused while they are built (and, in `Speaker.from_zip`, while every
+track of a speaker is loaded), but it still runs between speakers, and
+its cost grows with the number of instances that are kept. The 'cache'
+stage of `buckeye.benchmark` measures a warm load.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import array
+import contextlib
+import errno
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+
+from .containers import Word, Pause, LogEntry, Phone
+
+
+# increment this when the layout of cached entries changes
+CACHE_VERSION = 2
+
+
+def fingerprint(path):
+    """Return a tuple that changes whenever the file at `path` changes.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file, such as a zipped speaker or track archive.
+
+    Returns
+    -------
+    fingerprint : tuple
+        The size and modification time of the file.
+
+    """
+
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime)
+
+
+def cache_path(cache_dir, source, member):
+    """Return the path to the cache file for a track archive.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory where cache files are stored.
+
+    source : str
+        Path to the archive on disk that contains the track.
+
+    member : str
+        Name of the track inside `source` (e.g., 's01/s0101a.zip'), or
+        the same as `source` for a track archive that isn't nested.
+
+    Returns
+    -------
+    path : str
+
+    """
+
+    key = '\0'.join([os.path.abspath(source), member])
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_dir, digest + '.pickle')
+
+
+def load_entries(cache_dir, source, member):
+    """Return cached entries for a track, or None if they are missing
+    or out of date.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory where cache files are stored.
+
+    source : str
+        Path to the archive on disk that contains the track.
+
+    member : str
+        Name of the track inside `source`.
+
+    Returns
+    -------
+    entries : tuple or None
+        Tuple of `(words, phones, log, txt)` lists, as stored in the
+        corresponding Track attributes, or None. If the words were
+        aligned to the phones when they were stored, they are aligned
+        again, as by `Track.align_phones`.
+
+    """
+
+    # none of the objects in an entry are in reference cycles, so the
+    # cyclic garbage collector only slows down building them
+    with _paused_gc():
+        try:
+            with io.open(cache_path(cache_dir, source, member),
+                         'rb') as cached:
+                version, python, stamp, packed = pickle.load(cached)
+
+        except (IOError, OSError, EOFError, ValueError,
+                pickle.UnpicklingError):
+            return None
+
+        if (version != CACHE_VERSION or python != sys.version_info[:2] or
+                stamp != fingerprint(source)):
+            return None
+
+        return _unpack(packed)
+
+
+def store_entries(cache_dir, source, member, words, phones, log, txt):
+    """Write the parsed entries for a track to the cache.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory where cache files are stored. It is created if it
+        does not exist.
+
+    source : str
+        Path to the archive on disk that contains the track.
+
+    member : str
+        Name of the track inside `source`.
+
+    words, phones, log, txt : list
+        Parsed entries, as stored in the corresponding Track attributes.
+
+    Returns
+    -------
+    None
+
+    """
+
+    # other processes may be creating the same directory
+    try:
+        os.makedirs(cache_dir)
+
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    record = (CACHE_VERSION, sys.version_info[:2], fingerprint(source),
+              _pack(words, phones, log, txt))
+
+    # write to a temporary file first, so that other processes never read
+    # a partial entry
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, 'wb') as cached:
+            pickle.dump(record, cached, pickle.HIGHEST_PROTOCOL)
+
+        replace = getattr(os, 'replace', os.rename)
+        replace(temp_path, cache_path(cache_dir, source, member))
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _paused_gc():
+    """Disable the cyclic garbage collector while the context is active,
+    unless it is already disabled."""
+
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _pack(words, phones, log, txt):
+    """Return the entries of a track as flat columns of builtin types."""
+
+    return (''.join('P' if isinstance(w, Pause) else 'W' for w in words),
+            [w.entry if isinstance(w, Pause) else w.orthography
+             for w in words],
+            _floats(w.beg for w in words),
+            _floats(w.end for w in words),
+            [getattr(w, 'phonemic', None) for w in words],
+            [getattr(w, 'phonetic', None) for w in words],
+            [getattr(w, 'pos', None) for w in words],
+            [p.seg for p in phones],
+            _floats(p.beg for p in phones),
+            _floats(p.end for p in phones),
+            [l.entry for l in log],
+            _floats(l.beg for l in log),
+            _floats(l.end for l in log),
+            txt,
+            _phone_offsets(words))
+
+
+def _unpack(packed):
+    """Return `(words, phones, log, txt)` lists from packed columns."""
+
+    (kinds, labels, begs, ends, phonemics, phonetics, pos,
+     segs, phone_begs, phone_ends,
+     entries, log_begs, log_ends, txt, offsets) = packed
+
+    begs = begs.tolist()
+    ends = ends.tolist()
+
+    new_pause = Pause._new
+    new_word = Word._new
+    new_phone = Phone._new
+    new_log_entry = LogEntry._new
+
+    # most entries are words, so build every entry as a Word first
+    words = list(map(new_word, labels, begs, ends, phonemics, phonetics, pos))
+
+    if 'P' in kinds:
+        for i, kind in enumerate(kinds):
+            if kind == 'P':
+                words[i] = new_pause(labels[i], begs[i], ends[i])
+
+    phones = list(map(new_phone, segs, phone_begs.tolist(),
+                      phone_ends.tolist()))
+
+    log = list(map(new_log_entry, entries, log_begs.tolist(),
+                   log_ends.tolist()))
+
+    # restore the references to the phones, as made by `Track._set_phones`
+    if offsets is not None:
+        for word, left, right in zip(words, offsets[0].tolist(),
+                                     offsets[1].tolist()):
+            word._phones = phones
+            word._phone_beg = left
+            word._phone_end = right
+
+    return words, phones, log, txt
+
+
+def _phone_offsets(words):
+    """Return arrays of the range of phones of each entry, or None if the
+    entries aren't aligned to a list of phones."""
+
+    if not words or any(w._phone_beg is None for w in words):
+        return None
+
+    return (array.array(str('l'), [w._phone_beg for w in words]),
+            array.array(str('l'), [w._phone_end for w in words]))
+
+
+def _floats(values):
+    """Return a float64 array holding `values`."""
+    return array.array(str('d'), values)
+
@@ -14,6 +14,10 @@ SYLLABIC = {'aa', 'ae', 'ay', 'aw', 'ao', 'oy', 'ow', 'eh', 'ey', 'ah', 'uw',
             'uhn', 'ihn', 'iyn'}
 
 
+# allocates an instance without calling __init__, for the _new constructors
+_new = object.__new__
+
+
 class Word(object):
     """A word entry in the Buckeye Corpus.
 
@@ -52,6 +56,10 @@ class Word(object):
 
     """
 
+    __slots__ = ('_orthography', '_beg', '_end', '_phonemic', '_phonetic',
+                 '_pos', '_phones', '_phone_beg', '_phone_end',
+                 '_misaligned', '_syllables')
+
     def __init__(self, orthography, beg, end,
                  phonemic=None, phonetic=None, pos=None):
         self._orthography = orthography
@@ -62,6 +70,32 @@ class Word(object):
         self._pos = pos
 
         self._phones = None
+        self._phone_beg = None
+
+        self._misaligned = None
+        self._syllables = None
+
+    @classmethod
+    def _new(cls, orthography, beg, end, phonemic, phonetic, pos):
+        """Private constructor used by the parsers, which skips the
+        default arguments of `__init__`."""
+
+        word = _new(cls)
+
+        word._orthography = orthography
+        word._beg = beg
+        word._end = end
+        word._phonemic = phonemic
+        word._phonetic = phonetic
+        word._pos = pos
+
+        word._phones = None
+        word._phone_beg = None
+
+        word._misaligned = None
+        word._syllables = None
+
+        return word
 
     def __repr__(self):
         return 'Word({}, {}, {}, {}, {}, {})'.format(repr(self._orthography),
@@ -85,8 +119,11 @@ class Word(object):
 
     @property
     def phones(self):
-        """List of Phone instances that correspond to the word."""
-        return self._phones
+        """List of Phone instances that correspond to the word. After
+        `Track.align_phones`, a new list is sliced from the track's phones
+        on each access, so keep a reference to it if it is used more
+        than once."""
+        return _phones(self)
 
     @property
     def phonetic(self):
@@ -104,25 +141,23 @@ class Word(object):
         time-alignment of this word. True if `dur` is negative, or if
         the Phones that correspond to this word's timestamps don't
         match up with the given close phonetic transcription in
-        `phonetic`. Otherwise False."""
+        `phonetic`. Otherwise False.
 
-        if self.dur < 0:
-            return True
+        The flag is read from a cache if it has been computed by
+        `Track.word_flags`."""
 
-        if self._phones is None:
-            return False
+        if self._misaligned is not None:
+            return self._misaligned
 
-        if self._phonetic is None:
+        if self.dur < 0:
             return True
 
-        if len(self._phones) != len(self._phonetic):
-            return True
+        span = _phone_range(self)
 
-        for i, j in zip(self._phones, self._phonetic):
-            if i.seg != j:
-                return True
+        if span is None:
+            return False
 
-        return False
+        return _phones_differ(self._phonetic, *span)
 
     @property
     def beg(self):
@@ -144,6 +179,26 @@ class Word(object):
             raise AttributeError('Duration is not available if beg and end '
                                  'are not numeric types')
 
+    def samples(self, track, dtype=None):
+        """Return the samples for this word from the track .wav file.
+
+        Parameters
+        ----------
+        track : Track
+            The track that this word belongs to. It must have been
+            loaded with its .wav file.
+
+        dtype : numpy.dtype or str, optional
+            Type of the samples (see `Track.samples`). Default is None.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+
+        """
+
+        return track.samples(self._beg, self._end, dtype)
+
     def syllables(self, phonetic=False):
         """Return the number of syllabic segments in the word.
 
@@ -163,11 +218,26 @@ class Word(object):
         syllables : int
             The number of syllabic segments in the specified attribute.
 
+        Notes
+        -----
+        The count is read from a cache if it has been computed by
+        `Track.word_flags`.
+
         """
 
+        if self._syllables is not None:
+            count = self._syllables[1 if phonetic else 0]
+
+            # the transcription is missing, so raise the TypeError below
+            if count >= 0:
+                return count
+
         if phonetic:
-            if self._phones is not None:
-                transcription = [phone.seg for phone in self._phones]
+            span = _phone_range(self)
+
+            if span is not None:
+                phones, beg, end = span
+                transcription = (phones[i].seg for i in range(beg, end))
 
             else:
                 transcription = self._phonetic
@@ -208,12 +278,32 @@ class Pause(object):
 
     """
 
+    __slots__ = ('_entry', '_beg', '_end', '_phones', '_phone_beg',
+                 '_phone_end')
+
     def __init__(self, entry=None, beg=None, end=None):
         self._entry = entry
         self._beg = beg
         self._end = end
 
         self._phones = None
+        self._phone_beg = None
+
+    @classmethod
+    def _new(cls, entry, beg, end):
+        """Private constructor used by the parsers, which skips the
+        default arguments of `__init__`."""
+
+        pause = _new(cls)
+
+        pause._entry = entry
+        pause._beg = beg
+        pause._end = end
+
+        pause._phones = None
+        pause._phone_beg = None
+
+        return pause
 
     def __repr__(self):
         return 'Pause({}, {}, {})'.format(repr(self._entry), self._beg, self._end)
@@ -239,8 +329,11 @@ class Pause(object):
 
     @property
     def phones(self):
-        """List of Phone instances that correspond to the pause."""
-        return self._phones
+        """List of Phone instances that correspond to the pause. After
+        `Track.align_phones`, a new list is sliced from the track's phones
+        on each access, so keep a reference to it if it is used more
+        than once."""
+        return _phones(self)
 
     @property
     def beg(self):
@@ -262,6 +355,26 @@ class Pause(object):
             raise AttributeError('Duration is not available if beg and end '
                                  'are not numeric types')
 
+    def samples(self, track, dtype=None):
+        """Return the samples for this entry from the track .wav file.
+
+        Parameters
+        ----------
+        track : Track
+            The track that this entry belongs to. It must have been
+            loaded with its .wav file.
+
+        dtype : numpy.dtype or str, optional
+            Type of the samples (see `Track.samples`). Default is None.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+
+        """
+
+        return track.samples(self._beg, self._end, dtype)
+
 
 class LogEntry(object):
     """A log entry in the Buckeye Corpus, such as transcriber confidence.
@@ -285,11 +398,26 @@ class LogEntry(object):
 
     """
 
+    __slots__ = ('_entry', '_beg', '_end')
+
     def __init__(self, entry, beg=None, end=None):
         self._entry = entry
         self._beg = beg
         self._end = end
 
+    @classmethod
+    def _new(cls, entry, beg, end):
+        """Private constructor used by the parsers, which skips the
+        default arguments of `__init__`."""
+
+        log_entry = _new(cls)
+
+        log_entry._entry = entry
+        log_entry._beg = beg
+        log_entry._end = end
+
+        return log_entry
+
     def __repr__(self):
         return 'LogEntry({}, {}, {})'.format(repr(self._entry),
                                              self._beg, self._end)
@@ -345,11 +473,26 @@ class Phone(object):
 
     """
 
+    __slots__ = ('_seg', '_beg', '_end')
+
     def __init__(self, seg, beg=None, end=None):
         self._seg = seg
         self._beg = beg
         self._end = end
 
+    @classmethod
+    def _new(cls, seg, beg, end):
+        """Private constructor used by the parsers, which skips the
+        default arguments of `__init__`."""
+
+        phone = _new(cls)
+
+        phone._seg = seg
+        phone._beg = beg
+        phone._end = end
+
+        return phone
+
     def __repr__(self):
         return 'Phone({}, {}, {})'.format(repr(self._seg), self._beg, self._end)
 
@@ -380,3 +523,78 @@ class Phone(object):
         except TypeError:
             raise AttributeError('Duration is not available if beg and end '
                                  'are not numeric types')
+
+    def samples(self, track, dtype=None):
+        """Return the samples for this phone from the track .wav file.
+
+        Parameters
+        ----------
+        track : Track
+            The track that this phone belongs to. It must have been
+            loaded with its .wav file.
+
+        dtype : numpy.dtype or str, optional
+            Type of the samples (see `Track.samples`). Default is None.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+
+        """
+
+        return track.samples(self._beg, self._end, dtype)
+
+
+def _phones(entry):
+    """Return the Phone instances that correspond to a Word or Pause.
+
+    `_phones` is either a list of the entry's own phones, or, if
+    `_phone_beg` is set, the list of every phone in the track, where the
+    entry's phones are in the range from `_phone_beg` to `_phone_end`
+    (see `Track._set_phones`).
+
+    """
+
+    if entry._phone_beg is None:
+        return entry._phones
+
+    return entry._phones[entry._phone_beg:entry._phone_end]
+
+
+def _phone_range(entry):
+    """Return the list that holds the phones of a Word or Pause, with the
+    range of the entry's phones in it, as a tuple `(phones, beg, end)`,
+    or None if the entry has no phones.
+
+    Unlike `_phones`, this does not copy the entry's phones out of the
+    track's list.
+
+    """
+
+    phones = entry._phones
+
+    if phones is None:
+        return None
+
+    if entry._phone_beg is None:
+        return phones, 0, len(phones)
+
+    return phones, entry._phone_beg, entry._phone_end
+
+
+def _phones_differ(phonetic, phones, beg, end):
+    """Return True if the segments of the phones from `beg` to `end` in
+    `phones` don't match a phonetic transcription, or if there is no
+    transcription (see `Word.misaligned`)."""
+
+    if phonetic is None:
+        return True
+
+    if end - beg != len(phonetic):
+        return True
+
+    for i, seg in zip(range(beg, end), phonetic):
+        if phones[i].seg != seg:
+            return True
+
+    return False
@@ -0,0 +1,455 @@
+"""Store the Buckeye Corpus in an SQLite database.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sqlite3
+
+from .buckeye import corpus
+from .containers import Word, Pause, LogEntry, Phone
+from .export import track_columns
+from .table import _split
+from .utterance import Utterance
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS speakers (
+    speaker TEXT PRIMARY KEY,
+    sex TEXT,
+    age TEXT,
+    interviewer TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    track_id INTEGER PRIMARY KEY,
+    track TEXT UNIQUE,
+    speaker TEXT REFERENCES speakers (speaker)
+);
+
+CREATE TABLE IF NOT EXISTS words (
+    track_id INTEGER REFERENCES tracks (track_id),
+    word INTEGER,
+    utterance INTEGER,
+    pause INTEGER,
+    label TEXT,
+    beg REAL,
+    "end" REAL,
+    phonemic TEXT,
+    phonetic TEXT,
+    pos TEXT,
+    misaligned INTEGER,
+    phone_beg INTEGER,
+    phone_end INTEGER,
+    PRIMARY KEY (track_id, word)
+);
+
+CREATE TABLE IF NOT EXISTS phones (
+    track_id INTEGER REFERENCES tracks (track_id),
+    phone INTEGER,
+    word INTEGER,
+    seg TEXT,
+    beg REAL,
+    "end" REAL,
+    PRIMARY KEY (track_id, phone)
+);
+
+CREATE TABLE IF NOT EXISTS logs (
+    track_id INTEGER REFERENCES tracks (track_id),
+    log INTEGER,
+    entry TEXT,
+    beg REAL,
+    "end" REAL,
+    PRIMARY KEY (track_id, log)
+);
+
+CREATE TABLE IF NOT EXISTS utterances (
+    track_id INTEGER REFERENCES tracks (track_id),
+    utterance INTEGER,
+    beg REAL,
+    "end" REAL,
+    word_beg INTEGER,
+    word_end INTEGER,
+    text TEXT,
+    PRIMARY KEY (track_id, utterance)
+);
+
+CREATE INDEX IF NOT EXISTS tracks_speaker ON tracks (speaker);
+CREATE INDEX IF NOT EXISTS words_label ON words (label);
+CREATE INDEX IF NOT EXISTS words_pos ON words (pos);
+CREATE INDEX IF NOT EXISTS words_phonemic ON words (phonemic);
+CREATE INDEX IF NOT EXISTS words_phonetic ON words (phonetic);
+CREATE INDEX IF NOT EXISTS phones_seg ON phones (seg);
+CREATE INDEX IF NOT EXISTS logs_entry ON logs (entry);
+"""
+
+# filters that every query accepts, and the speaker or track column that
+# each one compares
+SPEAKER_FILTERS = {
+    'speaker': 's.speaker',
+    'speaker_sex': 's.sex',
+    'speaker_age': 's.age',
+    'interviewer': 's.interviewer',
+    'track': 't.track'
+}
+
+WORD_FILTERS = dict(SPEAKER_FILTERS, orthography='x.label', pos='x.pos',
+                    phonemic='x.phonemic', phonetic='x.phonetic',
+                    pause='x.pause', misaligned='x.misaligned')
+
+PHONE_FILTERS = dict(SPEAKER_FILTERS, seg='x.seg')
+
+LOG_FILTERS = dict(SPEAKER_FILTERS, entry='x.entry')
+
+UTTERANCE_FILTERS = dict(SPEAKER_FILTERS, text='x.text')
+
+
+class CorpusDB(object):
+    """SQLite database of the speakers, tracks and entries in the corpus.
+
+    Words, phones, log entries and utterances are stored in tables that
+    are indexed by track and position, and by their labels, so queries
+    don't need to read the zipped archives. Several processes can read
+    the same database file at once.
+
+    Use CorpusDB.from_corpus(corpus_path, db_path) to build a database,
+    and CorpusDB(db_path) to open it again.
+
+    Parameters
+    ----------
+    path : str
+        Path to the database file, which is created if it does not exist,
+        or ':memory:' for a temporary database.
+
+    Attributes
+    ----------
+    path : str
+
+    connection : sqlite3.Connection
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return 'CorpusDB("{}")'.format(self.path)
+
+    def __str__(self):
+        return '<CorpusDB {}>'.format(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def from_corpus(cls, corpus_path, path, sep=0.5, **kwargs):
+        """Return a CorpusDB with every speaker in a corpus directory.
+
+        Parameters
+        ----------
+        corpus_path : str
+            Path to a directory containing the zipped speaker archives
+            (see `corpus`).
+
+        path : str
+            Path to the database file.
+
+        sep : float, optional
+            Pause duration that separates utterances, as in
+            `words_to_utterances`. Default is 0.5.
+
+        **kwargs
+            Passed to `corpus`.
+
+        Returns
+        -------
+        CorpusDB
+
+        """
+
+        db = cls(path)
+
+        for speaker in corpus(corpus_path, **kwargs):
+            db.add_speaker(speaker, sep)
+
+        return db
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def add_speaker(self, speaker, sep=0.5):
+        """Add a Speaker and the entries in each of its tracks.
+
+        The speaker is added in one transaction, so readers never see a
+        partial speaker.
+
+        Parameters
+        ----------
+        speaker : Speaker
+
+        sep : float, optional
+            Pause duration that separates utterances. Default is 0.5.
+
+        Returns
+        -------
+        None
+
+        """
+
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO speakers VALUES (?, ?, ?, ?)',
+                (speaker.name, speaker.sex, speaker.age, speaker.interviewer))
+
+            for track in speaker:
+                self._insert_track(track, speaker, sep)
+
+    def speakers(self):
+        """Return a list of `(speaker, sex, age, interviewer)` tuples for
+        the speakers in the database."""
+
+        return self.connection.execute(
+            'SELECT speaker, sex, age, interviewer FROM speakers '
+            'ORDER BY speaker').fetchall()
+
+    def tracks(self, speaker=None):
+        """Return a list of the track names in the database.
+
+        Parameters
+        ----------
+        speaker : str, optional
+            Only return the tracks of this speaker (e.g., 's01'). Default
+            is None.
+
+        Returns
+        -------
+        tracks : list of str
+
+        """
+
+        if speaker is None:
+            rows = self.connection.execute(
+                'SELECT track FROM tracks ORDER BY track')
+
+        else:
+            rows = self.connection.execute(
+                'SELECT track FROM tracks WHERE speaker = ? ORDER BY track',
+                (speaker,))
+
+        return [row[0] for row in rows]
+
+    def words(self, phones=False, **filters):
+        """Yield the Word and Pause entries that match some filters.
+
+        Parameters
+        ----------
+        phones : bool, optional
+            If True, set the `phones` attribute of each entry from the
+            phones table. Default is False, which leaves it as None.
+
+        **filters
+            Column values to match. Keywords are 'orthography' (also
+            matches the label of a Pause), 'pos', 'phonemic', 'phonetic',
+            'pause', 'misaligned', 'track', 'speaker', 'speaker_sex',
+            'speaker_age' and 'interviewer'. Transcriptions may be given
+            as a list of segments or as a string with segments separated
+            by spaces.
+
+        Yields
+        ------
+        Word or Pause
+            In order of track and position in the track.
+
+        """
+
+        cursor = self._select(
+            'words', 'x.track_id, x.pause, x.label, x.beg, x."end", '
+            'x.phonemic, x.phonetic, x.pos, x.phone_beg, x.phone_end',
+            WORD_FILTERS, filters, 'x.track_id, x.word')
+
+        for row in cursor:
+            track_id, pause, label, beg, end, phonemic, phonetic, pos, \
+                phone_beg, phone_end = row
+
+            if pause:
+                word = Pause._new(label, beg, end)
+
+            else:
+                word = Word._new(label, beg, end, _split(phonemic),
+                                 _split(phonetic), pos)
+
+            if phones:
+                word._phones = self._phones(track_id, phone_beg, phone_end)
+
+            yield word
+
+    def phones(self, **filters):
+        """Yield the Phone entries that match some filters.
+
+        Parameters
+        ----------
+        **filters
+            Column values to match. Keywords are 'seg', 'track',
+            'speaker', 'speaker_sex', 'speaker_age' and 'interviewer'.
+
+        Yields
+        ------
+        Phone
+            In order of track and position in the track.
+
+        """
+
+        cursor = self._select('phones', 'x.seg, x.beg, x."end"',
+                              PHONE_FILTERS, filters, 'x.track_id, x.phone')
+
+        for seg, beg, end in cursor:
+            yield Phone._new(seg, beg, end)
+
+    def logs(self, **filters):
+        """Yield the LogEntry entries that match some filters.
+
+        Parameters
+        ----------
+        **filters
+            Column values to match. Keywords are 'entry', 'track',
+            'speaker', 'speaker_sex', 'speaker_age' and 'interviewer'.
+
+        Yields
+        ------
+        LogEntry
+            In order of track and position in the track.
+
+        """
+
+        cursor = self._select('logs', 'x.entry, x.beg, x."end"',
+                              LOG_FILTERS, filters, 'x.track_id, x.log')
+
+        for entry, beg, end in cursor:
+            yield LogEntry._new(entry, beg, end)
+
+    def utterances(self, **filters):
+        """Yield the utterances that match some filters.
+
+        Utterances were separated when the database was built (see
+        `add_speaker`). Their words are read from the words table.
+
+        Parameters
+        ----------
+        **filters
+            Column values to match. Keywords are 'text' (the orthography
+            of the words, separated by spaces), 'track', 'speaker',
+            'speaker_sex', 'speaker_age' and 'interviewer'.
+
+        Yields
+        ------
+        Utterance
+            In order of track and position in the track.
+
+        """
+
+        cursor = self._select('utterances', 'x.track_id, x.word_beg, '
+                              'x.word_end', UTTERANCE_FILTERS, filters,
+                              'x.track_id, x.utterance')
+
+        for track_id, word_beg, word_end in cursor:
+            words = self.connection.execute(
+                'SELECT pause, label, beg, "end", phonemic, phonetic, pos '
+                'FROM words WHERE track_id = ? AND word >= ? AND word < ? '
+                'ORDER BY word', (track_id, word_beg, word_end))
+
+            utterance = Utterance()
+
+            # the words were already checked when the utterance was
+            # separated, and may include misaligned entries
+            utterance._words = [
+                Pause._new(label, beg, end) if pause else
+                Word._new(label, beg, end, _split(phonemic), _split(phonetic),
+                          pos)
+                for pause, label, beg, end, phonemic, phonetic, pos in words]
+
+            yield utterance
+
+    def _insert_track(self, track, speaker, sep):
+        """Private method used to insert the rows for one track."""
+
+        tables = track_columns(track, speaker, sep)
+
+        track_id = self.connection.execute(
+            'INSERT INTO tracks (track, speaker) VALUES (?, ?)',
+            (track.name, speaker.name)).lastrowid
+
+        for table, name, columns in (
+                ('words', 'words', ('word', 'utterance', 'pause', 'label',
+                                    'beg', 'end', 'phonemic', 'phonetic',
+                                    'pos', 'misaligned', 'phone_beg',
+                                    'phone_end')),
+                ('phones', 'phones', ('phone', 'word', 'seg', 'beg', 'end')),
+                ('logs', 'log', ('log', 'entry', 'beg', 'end')),
+                ('utterances', 'utterances', ('utterance', 'beg', 'end',
+                                              'word_beg', 'word_end',
+                                              'text'))):
+
+            values = tables[name]
+            rows = zip([track_id] * len(values[columns[0]]),
+                       *(values[column] for column in columns))
+
+            self.connection.executemany(
+                'INSERT INTO {} VALUES ({})'.format(
+                    table, ', '.join('?' * (len(columns) + 1))), rows)
+
+    def _select(self, table, columns, allowed, filters, order):
+        """
+        Private method used to return a cursor over the rows of `table`
+        (as `x`), joined with their track (as `t`) and speaker (as `s`),
+        where each of the `filters` matches.
+
+        """
+
+        clauses = []
+        params = []
+
+        for key, value in sorted(filters.items()):
+            if key not in allowed:
+                raise ValueError('unknown filter: {}'.format(key))
+
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(value)
+
+            if value is None:
+                clauses.append('{} IS NULL'.format(allowed[key]))
+
+            else:
+                clauses.append('{} = ?'.format(allowed[key]))
+                params.append(value)
+
+        query = ('SELECT {} FROM {} AS x '
+                 'JOIN tracks AS t ON t.track_id = x.track_id '
+                 'JOIN speakers AS s ON s.speaker = t.speaker'.format(
+                     columns, table))
+
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+
+        query += ' ORDER BY ' + order
+
+        return self.connection.execute(query, params)
+
+    def _phones(self, track_id, phone_beg, phone_end):
+        """Private method used to return a list of the phones in a range
+        of a track."""
+
+        rows = self.connection.execute(
+            'SELECT seg, beg, "end" FROM phones '
+            'WHERE track_id = ? AND phone >= ? AND phone < ? ORDER BY phone',
+            (track_id, phone_beg, phone_end))
+
+        return [Phone._new(seg, beg, end) for seg, beg, end in rows]
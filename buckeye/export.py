@@ -0,0 +1,286 @@
+"""Export the Buckeye Corpus to Apache Parquet tables.
+
+The tables can be read without this package, for example with pandas,
+Polars or DuckDB. Writing them requires pyarrow, but the columns for each
+track are built with `track_columns`, which has no dependencies.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os.path
+
+from .buckeye import corpus, _phone_ranges
+from .containers import Pause, _phones_differ
+from .utterance import _utterance_ranges
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+SPEAKER_COLUMNS = ('speaker', 'sex', 'age', 'interviewer', 'track')
+
+COLUMNS = {
+    'words': SPEAKER_COLUMNS + ('word', 'utterance', 'pause', 'label', 'beg',
+                                'end', 'phonemic', 'phonetic', 'pos',
+                                'misaligned', 'phone_beg', 'phone_end'),
+    'phones': SPEAKER_COLUMNS + ('phone', 'word', 'seg', 'beg', 'end'),
+    'log': SPEAKER_COLUMNS + ('log', 'entry', 'beg', 'end'),
+    'utterances': SPEAKER_COLUMNS + ('utterance', 'beg', 'end', 'word_beg',
+                                     'word_end', 'text')
+}
+
+TABLES = ('words', 'phones', 'log', 'utterances')
+
+# type of each column in every table, as a pyarrow type alias, so that the
+# files for every speaker have the same schema even if a column is empty
+TYPES = {'speaker': 'string', 'sex': 'string', 'age': 'string',
+         'interviewer': 'string', 'track': 'string', 'word': 'int64',
+         'utterance': 'int64', 'pause': 'bool', 'label': 'string',
+         'beg': 'double', 'end': 'double', 'phonemic': 'string',
+         'phonetic': 'string', 'pos': 'string', 'misaligned': 'bool',
+         'phone_beg': 'int64', 'phone_end': 'int64', 'phone': 'int64',
+         'seg': 'string', 'log': 'int64', 'entry': 'string',
+         'word_beg': 'int64', 'word_end': 'int64', 'text': 'string'}
+
+
+def track_columns(track, speaker, sep=0.5):
+    """Return the entries in a track as columns of builtin values.
+
+    Parameters
+    ----------
+    track : Track
+
+    speaker : Speaker
+        Speaker in the track, for the speaker metadata columns.
+
+    sep : float, optional
+        Pause duration that separates utterances, as in
+        `words_to_utterances` (with `strip_pauses=True`). Default is 0.5.
+
+    Returns
+    -------
+    tables : dict
+        Mapping from each table name in `TABLES` to a dict that maps each
+        column name in `COLUMNS` to a list of values. The 'word', 'phone',
+        'log' and 'utterance' columns are positions in the track (e.g.,
+        in `track.words`), so the 'phone_beg' and 'phone_end' range of a
+        word refers to the 'phone' column, the 'word' column of a phone
+        refers to the word it belongs to (or None), and the 'utterance'
+        column of a word refers to the 'utterance' column of its
+        utterance (or None for pauses between utterances). Transcriptions
+        are joined with spaces.
+
+    """
+
+    words = track.words
+
+    # the track is not changed, so the phones of an unaligned track are
+    # found here instead of with `align_phones`
+    if words and words[0]._phone_beg is None:
+        phone_begs, phone_ends = _phone_ranges(track.phones, words)
+
+        misaligned = [word.misaligned if isinstance(word, Pause) or
+                      word.dur < 0 else
+                      _phones_differ(word.phonetic, track.phones, beg, end)
+                      for word, beg, end in zip(words, phone_begs,
+                                                phone_ends)]
+
+    else:
+        phone_begs = [word._phone_beg for word in words]
+        phone_ends = [word._phone_end for word in words]
+        misaligned = [word.misaligned for word in words]
+
+    utterances = list(_utterance_ranges(words, sep))
+
+    utterance_ids = [None] * len(words)
+    phone_words = [None] * len(track.phones)
+
+    for i, (start, stop) in enumerate(utterances):
+        utterance_ids[start:stop] = [i] * (stop - start)
+
+    for i, (beg, end) in enumerate(zip(phone_begs, phone_ends)):
+        phone_words[beg:end] = [i] * (end - beg)
+
+    def join(transcription):
+        return None if transcription is None else ' '.join(transcription)
+
+    tables = {}
+
+    tables['words'] = {
+        'word': list(range(len(words))),
+        'utterance': utterance_ids,
+        'pause': [isinstance(word, Pause) for word in words],
+        'label': [word.entry if isinstance(word, Pause) else
+                  word.orthography for word in words],
+        'beg': [word.beg for word in words],
+        'end': [word.end for word in words],
+        'phonemic': [join(getattr(word, 'phonemic', None)) for word in words],
+        'phonetic': [join(getattr(word, 'phonetic', None)) for word in words],
+        'pos': [getattr(word, 'pos', None) for word in words],
+        'misaligned': misaligned,
+        'phone_beg': phone_begs,
+        'phone_end': phone_ends
+    }
+
+    tables['phones'] = {
+        'phone': list(range(len(track.phones))),
+        'word': phone_words,
+        'seg': [phone.seg for phone in track.phones],
+        'beg': [phone.beg for phone in track.phones],
+        'end': [phone.end for phone in track.phones]
+    }
+
+    tables['log'] = {
+        'log': list(range(len(track.log))),
+        'entry': [entry.entry for entry in track.log],
+        'beg': [entry.beg for entry in track.log],
+        'end': [entry.end for entry in track.log]
+    }
+
+    tables['utterances'] = {
+        'utterance': list(range(len(utterances))),
+        'beg': [words[start].beg for start, stop in utterances],
+        'end': [words[stop - 1].end for start, stop in utterances],
+        'word_beg': [start for start, stop in utterances],
+        'word_end': [stop for start, stop in utterances],
+        'text': [' '.join(word.orthography for word in words[start:stop]
+                          if not isinstance(word, Pause))
+                 for start, stop in utterances]
+    }
+
+    metadata = (('speaker', speaker.name), ('sex', speaker.sex),
+                ('age', speaker.age), ('interviewer', speaker.interviewer),
+                ('track', track.name))
+
+    for table in tables.values():
+        rows = len(next(iter(table.values())))
+
+        for column, value in metadata:
+            table[column] = [value] * rows
+
+    return tables
+
+
+def speaker_columns(speaker, sep=0.5):
+    """Return the entries in every track of a speaker as columns.
+
+    Parameters
+    ----------
+    speaker : Speaker
+
+    sep : float, optional
+        Pause duration that separates utterances. Default is 0.5.
+
+    Returns
+    -------
+    tables : dict
+        Mapping from each table name to a dict of columns, as in
+        `track_columns`, with the rows for each track in order.
+
+    """
+
+    tables = dict((name, dict((column, []) for column in COLUMNS[name]))
+                  for name in TABLES)
+
+    for track in speaker:
+        for name, columns in track_columns(track, speaker, sep).items():
+            for column, values in columns.items():
+                tables[name][column].extend(values)
+
+    return tables
+
+
+def to_parquet(corpus_path, out_dir, tables=TABLES, columns=None, sep=0.5,
+               compression='snappy'):
+    """Write the corpus to Parquet files, partitioned by speaker.
+
+    Each table is written to `out_dir/<table>/speaker=<name>/<name>.parquet`
+    (e.g., `out_dir/words/speaker=s01/s01.parquet`), which can be read as
+    one dataset with Hive partitioning. Requires pyarrow.
+
+    Parameters
+    ----------
+    corpus_path : str
+        Path to a directory containing the zipped speaker archives (see
+        `corpus`).
+
+    out_dir : str
+        Directory to write the tables to. It is created if it does not
+        exist.
+
+    tables : sequence of str, optional
+        Tables to write, out of 'words', 'phones', 'log' and
+        'utterances'. Default is all of them.
+
+    columns : dict, optional
+        Mapping from a table name to the columns to write for that table
+        (see `COLUMNS`). Tables that aren't in the mapping are written
+        with every column. The 'speaker' column is always stored in the
+        partition path instead of the files. Default is None.
+
+    sep : float, optional
+        Pause duration that separates utterances. Default is 0.5.
+
+    compression : str, optional
+        Parquet compression codec. Default is 'snappy'.
+
+    Returns
+    -------
+    paths : list of str
+        Paths to the files that were written. Every file for a table
+        has the same schema, with the column types in `TYPES`.
+
+    """
+
+    selected = {}
+
+    for name in tables:
+        if name not in COLUMNS:
+            raise ValueError('unknown table: {}'.format(name))
+
+        selected[name] = [column for column in
+                          (columns or {}).get(name, COLUMNS[name])
+                          if column != 'speaker']
+
+        for column in selected[name]:
+            if column not in COLUMNS[name]:
+                raise ValueError('unknown column in {}: {}'.format(name,
+                                                                   column))
+
+    if pyarrow is None:
+        raise ImportError('to_parquet() requires pyarrow')
+
+    schemas = dict((name, pyarrow.schema(
+        [(column, pyarrow.type_for_alias(TYPES[column]))
+         for column in selected[name]])) for name in tables)
+
+    paths = []
+
+    for speaker in corpus(corpus_path):
+        speaker_tables = speaker_columns(speaker, sep)
+
+        for name in tables:
+            folder = os.path.join(out_dir, name,
+                                  'speaker={}'.format(speaker.name))
+
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+            path = os.path.join(folder, '{}.parquet'.format(speaker.name))
+
+            table = pyarrow.Table.from_arrays(
+                [pyarrow.array(speaker_tables[name][column], type=field.type)
+                 for column, field in zip(selected[name], schemas[name])],
+                schema=schemas[name])
+
+            pyarrow.parquet.write_table(table, path, compression=compression)
+            paths.append(path)
+
+    return paths
@@ -0,0 +1,287 @@
+"""Bulk parsers that read whole .words, .phones and .log files into
+columns.
+
+These give the same results as `process_words`, `process_phones` and
+`process_logs`, including their handling of blank lines, missing fields
+and other irregular entries. Instead of reading one line at a time, they
+check the whole file for irregular entries with a regular expression,
+and then split all of the fields at once. Files with irregular entries
+are split line by line instead. Use them with `Track(..., parser='fast')`
+or `TrackTable.from_zip(..., parser='fast')`.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import array
+import re
+
+from .containers import Word, Pause, LogEntry, Phone
+
+
+# whitespace other than newlines
+_SPACE = r'[^\S\n]'
+
+# the first line in a .phones or .log file that isn't blank, and doesn't
+# have exactly three tokens (timestamp, color and label)
+_IRREGULAR_LINE = re.compile(r'^(?!{0}*\S+{0}+\S+{0}+\S+{0}*$)(?!$)'.format(
+    _SPACE), re.MULTILINE | re.UNICODE)
+
+# a .words entry with four fields, capturing the timestamp, the label,
+# and the other three fields
+_WORD_LINE = re.compile(r'^{0}*([^\s;]+){0}+[^\s;]+{0}+([^\s;][^;\n]*?){0}*;'
+                        r'([^;\n]*);([^;\n]*);{0}*([^;\n]*?){0}*$'.format(
+                            _SPACE),
+                        re.MULTILINE | re.UNICODE)
+
+
+def parse_logs(text):
+    """Return the entries in the text of a .log file as columns.
+
+    Parameters
+    ----------
+    text : str
+        Contents of a .log file in the Buckeye Corpus.
+
+    Returns
+    -------
+    columns : dict
+        Mapping with the keys 'entry' (list of str), and 'beg' and 'end'
+        (arrays of float), with one value for each entry.
+
+    """
+
+    body = _body(text)
+
+    if not _IRREGULAR_LINE.search(body):
+        tokens = body.split()
+        return _columns({'entry': tokens[2::3]}, tokens[0::3])
+
+    rows = _rows(body)
+    entries = [None if row[2] is None else row[2].strip() for row in rows]
+
+    return _columns({'entry': entries}, [row[0] for row in rows])
+
+
+def parse_phones(text):
+    """Return the entries in the text of a .phones file as columns.
+
+    Parameters
+    ----------
+    text : str
+        Contents of a .phones file in the Buckeye Corpus.
+
+    Returns
+    -------
+    columns : dict
+        Mapping with the keys 'seg' (list of str), and 'beg' and 'end'
+        (arrays of float), with one value for each entry.
+
+    """
+
+    body = _body(text)
+
+    if not _IRREGULAR_LINE.search(body):
+        tokens = body.split()
+        times = tokens[0::3]
+        segs = tokens[2::3]
+
+    else:
+        rows = _rows(body)
+        times = [row[0] for row in rows]
+        segs = [None if row[2] is None else row[2].strip() for row in rows]
+
+    if '+1' in body or ';' in body:
+        segs = [seg if seg is None else _phone_label(seg) for seg in segs]
+
+    return _columns({'seg': segs}, times)
+
+
+def parse_words(text):
+    """Return the entries in the text of a .words file as columns.
+
+    Parameters
+    ----------
+    text : str
+        Contents of a .words file in the Buckeye Corpus.
+
+    Returns
+    -------
+    columns : dict
+        Mapping with the keys 'label', 'phonemic', 'phonetic' and 'pos'
+        (lists of the corresponding Word attributes, where 'label' holds
+        the orthography of a Word or the entry of a Pause), 'pause' (list
+        of bool, True for entries that begin with '{' or '<'), and 'beg'
+        and 'end' (arrays of float), with one value for each entry.
+
+    """
+
+    body = _body(text)
+    lines = body.split('\n')
+    rows = _WORD_LINE.findall(body)
+
+    # there is at most one match on each line, so every line matched if
+    # the counts are the same
+    if len(rows) == len(lines) - lines.count(''):
+        phonemics = [row[2].split() for row in rows]
+        phonetics = [row[3].split() for row in rows]
+
+    else:
+        rows = _word_rows(body)
+        phonemics = [row[2] for row in rows]
+        phonetics = [row[3] for row in rows]
+
+    labels = [row[1] for row in rows]
+
+    return _columns({'label': labels,
+                     'phonemic': phonemics,
+                     'phonetic': phonetics,
+                     'pos': [row[4] for row in rows],
+                     'pause': [label.startswith(('<', '{'))
+                               for label in labels]},
+                    [row[0] for row in rows])
+
+
+def to_logs(columns):
+    """Return a list of LogEntry instances from `parse_logs` columns."""
+
+    return list(map(LogEntry._new, columns['entry'], columns['beg'].tolist(),
+                    columns['end'].tolist()))
+
+
+def to_phones(columns):
+    """Return a list of Phone instances from `parse_phones` columns."""
+
+    return list(map(Phone._new, columns['seg'], columns['beg'].tolist(),
+                    columns['end'].tolist()))
+
+
+def to_words(columns):
+    """Return a list of Word and Pause instances from `parse_words`
+    columns."""
+
+    new_pause = Pause._new
+    new_word = Word._new
+
+    return [new_pause(label, beg, end) if pause else
+            new_word(label, beg, end, phonemic, phonetic, pos)
+            for label, beg, end, phonemic, phonetic, pos, pause in
+            zip(columns['label'], columns['beg'].tolist(),
+                columns['end'].tolist(), columns['phonemic'],
+                columns['phonetic'], columns['pos'], columns['pause'])]
+
+
+def _body(text):
+    """Return the text after the header of a file, ending with a newline
+    unless it is empty.
+
+    Raises EOFError if there is no header, as the line-by-line parsers do.
+
+    """
+
+    if text.startswith('#'):
+        start = 0
+
+    else:
+        start = text.find('\n#') + 1
+
+        if start == 0:
+            raise EOFError
+
+    start = text.find('\n', start) + 1
+
+    if start == 0:
+        return ''
+
+    body = text[start:]
+
+    if body and not body.endswith('\n'):
+        body += '\n'
+
+    return body
+
+
+def _rows(body):
+    """Return `[time, color, label]` lists for the lines of a .phones or
+    .log file, with None for a missing label, skipping blank lines."""
+
+    rows = []
+
+    for line in body.split('\n')[:-1]:
+        fields = line.split(None, 2)
+
+        if len(fields) == 3:
+            rows.append(fields)
+
+        elif line != '':
+            time, color = line.split()
+            rows.append([time, color, None])
+
+    return rows
+
+
+def _word_rows(body):
+    """Return `(time, label, phonemic, phonetic, pos)` tuples for the lines
+    of a .words file, with None for missing fields, skipping blank lines."""
+
+    rows = []
+
+    for line in body.split('\n')[:-1]:
+        fields = [l.strip() for l in line.strip().split(';')]
+
+        if len(fields) == 4:
+            word, phonemic, phonetic, pos = fields
+            phonemic = phonemic.split()
+            phonetic = phonetic.split()
+
+        elif line == '':
+            continue
+
+        # 22 entries have missing fields (see `process_words`)
+        elif len(fields) == 2:
+            word, pos = fields
+            phonemic = phonetic = None
+
+        elif len(fields) == 3:
+            word, phonemic, pos = fields
+            phonemic = phonemic.split()
+            phonetic = None
+
+        else:
+            raise ValueError('malformed .words entry: {}'.format(line))
+
+        # s1801a has a missing newline in the first entry, which is kept
+        # in the label, as in `process_words`
+        time, color, word = (w.strip() for w in word.split(None, 2))
+
+        rows.append((time, word, phonemic, phonetic, pos))
+
+    return rows
+
+
+def _phone_label(seg):
+    """Return a phone label without a '+1' or ';' suffix."""
+
+    if '+1' in seg:
+        seg = seg.replace('+1', '')
+
+    if ';' in seg:
+        seg = seg.split(';')[0]
+
+    return seg.strip()
+
+
+def _columns(columns, times):
+    """Add 'beg' and 'end' arrays to `columns` from the end timestamps
+    of each entry, where each entry begins where the previous one ends."""
+
+    ends = array.array(str('d'), map(float, times))
+    begs = array.array(str('d'), [0.0] if ends else []) + ends[:-1]
+
+    columns['beg'] = begs
+    columns['end'] = ends
+
+    return columns
@@ -0,0 +1,405 @@
+"""Indexes for searching the entries in the Buckeye Corpus.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import array
+import bisect
+import io
+import os
+import pickle
+import tempfile
+
+from .containers import Pause
+
+
+# increment this when the layout of saved indexes changes
+INDEX_VERSION = 1
+
+
+class IntervalIndex(object):
+    """Static index of time intervals that answers overlap queries.
+
+    Intervals are sorted by their beginning, and a balanced tree over the
+    sorted intervals stores the latest end in each subtree, so a query
+    only descends into subtrees that contain a result. For k results,
+    it takes O(log n + k) steps if the results are next to each other in
+    the sorted order, and up to O((k + 1) log n) steps if they are
+    scattered, for example when misaligned entries reach past their
+    neighbours. Intervals may overlap each other, and an interval with a
+    negative duration (where `end` is before `beg`) is indexed as if its
+    timestamps were swapped.
+
+    Parameters
+    ----------
+    begs : sequence of float
+        Timestamp where each interval begins.
+
+    ends : sequence of float
+        Timestamp where each interval ends.
+
+    """
+
+    def __init__(self, begs, ends):
+        lows = [min(beg, end) for beg, end in zip(begs, ends)]
+        highs = [max(beg, end) for beg, end in zip(begs, ends)]
+
+        self._order = sorted(range(len(lows)), key=lows.__getitem__)
+        self._lows = [lows[i] for i in self._order]
+
+        size = 1
+        while size < len(lows):
+            size *= 2
+
+        tree = [float('-inf')] * (2 * size)
+
+        for pos, i in enumerate(self._order):
+            tree[size + pos] = highs[i]
+
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+
+        self._size = size
+        self._tree = tree
+
+    def __len__(self):
+        return len(self._order)
+
+    def overlapping(self, beg, end):
+        """Return the intervals that overlap with a given interval.
+
+        As in `Track.get_logs`, the interval does not include its
+        boundaries, so an indexed interval that ends at `beg` or begins
+        at `end` is not returned, and nothing is returned if `end` is
+        before `beg`.
+
+        Parameters
+        ----------
+        beg : float
+            Beginning of the interval.
+
+        end : float
+            End of the interval.
+
+        Returns
+        -------
+        indices : list of int
+            Sorted positions of the overlapping intervals in the `begs`
+            and `ends` sequences that the index was built from.
+
+        """
+
+        if end < beg:
+            return []
+
+        # only intervals that begin before `end` can overlap
+        right = bisect.bisect_left(self._lows, end)
+
+        size = self._size
+        tree = self._tree
+
+        found = []
+        stack = [(1, 0, size)]
+
+        while stack:
+            node, lo, hi = stack.pop()
+
+            # skip subtrees where every interval begins too late or ends
+            # too early
+            if lo >= right or tree[node] <= beg:
+                continue
+
+            if node >= size:
+                found.append(self._order[lo])
+                continue
+
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+
+        found.sort()
+
+        return found
+
+
+class CorpusIndex(object):
+    """Inverted index of the Word entries in the Buckeye Corpus.
+
+    Maps the orthography, part of speech, phonemic transcription and
+    phonetic transcription of every Word (but not Pause) entry to the
+    tracks and positions where it occurs, so that tokens can be found
+    without parsing the corpus. Transcriptions are indexed as a single
+    string, with segments separated by spaces.
+
+    Use CorpusIndex.from_corpus(corpus(path)) to build an index, and
+    `save` and `load` to store it on disk.
+
+    Attributes
+    ----------
+    speakers : list of str
+        Names of the indexed speakers (e.g., 's01').
+
+    tracks : list of str
+        Names of the indexed tracks (e.g., 's0101a').
+
+    """
+
+    FIELDS = ('orthography', 'pos', 'phonemic', 'phonetic')
+
+    def __init__(self):
+        self.speakers = []
+        self.tracks = []
+
+        # speaker number of each track
+        self._track_speakers = array.array(str('i'))
+
+        # for each field, map each value to an array of (track number,
+        # word index) pairs, flattened
+        self._postings = dict((field, {}) for field in self.FIELDS)
+
+    def __repr__(self):
+        return 'CorpusIndex()'
+
+    def __str__(self):
+        return '<CorpusIndex ({} speakers, {} tracks)>'.format(
+            len(self.speakers), len(self.tracks))
+
+    @classmethod
+    def from_corpus(cls, speakers):
+        """Return a CorpusIndex of the words in some speakers.
+
+        Parameters
+        ----------
+        speakers : iterable of Speaker
+            Speakers to index, such as the generator returned by
+            `corpus()`. Only one speaker is referenced at a time.
+
+        Returns
+        -------
+        CorpusIndex
+
+        """
+
+        index = cls()
+
+        for speaker in speakers:
+            index.add_speaker(speaker)
+
+        return index
+
+    def add_speaker(self, speaker):
+        """Add the words in every track of a Speaker to the index.
+
+        Parameters
+        ----------
+        speaker : Speaker
+
+        Returns
+        -------
+        None
+
+        """
+
+        for track in speaker:
+            self.add_track(track, speaker.name)
+
+    def add_track(self, track, speaker):
+        """Add the words in a Track to the index.
+
+        Parameters
+        ----------
+        track : Track
+
+        speaker : str
+            Name of the speaker in the track (e.g., 's01').
+
+        Returns
+        -------
+        None
+
+        """
+
+        if speaker not in self.speakers:
+            self.speakers.append(speaker)
+
+        track_number = len(self.tracks)
+        self.tracks.append(track.name)
+        self._track_speakers.append(self.speakers.index(speaker))
+
+        for field in self.FIELDS:
+            postings = self._postings[field]
+
+            for i, word in enumerate(track.words):
+                if isinstance(word, Pause):
+                    continue
+
+                value = _key(getattr(word, field))
+
+                if value is None:
+                    continue
+
+                if value not in postings:
+                    postings[value] = array.array(str('i'))
+
+                postings[value].extend((track_number, i))
+
+    def keys(self, field):
+        """Return a list of the values of `field` in the index.
+
+        Parameters
+        ----------
+        field : str
+            One of 'orthography', 'pos', 'phonemic' or 'phonetic'.
+
+        Returns
+        -------
+        keys : list of str
+
+        """
+
+        return list(self._field(field))
+
+    def count(self, field, value):
+        """Return the number of words where `field` is `value`.
+
+        Parameters
+        ----------
+        field : str
+            One of 'orthography', 'pos', 'phonemic' or 'phonetic'.
+
+        value : str or list of str
+            Value to count. Transcriptions may be given as a list of
+            segments or as a string with segments separated by spaces.
+
+        Returns
+        -------
+        count : int
+
+        """
+
+        return len(self._field(field).get(_key(value), ())) // 2
+
+    def lookup(self, field, value):
+        """Return the locations of every word where `field` is `value`.
+
+        Parameters
+        ----------
+        field : str
+            One of 'orthography', 'pos', 'phonemic' or 'phonetic'.
+
+        value : str or list of str
+            Value to find. Transcriptions may be given as a list of
+            segments or as a string with segments separated by spaces.
+
+        Returns
+        -------
+        postings : list of tuple
+            One `(speaker, track, index)` tuple for each word, where
+            `speaker` and `track` are names (e.g., 's01' and 's0101a') and
+            `index` is the position of the word in `Track.words`.
+
+        """
+
+        postings = self._field(field).get(_key(value), ())
+
+        return [(self.speakers[self._track_speakers[postings[i]]],
+                 self.tracks[postings[i]], postings[i + 1])
+                for i in range(0, len(postings), 2)]
+
+    def save(self, path):
+        """Write the index to a file.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        None
+
+        """
+
+        # store the postings for each field as one array, with the
+        # boundary of each value in another, so that loading doesn't
+        # need to construct an object for every value
+        fields = {}
+
+        for field in self.FIELDS:
+            postings = self._postings[field]
+            keys = list(postings)
+            offsets = array.array(str('i'), [0])
+            flat = array.array(str('i'))
+
+            for key in keys:
+                flat.extend(postings[key])
+                offsets.append(len(flat))
+
+            fields[field] = (keys, offsets, flat)
+
+        record = (INDEX_VERSION, self.speakers, self.tracks,
+                  self._track_speakers, fields)
+
+        folder = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+
+        with os.fdopen(handle, 'wb') as saved:
+            pickle.dump(record, saved, pickle.HIGHEST_PROTOCOL)
+
+        replace = getattr(os, 'replace', os.rename)
+        replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Return a CorpusIndex from a file written by `save`.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        CorpusIndex
+
+        """
+
+        with io.open(path, 'rb') as saved:
+            version, speakers, tracks, track_speakers, fields = \
+                pickle.load(saved)
+
+        if version != INDEX_VERSION:
+            raise ValueError('index file has version {}, expected {}'.format(
+                version, INDEX_VERSION))
+
+        index = cls()
+        index.speakers = speakers
+        index.tracks = tracks
+        index._track_speakers = track_speakers
+
+        for field, (keys, offsets, flat) in fields.items():
+            index._postings[field] = dict(
+                (key, flat[offsets[i]:offsets[i + 1]])
+                for i, key in enumerate(keys))
+
+        return index
+
+    def _field(self, field):
+        """Private method used to return the postings for `field`."""
+
+        try:
+            return self._postings[field]
+
+        except KeyError:
+            raise ValueError('unknown field: {}'.format(field))
+
+
+def _key(value):
+    """Return a transcription as one string, or any other value as is."""
+
+    if isinstance(value, list):
+        return ' '.join(value)
+
+    return value
@@ -0,0 +1,296 @@
+"""Search for sequences of phones in the Buckeye Corpus.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import array
+
+from .table import Vocabulary
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+
+WILDCARD = '*'
+
+
+class PhoneMatch(object):
+    """A sequence of phones in a track that matches a search pattern.
+
+    Parameters
+    ----------
+    track : Track
+        Track where the match was found.
+
+    start : int
+        Index in `track.phones` of the first phone in the match.
+
+    stop : int
+        Index in `track.phones` after the last phone in the match.
+
+    words : list of Word and Pause
+        Entries in `track.words` that the matched phones belong to.
+
+    Attributes
+    ----------
+    track
+    start
+    stop
+    words
+    phones
+    beg
+    end
+
+    """
+
+    def __init__(self, track, start, stop, words):
+        self.track = track
+        self.start = start
+        self.stop = stop
+        self.words = words
+
+    def __repr__(self):
+        return 'PhoneMatch({}, {}, {}, {})'.format(
+            repr(self.track), self.start, self.stop, repr(self.words))
+
+    def __str__(self):
+        return '<PhoneMatch {} [{}] at {}-{}>'.format(
+            self.track.name, ' '.join(p.seg for p in self.phones),
+            self.beg, self.end)
+
+    @property
+    def phones(self):
+        """List of the matched Phone instances."""
+        return self.track.phones[self.start:self.stop]
+
+    @property
+    def beg(self):
+        """Timestamp where the first matched phone begins."""
+        return self.track.phones[self.start].beg
+
+    @property
+    def end(self):
+        """Timestamp where the last matched phone ends."""
+        return self.track.phones[self.stop - 1].end
+
+
+class PhoneSearch(object):
+    """Index of the phone sequences in a set of tracks.
+
+    Phone labels are stored as integer codes, with a list of the
+    positions of each code, so a search only checks the positions of the
+    least frequent phone in the pattern. Matches can cross word
+    boundaries.
+
+    Parameters
+    ----------
+    tracks : iterable of Track, optional
+        Tracks to index. Default is None.
+
+    Attributes
+    ----------
+    labels : Vocabulary
+        Vocabulary for the phone labels.
+
+    tracks : list of Track
+        Indexed tracks, in the order they were added.
+
+    """
+
+    def __init__(self, tracks=None):
+        self.labels = Vocabulary()
+        self.tracks = []
+
+        # for each track, the code of each phone and the index of the
+        # entry in `track.words` that each phone belongs to (or -1)
+        self._codes = []
+        self._owners = []
+
+        # map each code to an array of (track number, phone index) pairs,
+        # flattened
+        self._postings = {}
+
+        if tracks is not None:
+            for track in tracks:
+                self.add_track(track)
+
+    def __repr__(self):
+        return 'PhoneSearch()'
+
+    def __str__(self):
+        return '<PhoneSearch ({} tracks)>'.format(len(self.tracks))
+
+    @classmethod
+    def from_corpus(cls, speakers):
+        """Return a PhoneSearch index of every track in some speakers.
+
+        Parameters
+        ----------
+        speakers : iterable of Speaker
+            Speakers to index, such as the generator returned by
+            `corpus()`.
+
+        Returns
+        -------
+        PhoneSearch
+
+        """
+
+        return cls(track for speaker in speakers for track in speaker)
+
+    def add_track(self, track):
+        """Add the phones in a Track to the index.
+
+        Parameters
+        ----------
+        track : Track
+
+        Returns
+        -------
+        None
+
+        """
+
+        track_number = len(self.tracks)
+        code = self.labels.code
+        postings = self._postings
+
+        codes = array.array(str('i'))
+
+        for i, phone in enumerate(track.phones):
+            value = code(phone.seg)
+            codes.append(value)
+
+            if value not in postings:
+                postings[value] = array.array(str('i'))
+
+            postings[value].extend((track_number, i))
+
+        # follow the references from each word to its phones, so that a
+        # match can be linked back to its words
+        positions = dict((id(phone), i) for i, phone in
+                         enumerate(track.phones))
+        owners = array.array(str('i'), [-1]) * len(track.phones)
+
+        for i, word in enumerate(track.words):
+            for phone in word.phones or ():
+                owners[positions[id(phone)]] = i
+
+        self.tracks.append(track)
+        self._codes.append(codes)
+        self._owners.append(owners)
+
+    def search(self, pattern):
+        """Return every sequence of phones that matches a pattern.
+
+        Parameters
+        ----------
+        pattern : str or list of str
+            Sequence of phone labels, as a list or as a string with labels
+            separated by spaces (e.g., 't ah n'). The label '*' matches
+            any one phone, and labels separated by '|' match any one of
+            them (e.g., 't|d ah n').
+
+        Returns
+        -------
+        matches : list of PhoneMatch
+            Matches in the order of the indexed tracks, and then by their
+            position in the track. Matches can overlap.
+
+        """
+
+        tokens = self._compile(pattern)
+
+        if not tokens:
+            raise ValueError('empty pattern')
+
+        starts = self._candidates(tokens)
+        matches = []
+
+        for track_number, start in starts:
+            codes = self._codes[track_number]
+            stop = start + len(tokens)
+
+            if start < 0 or stop > len(codes):
+                continue
+
+            if all(token is None or codes[start + j] in token
+                   for j, token in enumerate(tokens)):
+                matches.append(self._match(track_number, start, stop))
+
+        return matches
+
+    def _compile(self, pattern):
+        """
+        Private method used to convert a pattern to a list with a set of
+        codes for each position, or None for a wildcard.
+
+        """
+
+        if isinstance(pattern, string_types):
+            pattern = pattern.split()
+
+        tokens = []
+
+        for token in pattern:
+            if token == WILDCARD:
+                tokens.append(None)
+
+            else:
+                tokens.append(frozenset(self.labels.find(label) for label in
+                                        token.split('|')))
+
+        return tokens
+
+    def _candidates(self, tokens):
+        """
+        Private method used to return sorted (track number, start) pairs
+        where `tokens` might match, using the postings of the position in
+        the pattern with the fewest of them.
+
+        """
+
+        best = None
+
+        for j, token in enumerate(tokens):
+            if token is None:
+                continue
+
+            postings = [self._postings.get(code, ()) for code in token]
+            size = sum(len(p) for p in postings)
+
+            if best is None or size < best[0]:
+                best = (size, j, postings)
+
+        # every position is a wildcard
+        if best is None:
+            return [(track_number, start)
+                    for track_number, codes in enumerate(self._codes)
+                    for start in range(len(codes))]
+
+        size, offset, postings = best
+
+        return sorted((p[i], p[i + 1] - offset) for p in postings
+                      for i in range(0, len(p), 2))
+
+    def _match(self, track_number, start, stop):
+        """Private method used to return a PhoneMatch for a span."""
+
+        track = self.tracks[track_number]
+        owners = self._owners[track_number]
+
+        words = []
+        last = -1
+
+        for i in range(start, stop):
+            if owners[i] != -1 and owners[i] != last:
+                last = owners[i]
+                words.append(track.words[last])
+
+        return PhoneMatch(track, start, stop, words)
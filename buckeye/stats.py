@@ -0,0 +1,408 @@
+"""Record where the time goes while the corpus is loaded.
+
+Instrumentation is off unless an observer is registered, for example with
+the `record` context manager::
+
+    from buckeye import stats
+
+    with stats.record() as recorder:
+        speaker = Speaker.from_zip('s01.zip')
+
+    print(recorder.to_json())
+
+Each call to `Speaker.from_zip`, `Track.from_zip` or `Track.__init__`
+produces one record, with the wall time, bytes, entries and objects for
+each stage of the call:
+
+* 'inflate': reading and decompressing archive members.
+* 'decode': decoding the annotation files from latin-1.
+* 'parse': parsing the annotation files. With `parser='default'` this
+  includes constructing the Word, Pause, Phone and LogEntry instances.
+* 'construct': constructing the instances, with `parser='fast'`.
+* 'align': linking Word and Pause instances to their phones.
+* 'wav': reading the .wav file.
+* 'cache': reading parsed entries from the disk cache.
+
+A stage is counted in the innermost call that it happens in. When the
+annotations are streamed (`stream=True`), inflating and decoding happen
+during the 'parse' stage. Calls that run in other processes (with the
+`workers` option) are not recorded.
+
+The 'objects' count comes from the number of memory blocks allocated by
+the whole process, so it is only meaningful when nothing else allocates
+while the stage runs. It is None for a stage that overlapped with a
+stage in another thread (for example, with the `threads` option), but
+allocations by other threads of the program can't be detected.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import contextlib
+import json
+import sys
+import threading
+import time
+
+
+# use the most precise clock that is available
+clock = getattr(time, 'perf_counter', time.time)
+
+STAGE_FIELDS = ('calls', 'seconds', 'bytes', 'entries', 'objects')
+
+_observers = []
+_lock = threading.Lock()
+_local = threading.local()
+
+# the stages that are running in every thread, to detect overlaps
+_running = set()
+
+
+def add_observer(observer):
+    """Register a function to call with the record of each finished call.
+
+    Parameters
+    ----------
+    observer : callable
+        Function that takes one argument, a record dict (see
+        `Recorder.records`). It is called from the thread that made the
+        call, so it should be thread-safe.
+
+    Returns
+    -------
+    None
+
+    """
+
+    with _lock:
+        _observers.append(observer)
+
+
+def remove_observer(observer):
+    """Unregister a function that was registered with `add_observer`.
+
+    Parameters
+    ----------
+    observer : callable
+
+    Returns
+    -------
+    None
+
+    """
+
+    with _lock:
+        _observers.remove(observer)
+
+
+@contextlib.contextmanager
+def record():
+    """Record every call while the context is active.
+
+    Yields
+    ------
+    Recorder
+
+    """
+
+    recorder = Recorder()
+    add_observer(recorder.observe)
+
+    try:
+        yield recorder
+
+    finally:
+        remove_observer(recorder.observe)
+
+
+class Recorder(object):
+    """Observer that collects records.
+
+    Attributes
+    ----------
+    records : list of dict
+        One record for each finished call, in the order they finished
+        (so the calls to `Track.__init__` inside a call to
+        `Track.from_zip` come first). Each record has the keys 'call'
+        (e.g., 'Track.from_zip'), 'name' (of the speaker or track),
+        'parent' (the enclosing call, or None), 'seconds' (the wall time
+        of the whole call), and 'stages', which maps each stage name to a
+        dict with the number of 'calls', the 'seconds', the 'bytes' read,
+        the 'entries' parsed, and the net number of memory blocks that
+        were allocated ('objects'), which approximates the number of
+        objects created and still alive after the stage. The count is
+        for the whole process (see the module docstring). 'objects' is
+        None if the interpreter doesn't count memory blocks, or if the
+        stage overlapped with a stage in another thread.
+
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'Recorder()'
+
+    def __str__(self):
+        return '<Recorder ({} records)>'.format(len(self.records))
+
+    def observe(self, record):
+        """Store a record. Registered as an observer by `record`."""
+
+        with self._lock:
+            self.records.append(record)
+
+    def totals(self):
+        """Return the totals for each stage over every record.
+
+        Returns
+        -------
+        stages : dict
+            Mapping from each stage name to a dict of totals, with the
+            same keys as in `records`.
+
+        """
+
+        totals = {}
+
+        for item in self.records:
+            for name, stage in item['stages'].items():
+                total = totals.setdefault(name, _new_stage())
+
+                for field in STAGE_FIELDS:
+                    if total[field] is not None and stage[field] is not None:
+                        total[field] += stage[field]
+
+                    else:
+                        total[field] = None
+
+        return totals
+
+    def to_dict(self):
+        """Return the records and the totals for each stage.
+
+        Returns
+        -------
+        results : dict
+            Mapping with the keys 'records' and 'stages' (see `records`
+            and `totals`).
+
+        """
+
+        return {'records': list(self.records), 'stages': self.totals()}
+
+    def to_json(self, **kwargs):
+        """Return the results of `to_dict` as a JSON string.
+
+        Parameters
+        ----------
+        **kwargs
+            Passed to `json.dumps`.
+
+        Returns
+        -------
+        str
+
+        """
+
+        kwargs.setdefault('sort_keys', True)
+
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def call(name, target):
+    """Return a context manager that records one instrumented call.
+
+    Used inside the package. Does nothing unless an observer is
+    registered.
+
+    Parameters
+    ----------
+    name : str
+        Name of the function or method (e.g., 'Track.from_zip').
+
+    target : str
+        Name of the speaker or track.
+
+    Returns
+    -------
+    context manager
+
+    """
+
+    if not _observers:
+        return _NULL
+
+    return _Call(name, target)
+
+
+def stage(name):
+    """Return a context manager that measures one stage of a call.
+
+    Used inside the package. Does nothing unless an observer is
+    registered. Use the `add` method of the returned object to count
+    bytes and entries.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage (e.g., 'parse').
+
+    Returns
+    -------
+    context manager
+
+    """
+
+    if not _observers:
+        return _NULL
+
+    return _Stage(name)
+
+
+class _Null(object):
+    """Context manager that does nothing, used when no observer is
+    registered."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def add(self, bytes=0, entries=0):
+        pass
+
+
+_NULL = _Null()
+
+
+class _Call(object):
+    """Context manager for `call`."""
+
+    def __init__(self, name, target):
+        self.record = {'call': name, 'name': target, 'parent': None,
+                       'seconds': None, 'stages': {}}
+
+    def __enter__(self):
+        stack = _stack()
+
+        if stack:
+            self.record['parent'] = stack[-1]['call']
+
+        stack.append(self.record)
+        self.start = clock()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.record['seconds'] = clock() - self.start
+        _stack().pop()
+
+        for observer in list(_observers):
+            observer(self.record)
+
+        return False
+
+
+class _Stage(object):
+    """Context manager for `stage`."""
+
+    def __init__(self, name):
+        self.name = name
+        self.bytes = 0
+        self.entries = 0
+        self.thread = threading.current_thread()
+        self.overlapped = False
+
+    def __enter__(self):
+        with _lock:
+            for other in _running:
+                if other.thread is not self.thread:
+                    other.overlapped = True
+                    self.overlapped = True
+
+            _running.add(self)
+
+        self.blocks = _blocks()
+        self.start = clock()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = clock() - self.start
+        blocks = _blocks()
+
+        with _lock:
+            _running.discard(self)
+
+        # blocks allocated by another thread would be counted here too
+        if self.overlapped:
+            blocks = None
+
+        stack = _stack()
+
+        if stack:
+            stages = stack[-1]['stages']
+
+        else:
+            # a stage outside of any call, such as reading a track archive
+            # in a thread, gets a record of its own
+            stages = {}
+
+        stage = stages.setdefault(self.name, _new_stage())
+        stage['calls'] += 1
+        stage['seconds'] += seconds
+        stage['bytes'] += self.bytes
+        stage['entries'] += self.entries
+
+        if blocks is None or stage['objects'] is None:
+            stage['objects'] = None
+
+        else:
+            stage['objects'] += blocks - self.blocks
+
+        if not stack:
+            orphan = {'call': None, 'name': None, 'parent': None,
+                      'seconds': seconds, 'stages': stages}
+
+            for observer in list(_observers):
+                observer(orphan)
+
+        return False
+
+    def add(self, bytes=0, entries=0):
+        """Count bytes read and entries parsed in this stage."""
+        self.bytes += bytes
+        self.entries += entries
+
+
+def _stack():
+    """Return the stack of active call records for this thread."""
+
+    try:
+        return _local.stack
+
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def _new_stage():
+    """Return a dict of zero totals for one stage."""
+    return {'calls': 0, 'seconds': 0.0, 'bytes': 0, 'entries': 0,
+            'objects': 0}
+
+
+def _blocks():
+    """Return the number of allocated memory blocks, or None."""
+
+    try:
+        return sys.getallocatedblocks()
+
+    except AttributeError:
+        return None
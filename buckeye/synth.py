@@ -0,0 +1,511 @@
+"""Generate synthetic speaker archives in the format of the Buckeye Corpus.
+
+The archives are laid out like the real corpus, with a zipped archive for
+each track nested inside a zipped archive for each speaker (e.g.,
+'s01.zip' containing 's01/s0101a.zip'), so they can be read with
+`corpus` and `Speaker.from_zip` to test loading, indexing and parallel
+processing at any scale without the corpus itself. The contents are
+random, but the same for the same seed.
+
+Run from the command line with ``python -m buckeye.synth``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import io
+import os
+import random
+import struct
+import wave
+import zipfile
+
+from .buckeye import SPEAKERS
+
+
+SEGMENTS = ['aa', 'ae', 'ah', 'ay', 'b', 'd', 'dh', 'eh', 'er', 'ey', 'f',
+            'g', 'hh', 'ih', 'iy', 'k', 'l', 'm', 'n', 'ow', 'p', 'r', 's',
+            't', 'uw', 'v', 'w', 'y', 'z']
+
+VOWELS = ['aa', 'ae', 'ah', 'ay', 'eh', 'er', 'ey', 'ih', 'iy', 'ow', 'uw']
+
+POS = ['CC', 'DT', 'IN', 'JJ', 'NN', 'PRP', 'RB', 'UH', 'VB', 'VBZ']
+
+# common words, with their phonemic transcription and part of speech
+LEXICON = [('i', 'ay', 'PRP'), ('and', 'ae n d', 'CC'),
+           ('the', 'dh iy', 'DT'), ('you', 'y uw', 'PRP'),
+           ('that', 'dh ae t', 'DT'), ('know', 'n ow', 'VB'),
+           ('it', 'ih t', 'PRP'), ('to', 't uw', 'TO'),
+           ('a', 'ey', 'DT'), ('like', 'l ay k', 'IN'),
+           ('yeah', 'y eh', 'UH'), ('uh', 'ah', 'UH'),
+           ('um', 'ah m', 'UH'), ('was', 'w ah z', 'VBD'),
+           ('of', 'ah v', 'IN'), ('they', 'dh ey', 'PRP'),
+           ('in', 'ih n', 'IN'), ('so', 's ow', 'RB'),
+           ('but', 'b ah t', 'CC'), ('is', 'ih z', 'VBZ')]
+
+# labels of the Pause entries, and their share of the pauses
+PAUSES = [('<SIL>', 0.6), ('<NOISE>', 0.1), ('<VOCNOISE>', 0.1),
+          ('<LAUGH>', 0.05), ('<IVER>', 0.15)]
+
+LOG_ENTRIES = ['<VOICE=modal>', '<VOICE=creaky>', '<VOICE=breathy>',
+               '<CONF=L>', '<EXCLUDE-name>']
+
+HEADER = """signal {}
+type 0
+color 121
+comment created by buckeye.synth
+font -misc-*-bold-*-*-*-15-*-*-*-*-*-*-*
+separator ;
+nfields {}
+#
+"""
+
+# irregular entries in the real corpus (see `process_words` and
+# `process_phones`), which are only generated when requested
+QUIRKS = ('merged_line', 'negative_start', 'reversed_time', 'missing_fields',
+          'missing_label', 'phone_suffix', 'blank_lines')
+
+# tracks are named with two digits and a letter, as matched by TRACK_RE
+TRACK_SUFFIXES = ['{:02d}{}'.format(number, letter)
+                  for number in range(1, 7) for letter in 'ab']
+
+
+def synthetic_track(words=10000, seed=0, quirks=(), name='s0101a'):
+    """Return the contents of the annotation files for a synthetic track.
+
+    Parameters
+    ----------
+    words : int, optional
+        Number of entries in the .words file. Default is 10000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    quirks : bool or iterable of str, optional
+        Irregular entries to include, out of the names in `QUIRKS`, or
+        True for all of them. Each one is included at least once in a
+        track with more than four entries:
+
+        * 'merged_line': the first entry has two labels on one line, as
+          in s1801a.
+        * 'negative_start': the first entry ends at -1.0, as in s1603b.
+        * 'reversed_time': an entry ends before the previous one, as in
+          s2801a.
+        * 'missing_fields': entries with only two or three fields.
+        * 'missing_label': .phones and .log entries without a label.
+        * 'phone_suffix': phone labels with a '+1' or ';' suffix.
+        * 'blank_lines': blank lines between entries.
+
+        The misaligned entries from 'negative_start' and 'reversed_time'
+        make `words_to_utterances` raise a ValueError, as the real ones
+        do. Default is (), for no irregular entries.
+
+    name : str, optional
+        Name of the track, for the file headers. Default is 's0101a'.
+
+    Returns
+    -------
+    files : dict
+        Mapping from each file extension ('.words', '.phones', '.log' and
+        '.txt') to the contents of the file, as a str.
+
+    """
+
+    quirks = _quirks(quirks)
+    rng = random.Random(seed)
+
+    word_lines = [HEADER.format(name, 4).rstrip('\n')]
+    phone_lines = [HEADER.format(name, 1).rstrip('\n')]
+    log_lines = [HEADER.format(name, 1).rstrip('\n')]
+    txt_lines = []
+
+    utterance = []
+    now = 0.0
+
+    # entries where the irregular lines go, chosen up front so that each
+    # one appears at least once
+    special = {}
+
+    line_quirks = [quirk for quirk in ('reversed_time', 'missing_fields',
+                                       'missing_label', 'phone_suffix')
+                   if quirk in quirks]
+
+    if words > 4:
+        positions = rng.sample(range(1, words - 1),
+                               min(len(line_quirks), words - 2))
+        special = dict(zip(positions, line_quirks))
+
+    for i in range(words):
+        line_quirk = special.get(i)
+
+        if 'blank_lines' in quirks and (i == 1 or rng.random() < 0.01):
+            word_lines.append('')
+            phone_lines.append('')
+
+        # the conversation is framed by transcription markers, as in the
+        # real corpus
+        if i == 0 or i == words - 1 or (line_quirk is None and
+                                         rng.random() < 0.1):
+            if i == 0:
+                label = '{B_TRANS}'
+
+            elif i == words - 1:
+                label = '{E_TRANS}'
+
+            else:
+                label = _weighted(rng, PAUSES)
+
+            duration = rng.uniform(0.05, 0.8)
+            now += duration
+
+            time = now
+
+            if i == 0 and 'negative_start' in quirks:
+                time = -1.0
+
+            if i == 0 and 'merged_line' in quirks:
+                line = '{:>9.6f}  122 {}   {:>9.6f}  121 {}'.format(
+                    time, label, time, '<SIL>; S; S; null')
+
+            elif i == words - 1 and 'missing_fields' in quirks:
+                line = '{:>9.6f}  122 {}; null'.format(time, label)
+
+            else:
+                line = '{:>9.6f}  121 {}; S; S; null'.format(time, label)
+
+            word_lines.append(line)
+            phone_lines.append('{:>9.6f}  121 {}'.format(
+                now, label.strip('<>{}')))
+
+            if duration >= 0.5 and utterance:
+                txt_lines.append(' '.join(utterance))
+                utterance = []
+
+            continue
+
+        if rng.random() < 0.7:
+            word, phonemic, pos = rng.choice(LEXICON)
+            phonemic = phonemic.split()
+
+        else:
+            phonemic = [rng.choice(SEGMENTS)
+                        for _ in range(rng.randint(1, 6))]
+            word = ''.join(phonemic)
+            pos = rng.choice(POS)
+
+        phonetic = _reduce(rng, phonemic)
+
+        for j, seg in enumerate(phonetic):
+            now += rng.uniform(0.03, 0.15)
+
+            if 'phone_suffix' in quirks and (
+                    (line_quirk == 'phone_suffix' and j == 0) or
+                    rng.random() < 0.01):
+                seg += rng.choice(['+1', ';'])
+
+            if 'missing_label' in quirks and (
+                    (line_quirk == 'missing_label' and j == 0) or
+                    rng.random() < 0.002):
+                phone_lines.append('{:>9.6f}  121'.format(now))
+
+            else:
+                phone_lines.append('{:>9.6f}  121 {}'.format(now, seg))
+
+        time = now
+
+        if line_quirk == 'reversed_time':
+            time -= rng.uniform(0.2, 0.5)
+
+        if line_quirk == 'missing_fields':
+            word_lines.append('{:>9.6f}  121 {}; {}; {}'.format(
+                time, word, ' '.join(phonemic), pos))
+
+        else:
+            word_lines.append('{:>9.6f}  121 {}; {}; {}; {}'.format(
+                time, word, ' '.join(phonemic), ' '.join(phonetic), pos))
+
+        utterance.append(word)
+
+        if line_quirk == 'missing_label':
+            log_lines.append('{:>9.6f}  121'.format(now))
+
+        elif rng.random() < 0.05:
+            log_lines.append('{:>9.6f}  121 {}'.format(
+                now, rng.choice(LOG_ENTRIES)))
+
+    log_lines.append('{:>9.6f}  121 <VOICE=modal>'.format(now))
+
+    if 'blank_lines' in quirks:
+        log_lines.append('')
+
+    if utterance:
+        txt_lines.append(' '.join(utterance))
+
+    return {'.words': '\n'.join(word_lines) + '\n',
+            '.phones': '\n'.join(phone_lines) + '\n',
+            '.log': '\n'.join(log_lines) + '\n',
+            '.txt': '\n'.join(txt_lines) + '\n'}
+
+
+def synthetic_wav(seconds, framerate=16000, seed=0):
+    """Return the contents of a mono 16-bit .wav file of random noise.
+
+    Parameters
+    ----------
+    seconds : float
+        Duration of the sound file.
+
+    framerate : int, optional
+        Sampling rate. Default is 16000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    Returns
+    -------
+    wav : bytes
+
+    """
+
+    rng = random.Random(seed)
+
+    # repeat a block of noise, which is much faster than generating every
+    # sample, but is longer than the 32 kB window of zlib, so that the
+    # .wav file doesn't compress any better than speech does
+    block = 1 << 16
+    noise = struct.pack(str('<{}h').format(block),
+                        *(rng.randint(-1000, 1000) for _ in range(block)))
+
+    frames = int(seconds * framerate)
+    data = noise * (frames // block + 1)
+
+    wav = io.BytesIO()
+    out = wave.open(wav, 'wb')
+    out.setnchannels(1)
+    out.setsampwidth(2)
+    out.setframerate(framerate)
+    out.writeframes(data[:frames * 2])
+    out.close()
+
+    return wav.getvalue()
+
+
+def synthetic_speaker(folder, name='s01', tracks=3, words=10000, seed=0,
+                      wav=False, quirks=()):
+    """Write a synthetic zipped speaker archive, with a nested zipped
+    archive for each track, as in the Buckeye Corpus.
+
+    Parameters
+    ----------
+    folder : str
+        Directory to write the speaker archive to.
+
+    name : str, optional
+        Name of the speaker, which must be in `SPEAKERS`. Default is
+        's01'.
+
+    tracks : int, optional
+        Number of tracks, up to 12 (s0101a, s0101b, s0102a, ...,
+        s0106b). Default is 3.
+
+    words : int, optional
+        Number of entries in each .words file. Default is 10000.
+
+    seed : int, optional
+        Seed for the random number generator. Each track uses a
+        different seed, starting from this one. Default is 0.
+
+    wav : bool, optional
+        If True, each track archive includes a .wav file of noise that
+        lasts as long as the annotations. Default is False.
+
+    quirks : bool or iterable of str, optional
+        Irregular entries to include in each track (see
+        `synthetic_track`). Default is ().
+
+    Returns
+    -------
+    path : str
+        Path to the new speaker archive (e.g., 'folder/s01.zip').
+
+    """
+
+    if name not in SPEAKERS:
+        raise ValueError('unknown speaker: {}'.format(name))
+
+    if tracks > len(TRACK_SUFFIXES):
+        raise ValueError('at most {} tracks per speaker'.format(
+            len(TRACK_SUFFIXES)))
+
+    path = os.path.join(folder, name + '.zip')
+
+    with zipfile.ZipFile(path, 'w') as speaker:
+        for i, suffix in enumerate(TRACK_SUFFIXES[:tracks]):
+            track = name + suffix
+            files = synthetic_track(words, seed + i, quirks, track)
+
+            inner = io.BytesIO()
+
+            with zipfile.ZipFile(inner, 'w', zipfile.ZIP_DEFLATED) as data:
+                for extension in ('.words', '.phones', '.log', '.txt'):
+                    data.writestr(track + extension,
+                                  files[extension].encode('latin-1'))
+
+                if wav:
+                    data.writestr(track + '.wav',
+                                  synthetic_wav(_duration(files) + 1.0,
+                                                seed=seed + i))
+
+            speaker.writestr('{}/{}.zip'.format(name, track),
+                             inner.getvalue())
+
+    return path
+
+
+def synthetic_corpus(folder, speakers=40, tracks=6, words=3000, seed=0,
+                     wav=False, quirks=()):
+    """Write a folder of synthetic zipped speaker archives.
+
+    The corpus can have at most 40 speakers with 12 tracks each, since
+    the archives are named as in the Buckeye Corpus, so use `words` to
+    make larger corpora.
+
+    Parameters
+    ----------
+    folder : str
+        Directory to write the speaker archives to. It is created if it
+        does not exist.
+
+    speakers : int, optional
+        Number of speakers, starting from s01. Default is 40.
+
+    tracks : int, optional
+        Number of tracks for each speaker. Default is 6.
+
+    words : int, optional
+        Number of entries in each .words file. Default is 3000.
+
+    seed : int, optional
+        Seed for the random number generator. Default is 0.
+
+    wav : bool, optional
+        If True, each track includes a .wav file. Default is False.
+
+    quirks : bool or iterable of str, optional
+        Irregular entries to include in each track (see
+        `synthetic_track`). Default is ().
+
+    Returns
+    -------
+    paths : list of str
+        Paths to the new speaker archives.
+
+    """
+
+    names = sorted(SPEAKERS)
+
+    if speakers > len(names):
+        raise ValueError('at most {} speakers'.format(len(names)))
+
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    return [synthetic_speaker(folder, name, tracks, words,
+                              seed + i * len(TRACK_SUFFIXES), wav, quirks)
+            for i, name in enumerate(names[:speakers])]
+
+
+def main(argv=None):
+    """Write a synthetic corpus from the command line."""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('folder', help='directory to write the archives to')
+    parser.add_argument('--speakers', type=int, default=40,
+                        help='number of speakers')
+    parser.add_argument('--tracks', type=int, default=6,
+                        help='number of tracks for each speaker')
+    parser.add_argument('--words', type=int, default=3000,
+                        help='number of .words entries in each track')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed for the random number generator')
+    parser.add_argument('--wav', action='store_true',
+                        help='include .wav files')
+    parser.add_argument('--quirks', action='store_true',
+                        help='include irregular entries')
+
+    args = parser.parse_args(argv)
+
+    paths = synthetic_corpus(args.folder, args.speakers, args.tracks,
+                             args.words, args.seed, args.wav, args.quirks)
+
+    for path in paths:
+        print(path)
+
+
+def _quirks(quirks):
+    """Return a set of quirk names from the `quirks` argument."""
+
+    if quirks is True:
+        return set(QUIRKS)
+
+    if not quirks:
+        return set()
+
+    quirks = set(quirks)
+
+    for quirk in quirks:
+        if quirk not in QUIRKS:
+            raise ValueError('unknown quirk: {}'.format(quirk))
+
+    return quirks
+
+
+def _reduce(rng, phonemic):
+    """Return a phonetic transcription with some segments deleted,
+    reduced to 'ah' or nasalized, as in conversational speech."""
+
+    phonetic = []
+
+    for seg in phonemic:
+        roll = rng.random()
+
+        if roll < 0.08 and len(phonemic) > 1:
+            continue
+
+        if seg in VOWELS and roll < 0.16:
+            seg = 'ah'
+
+        elif seg in VOWELS and roll < 0.2:
+            seg += 'n'
+
+        phonetic.append(seg)
+
+    return phonetic or list(phonemic)
+
+
+def _weighted(rng, choices):
+    """Return a value from a list of (value, weight) pairs."""
+
+    roll = rng.random() * sum(weight for value, weight in choices)
+
+    for value, weight in choices:
+        roll -= weight
+
+        if roll < 0:
+            return value
+
+    return choices[-1][0]
+
+
+def _duration(files):
+    """Return the timestamp of the last entry in a synthetic .words file."""
+    last = [line for line in files['.words'].splitlines() if line][-1]
+    return max(float(last.split()[0]), 0.0)
+
+
+if __name__ == '__main__':
+    main()
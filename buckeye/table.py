@@ -0,0 +1,528 @@
+"""Columnar, array-backed storage for the entries in one track.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import array
+import bisect
+import io
+import os.path
+import zipfile
+
+from . import fastparse
+from .containers import Word, Pause, LogEntry, Phone
+from .utterance import utterance_bounds
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+WORD_COLUMNS = ('word_beg', 'word_end', 'word_label', 'word_pause',
+                'word_phonemic', 'word_phonetic', 'word_pos',
+                'word_phone_beg', 'word_phone_end')
+
+PHONE_COLUMNS = ('phone_beg', 'phone_end', 'phone_seg')
+
+LOG_COLUMNS = ('log_beg', 'log_end', 'log_entry')
+
+TIME_COLUMNS = ('word_beg', 'word_end', 'phone_beg', 'phone_end',
+                'log_beg', 'log_end')
+
+
+class Vocabulary(object):
+    """Two-way mapping between string labels and integer codes.
+
+    The code -1 is reserved for a missing label (None).
+
+    Parameters
+    ----------
+    labels : iterable of str, optional
+        Labels to add to the vocabulary, in order. Default is None.
+
+    """
+
+    def __init__(self, labels=None):
+        self._labels = []
+        self._codes = {}
+
+        if labels is not None:
+            for label in labels:
+                self.code(label)
+
+    def __repr__(self):
+        return 'Vocabulary({})'.format(repr(self._labels))
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __contains__(self, label):
+        return label in self._codes
+
+    def __getitem__(self, code):
+        if code < 0:
+            return None
+
+        return self._labels[code]
+
+    @property
+    def labels(self):
+        """List of labels, where each label is at the index of its code."""
+        return self._labels
+
+    def code(self, label):
+        """Return the code for `label`, adding it to the vocabulary if it
+        is not already present."""
+
+        if label is None:
+            return -1
+
+        try:
+            return self._codes[label]
+
+        except KeyError:
+            code = self._codes[label] = len(self._labels)
+            self._labels.append(label)
+
+            return code
+
+    def find(self, label):
+        """Return the code for `label`, or -2 if it is not in the
+        vocabulary (so that it never matches a stored code)."""
+
+        if label is None:
+            return -1
+
+        return self._codes.get(label, -2)
+
+
+class TrackTable(object):
+    """Column-oriented store of the words, phones and log of one track.
+
+    Timestamps are kept in float64 arrays, and every string field is kept
+    as an integer code into a Vocabulary, which can be shared between
+    tables. Transcriptions are coded as a single string, with segments
+    separated by spaces. Word, Pause, Phone and LogEntry instances are
+    only constructed when the `words`, `phones` or `log` sequences are
+    indexed.
+
+    Use TrackTable.from_track(track) or Track.as_table() to build a table
+    from an existing Track, or TrackTable.from_zip(path) to build one
+    without keeping any container instances in memory.
+
+    Parameters
+    ----------
+    name : str
+        Name of the track file (e.g., 's0101a').
+
+    labels : Vocabulary, optional
+        Vocabulary for the string fields. Default is None, which creates
+        a new one.
+
+    Attributes
+    ----------
+    name : str
+        Name of the track file (e.g., 's0101a').
+
+    labels : Vocabulary
+        Vocabulary for all of the coded columns.
+
+    word_beg, word_end : array of float
+        Timestamps of each entry in the .words file.
+
+    word_label : array of int
+        Code for the orthography of each Word, or the label of each Pause.
+
+    word_pause : array of int
+        1 for each Pause entry, 0 for each Word entry.
+
+    word_phonemic, word_phonetic, word_pos : array of int
+        Codes for the phonemic and phonetic transcriptions and the part
+        of speech of each entry (-1 if missing).
+
+    word_phone_beg, word_phone_end : array of int
+        For each entry, the range of indices of its phones in the phone
+        columns (see `Track._set_phones`).
+
+    phone_beg, phone_end : array of float
+        Timestamps of each entry in the .phones file.
+
+    phone_seg : array of int
+        Code for the label of each phone.
+
+    log_beg, log_end : array of float
+        Timestamps of each entry in the .log file.
+
+    log_entry : array of int
+        Code for the label of each log entry.
+
+    words, phones, log : sequence
+        Read-only sequences that construct Word and Pause, Phone, and
+        LogEntry instances from the columns when indexed.
+
+    """
+
+    def __init__(self, name, labels=None):
+        self.name = name
+        self.labels = Vocabulary() if labels is None else labels
+
+        for column in WORD_COLUMNS + PHONE_COLUMNS + LOG_COLUMNS:
+            typecode = 'd' if column in TIME_COLUMNS else 'i'
+            setattr(self, column, array.array(str(typecode)))
+
+        self.words = _Rows(self._word, self.word_beg)
+        self.phones = _Rows(self._phone, self.phone_beg)
+        self.log = _Rows(self._log_entry, self.log_beg)
+
+    def __repr__(self):
+        return 'TrackTable("{}")'.format(self.name)
+
+    def __str__(self):
+        return '<TrackTable {} ({} words, {} phones)>'.format(
+            self.name, len(self.word_beg), len(self.phone_beg))
+
+    @classmethod
+    def from_entries(cls, name, words, phones, log, labels=None):
+        """Return a TrackTable from iterables of container instances.
+
+        The iterables are consumed one at a time, so they can be
+        generators such as `process_words()`, and no references to the
+        container instances are kept.
+
+        Parameters
+        ----------
+        name : str
+            Name of the track file (e.g., 's0101a').
+
+        words : iterable of Word and Pause
+
+        phones : iterable of Phone
+
+        log : iterable of LogEntry
+
+        labels : Vocabulary, optional
+            Vocabulary for the string fields. Default is None.
+
+        Returns
+        -------
+        TrackTable
+
+        """
+
+        table = cls(name, labels)
+        code = table.labels.code
+
+        for phone in phones:
+            table.phone_beg.append(phone.beg)
+            table.phone_end.append(phone.end)
+            table.phone_seg.append(code(phone.seg))
+
+        for entry in log:
+            table.log_beg.append(entry.beg)
+            table.log_end.append(entry.end)
+            table.log_entry.append(code(entry.entry))
+
+        phone_mids = [beg + 0.5 * (end - beg) for beg, end in
+                      zip(table.phone_beg, table.phone_end)]
+
+        for word in words:
+            table.word_beg.append(word.beg)
+            table.word_end.append(word.end)
+
+            if isinstance(word, Pause):
+                table.word_pause.append(1)
+                table.word_label.append(code(word.entry))
+                table.word_phonemic.append(-1)
+                table.word_phonetic.append(-1)
+                table.word_pos.append(-1)
+
+            else:
+                table.word_pause.append(0)
+                table.word_label.append(code(word.orthography))
+                table.word_phonemic.append(code(_join(word.phonemic)))
+                table.word_phonetic.append(code(_join(word.phonetic)))
+                table.word_pos.append(code(word.pos))
+
+            table.word_phone_beg.append(bisect.bisect_left(phone_mids,
+                                                           word.beg))
+            table.word_phone_end.append(bisect.bisect_left(phone_mids,
+                                                           word.end))
+
+        return table
+
+    @classmethod
+    def from_columns(cls, name, words, phones, log, labels=None):
+        """Return a TrackTable from the columns returned by the parsers
+        in `buckeye.fastparse`, without constructing any container
+        instances.
+
+        Parameters
+        ----------
+        name : str
+            Name of the track file (e.g., 's0101a').
+
+        words : dict
+            Columns from `fastparse.parse_words`.
+
+        phones : dict
+            Columns from `fastparse.parse_phones`.
+
+        log : dict
+            Columns from `fastparse.parse_logs`.
+
+        labels : Vocabulary, optional
+            Vocabulary for the string fields. Default is None.
+
+        Returns
+        -------
+        TrackTable
+
+        """
+
+        table = cls(name, labels)
+        code = table.labels.code
+
+        table.phone_beg.extend(phones['beg'])
+        table.phone_end.extend(phones['end'])
+        table.phone_seg.extend(map(code, phones['seg']))
+
+        table.log_beg.extend(log['beg'])
+        table.log_end.extend(log['end'])
+        table.log_entry.extend(map(code, log['entry']))
+
+        table.word_beg.extend(words['beg'])
+        table.word_end.extend(words['end'])
+        table.word_label.extend(map(code, words['label']))
+        table.word_pause.extend(map(int, words['pause']))
+
+        for column, field in (('word_phonemic', 'phonemic'),
+                              ('word_phonetic', 'phonetic')):
+            getattr(table, column).extend(
+                -1 if pause else code(_join(transcription))
+                for transcription, pause in zip(words[field], words['pause']))
+
+        table.word_pos.extend(-1 if pause else code(pos)
+                              for pos, pause in zip(words['pos'],
+                                                    words['pause']))
+
+        phone_mids = [beg + 0.5 * (end - beg) for beg, end in
+                      zip(table.phone_beg, table.phone_end)]
+
+        table.word_phone_beg.extend(bisect.bisect_left(phone_mids, beg)
+                                    for beg in table.word_beg)
+        table.word_phone_end.extend(bisect.bisect_left(phone_mids, end)
+                                    for end in table.word_end)
+
+        return table
+
+    @classmethod
+    def from_track(cls, track, labels=None):
+        """Return a TrackTable with the entries in a Track instance.
+
+        Parameters
+        ----------
+        track : Track
+
+        labels : Vocabulary, optional
+            Vocabulary for the string fields. Default is None.
+
+        Returns
+        -------
+        TrackTable
+
+        """
+
+        return cls.from_entries(track.name, track.words, track.phones,
+                                track.log, labels)
+
+    @classmethod
+    def from_zip(cls, path, data=None, labels=None, parser='default'):
+        """Return a TrackTable from a zipped track archive.
+
+        Parameters
+        ----------
+        path : str
+            Path to a zipped track archive (e.g., 's01/s0101a.zip').
+
+        data : zipfile.ZipFile, optional
+            ZipFile instance containing track data, as in
+            `Track.from_zip`. Default is None.
+
+        labels : Vocabulary, optional
+            Vocabulary for the string fields. Default is None.
+
+        parser : str, optional
+            If 'fast', the files are parsed into columns with
+            `buckeye.fastparse`, and no container instances are
+            constructed (see `from_columns`). Default is 'default'.
+
+        Returns
+        -------
+        TrackTable
+
+        """
+
+        # imported here to avoid a circular import
+        from .buckeye import process_words, process_phones, process_logs
+
+        if data is None:
+            data = zipfile.ZipFile(path)
+
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        if parser == 'fast':
+            def text(extension):
+                return data.read(name + extension).decode('latin-1')
+
+            return cls.from_columns(name,
+                                    fastparse.parse_words(text('.words')),
+                                    fastparse.parse_phones(text('.phones')),
+                                    fastparse.parse_logs(text('.log')), labels)
+
+        if parser != 'default':
+            raise ValueError('unknown parser: {}'.format(parser))
+
+        def read(extension):
+            return io.StringIO(data.read(name + extension).decode('latin-1'))
+
+        return cls.from_entries(name, process_words(read('.words')),
+                                process_phones(read('.phones')),
+                                process_logs(read('.log')), labels)
+
+    def arrays(self):
+        """Return a dict of NumPy arrays that share memory with each column.
+
+        Requires NumPy.
+
+        Returns
+        -------
+        arrays : dict
+            Mapping from each column name (e.g., 'word_beg') to a
+            float64 or int32 array.
+
+        """
+
+        if numpy is None:
+            raise ImportError('TrackTable.arrays() requires NumPy')
+
+        arrays = {}
+
+        for column in WORD_COLUMNS + PHONE_COLUMNS + LOG_COLUMNS:
+            values = getattr(self, column)
+            dtype = numpy.float64 if values.typecode == 'd' else numpy.intc
+
+            if len(values):
+                arrays[column] = numpy.frombuffer(values, dtype=dtype)
+
+            else:
+                arrays[column] = numpy.zeros(0, dtype=dtype)
+
+        return arrays
+
+    def utterance_bounds(self, sep=0.5, strip_pauses=True):
+        """Return the index ranges of the utterances in this track.
+
+        See `buckeye.utterance.utterance_bounds`. Requires NumPy.
+
+        Parameters
+        ----------
+        sep : float or sequence of float, optional
+            If more than `sep` seconds of Pause entries occur
+            consecutively, end the current utterance. Default is 0.5.
+
+        strip_pauses : bool, optional
+            If True, then Pause entries are removed from the beginning and
+            end of each utterance. Default is True.
+
+        Returns
+        -------
+        bounds : numpy.ndarray or list of numpy.ndarray
+            Array with one `(start, stop)` row of indices into the word
+            columns for each utterance, or a list of arrays if `sep` is a
+            sequence.
+
+        """
+
+        arrays = self.arrays()
+
+        return utterance_bounds(arrays['word_beg'], arrays['word_end'],
+                                arrays['word_pause'].astype(bool), sep,
+                                strip_pauses)
+
+    def _word(self, i):
+        """Return a Word or Pause instance for row `i`."""
+        labels = self.labels
+
+        if self.word_pause[i]:
+            word = Pause._new(labels[self.word_label[i]],
+                              self.word_beg[i], self.word_end[i])
+
+        else:
+            word = Word._new(labels[self.word_label[i]],
+                             self.word_beg[i], self.word_end[i],
+                             _split(labels[self.word_phonemic[i]]),
+                             _split(labels[self.word_phonetic[i]]),
+                             labels[self.word_pos[i]])
+
+        word._phones = [self._phone(j) for j in
+                        range(self.word_phone_beg[i], self.word_phone_end[i])]
+
+        return word
+
+    def _phone(self, i):
+        """Return a Phone instance for row `i`."""
+        return Phone._new(self.labels[self.phone_seg[i]],
+                          self.phone_beg[i], self.phone_end[i])
+
+    def _log_entry(self, i):
+        """Return a LogEntry instance for row `i`."""
+        return LogEntry._new(self.labels[self.log_entry[i]],
+                             self.log_beg[i], self.log_end[i])
+
+
+class _Rows(object):
+    """Read-only sequence that builds one object per row on access."""
+
+    def __init__(self, build, column):
+        self._build = build
+        self._column = column
+
+    def __len__(self):
+        return len(self._column)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._build(j) for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+
+        if not 0 <= i < len(self):
+            raise IndexError('row index out of range')
+
+        return self._build(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._build(i)
+
+
+def _join(transcription):
+    """Return a list of segments as one string, or None."""
+    if transcription is None:
+        return None
+
+    return ' '.join(transcription)
+
+
+def _split(transcription):
+    """Return a string from `_join` as a list of segments, or None."""
+    if transcription is None:
+        return None
+
+    return transcription.split()
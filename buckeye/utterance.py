@@ -9,6 +9,11 @@ from __future__ import unicode_literals
 
 from .containers import Pause
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Utterance(object):
     """Iterable of Word and Pause instances comprising one chunk of speech.
@@ -98,6 +103,10 @@ class Utterance(object):
     def append(self, item):
         """Append an instance to this utterance.
 
+        Items that begin at or after the beginning of the last item in the
+        utterance are appended in constant time. Other items are inserted
+        in chronological order, which requires scanning the utterance.
+
         Parameters
         ----------
         word : Word or Pause instance
@@ -117,6 +126,12 @@ class Utterance(object):
             raise ValueError('Item beg timestamp: {0} is after item end '
                              'timestamp: {1}'.format(str(item.beg), str(item.end)))
 
+        # no existing item can begin inside this one, and it already
+        # belongs at the end
+        if not self._words or beg >= float(self._words[-1].beg):
+            self._words.append(item)
+            return
+
         for word in self._words:
             if float(word.beg) > beg and float(word.beg) <= end:
                 raise ValueError('Item overlaps with existing items in utterance')
@@ -124,6 +139,27 @@ class Utterance(object):
         self._words.append(item)
         self._words = sorted(self._words, key=lambda word: float(word.beg))
 
+    def extend(self, items):
+        """Append each instance in an iterable to this utterance.
+
+        This takes linear time if the items are in chronological order and
+        begin after the last item already in the utterance.
+
+        Parameters
+        ----------
+        items : iterable of Word and Pause instances
+            Instances with `beg` and `end` attributes to be appended to
+            this utterance.
+
+        Returns
+        -------
+        None
+
+        """
+
+        for item in items:
+            self.append(item)
+
     def __iter__(self):
         return iter(self._words)
 
@@ -133,6 +169,26 @@ class Utterance(object):
     def __len__(self):
         return len(self._words)
 
+    def samples(self, track, dtype=None):
+        """Return the samples for this utterance from the track .wav file.
+
+        Parameters
+        ----------
+        track : Track
+            The track that this utterance belongs to. It must have been
+            loaded with its .wav file.
+
+        dtype : numpy.dtype or str, optional
+            Type of the samples (see `Track.samples`). Default is None.
+
+        Returns
+        -------
+        samples : numpy.ndarray
+
+        """
+
+        return track.samples(self.beg, self.end, dtype)
+
     def speech_rate(self, use_phonetic=True, ignore_missing_syllables=False):
         """Return the number of syllables per second in this utterance.
 
@@ -207,16 +263,70 @@ def words_to_utterances(words, sep=0.5, strip_pauses=True):
 
     """
 
-    utt = Utterance()
+    # the words that have been read but not packed into an utterance yet,
+    # starting from index `offset`
+    pending = []
+    offset = 0
+
+    def read():
+        for word in words:
+            pending.append(word)
+            yield word
+
+    for start, stop in _utterance_ranges(read(), sep, strip_pauses):
+        utt = Utterance()
+
+        for word in pending[start - offset:stop - offset]:
+            utt.append(word)
+
+        del pending[:stop - offset]
+        offset = stop
+
+        yield utt
+
+
+def _utterance_ranges(words, sep=0.5, strip_pauses=True):
+    """Yield the index ranges of the utterances in an iterable of Word and
+    Pause instances.
+
+    This is the segmentation that `words_to_utterances` uses, without
+    building Utterance instances. Unlike `words_to_utterances`, it does
+    not check for misaligned entries. See `utterance_bounds` for a
+    vectorized version.
+
+    Parameters
+    ----------
+    words : iterable object of Word and Pause instances
+
+    sep : float, optional
+        If more than `sep` seconds of Pause instances occur consecutively,
+        end the current utterance. Default is 0.5.
+
+    strip_pauses : bool, optional
+        If True, then Pause instances are removed from the beginning and
+        end of each utterance. Default is True.
+
+    Yields
+    ------
+    start, stop : int
+        Index of the first item in each utterance, and one past the index
+        of the last item.
+
+    """
+
+    start = None
+    stop = 0
     pause_duration = 0.0
     pause_count = 0
 
-    for word in words:
+    for i, word in enumerate(words):
+        stop = i + 1
+
         # if this item is a pause token...
         if isinstance(word, Pause):
 
             # optionally skip it if there are no words in the utterance yet
-            if strip_pauses and len(utt) == 0:
+            if strip_pauses and start is None:
                 continue
 
             # if this item doesn't follow another pause, restart the
@@ -233,27 +343,179 @@ def words_to_utterances(words, sep=0.5, strip_pauses=True):
         else:
             pause_count = 0
 
-        utt.append(word)
+        if start is None:
+            start = i
 
-        # if the total pause duration has reached `sep` seconds, return this
+        # if the total pause duration has reached `sep` seconds, end this
         # utterance and start a new one
         if pause_duration >= sep:
 
             # optionally remove any pauses at the end
-            if strip_pauses and pause_count:
-                utt._words = utt._words[:-pause_count]
-
-            if len(utt) > 0:
-                yield utt
+            if strip_pauses:
+                stop -= pause_count
 
-                utt = Utterance()
+            if stop > start:
+                yield start, stop
 
+            start = None
             pause_duration = 0.0
             pause_count = 0
 
-    # return the last utterance if there is one
-    if strip_pauses and pause_count:
-        utt._words = utt._words[:-pause_count]
+    # end the last utterance if there is one
+    if strip_pauses:
+        stop -= pause_count
 
-    if len(utt) > 0:
-        yield utt
+    if start is not None and stop > start:
+        yield start, stop
+
+
+def utterance_bounds(begs, ends, pauses, sep=0.5, strip_pauses=True):
+    """Return the index ranges of the utterances in arrays of timestamps.
+
+    This is a vectorized equivalent of `words_to_utterances`, for
+    entries that are stored in arrays (see `TrackTable`). It returns the
+    same utterances as `words_to_utterances`, as `[start, stop)` ranges
+    of indices into the arrays, and it can segment the entries for
+    several values of `sep` at once. Unlike `words_to_utterances`, it
+    does not check for entries with negative durations. Requires NumPy.
+
+    Parameters
+    ----------
+    begs : array-like of float
+        Timestamp where each Word or Pause entry begins.
+
+    ends : array-like of float
+        Timestamp where each Word or Pause entry ends.
+
+    pauses : array-like of bool
+        True for each Pause entry, and False for each Word entry.
+
+    sep : float or sequence of float, optional
+        If more than `sep` seconds of Pause entries occur consecutively,
+        end the current utterance. Must be greater than zero. Default is
+        0.5.
+
+    strip_pauses : bool, optional
+        If True, then Pause entries are removed from the beginning and
+        end of each utterance. Default is True.
+
+    Returns
+    -------
+    bounds : numpy.ndarray or list of numpy.ndarray
+        Array with one `(start, stop)` row for each utterance. If `sep`
+        is a sequence, a list with one array for each value of `sep`.
+
+    """
+
+    if numpy is None:
+        raise ImportError('utterance_bounds() requires NumPy')
+
+    begs = numpy.asarray(begs, dtype=numpy.float64)
+    ends = numpy.asarray(ends, dtype=numpy.float64)
+    pauses = numpy.asarray(pauses, dtype=bool)
+
+    seps = numpy.atleast_1d(numpy.asarray(sep, dtype=numpy.float64))
+
+    if numpy.any(seps <= 0):
+        raise ValueError('sep must be greater than zero')
+
+    durs = ends - begs
+
+    # find each run of consecutive pauses
+    edges = numpy.diff(numpy.concatenate(([0], pauses.view(numpy.int8), [0])))
+    run_begs = numpy.flatnonzero(edges == 1)
+    run_lens = numpy.flatnonzero(edges == -1) - run_begs
+
+    if strip_pauses:
+        # the rest of a run is skipped after a split, so a run splits the
+        # utterance if any running total of its durations reaches `sep`
+        run_max = _run_totals(durs, run_begs, run_lens)
+        words = numpy.flatnonzero(~pauses)
+
+        bounds = [_stripped_bounds(words, run_begs[run_max >= value])
+                  for value in seps]
+
+    else:
+        bounds = [_unstripped_bounds(len(durs), durs, run_begs, run_lens,
+                                     value)
+                  for value in seps]
+
+    if numpy.ndim(sep) == 0:
+        return bounds[0]
+
+    return bounds
+
+
+def _run_totals(durs, run_begs, run_lens):
+    """Return the maximum running total of the durations in each run.
+
+    The totals are added up in the same order as `words_to_utterances`,
+    so that they are identical to the last bit.
+
+    """
+
+    totals = numpy.zeros(len(run_begs))
+    maxima = numpy.full(len(run_begs), -numpy.inf)
+
+    for depth in range(int(run_lens.max()) if len(run_lens) else 0):
+        active = run_lens > depth
+
+        if depth == 0:
+            totals[active] = durs[run_begs[active]]
+
+        else:
+            totals[active] += durs[run_begs[active] + depth]
+
+        maxima[active] = numpy.maximum(maxima[active], totals[active])
+
+    return maxima
+
+
+def _stripped_bounds(words, split_begs):
+    """Return utterance bounds from the indices of the Word entries and of
+    the pause runs that separate utterances."""
+
+    if not len(words):
+        return numpy.zeros((0, 2), dtype=numpy.intp)
+
+    groups = numpy.searchsorted(split_begs, words)
+    changes = groups[1:] != groups[:-1]
+
+    starts = words[numpy.concatenate(([True], changes))]
+    stops = words[numpy.concatenate((changes, [True]))] + 1
+
+    return numpy.column_stack((starts, stops))
+
+
+def _unstripped_bounds(count, durs, run_begs, run_lens, sep):
+    """Return utterance bounds when pauses are kept, where the running
+    total of a pause run restarts after each split."""
+
+    totals = numpy.zeros(len(run_begs))
+    restart = numpy.ones(len(run_begs), dtype=bool)
+    splits = []
+
+    for depth in range(int(run_lens.max()) if len(run_lens) else 0):
+        active = run_lens > depth
+        positions = run_begs[active] + depth
+
+        totals[active] = numpy.where(restart[active], durs[positions],
+                                     totals[active] + durs[positions])
+
+        hit = totals[active] >= sep
+        splits.append(positions[hit])
+
+        restart[active] = hit
+
+    if splits:
+        splits = numpy.sort(numpy.concatenate(splits))
+
+    else:
+        splits = numpy.zeros(0, dtype=numpy.intp)
+
+    starts = numpy.concatenate(([0], splits + 1))
+    stops = numpy.concatenate((splits + 1, [count]))
+
+    keep = stops > starts
+
+    return numpy.column_stack((starts[keep], stops[keep]))
@@ -29,6 +29,8 @@ setup(name='buckeye',
       keywords='speech linguistics language conversation corpus',
       packages=['buckeye'],
       include_package_data=True,
+      install_requires=['futures; python_version < "3"'],
+      extras_require={'numpy': ['numpy']},
       test_suite='nose.collector',
       tests_require=['nose', 'mock']
      )
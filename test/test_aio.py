@@ -0,0 +1,163 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from nose.tools import *
+from nose import SkipTest
+
+try:
+    import asyncio
+    from buckeye import aio
+except (ImportError, SyntaxError):
+    aio = None
+
+import os
+import shutil
+import tempfile
+import threading
+
+from concurrent import futures
+
+from buckeye import Track
+
+from test_buckeye import make_speaker_zip
+
+
+def run(coroutine):
+    """Run a coroutine in a new event loop and return its result."""
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+
+    finally:
+        loop.close()
+
+
+def collect(iterator, count=None):
+    """Run an asynchronous iterator in a new event loop and return a list
+    of the first `count` items."""
+    loop = asyncio.new_event_loop()
+    items = []
+
+    try:
+        while count is None or len(items) < count:
+            try:
+                items.append(loop.run_until_complete(iterator.__anext__()))
+
+            except StopAsyncIteration:
+                break
+
+        loop.run_until_complete(iterator.aclose())
+
+    finally:
+        loop.close()
+
+    return items
+
+
+class TestAsyncLoader(object):
+
+    @classmethod
+    def setup_class(cls):
+        if aio is None:
+            raise SkipTest('buckeye.aio requires Python 3.6 or later')
+
+        cls.folder = tempfile.mkdtemp()
+        cls.path = make_speaker_zip(cls.folder, 's02', ('01a', '01b', '02a'))
+        make_speaker_zip(cls.folder, 's01', ('01a',))
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_track_from_zip(self):
+        path = os.path.join('test', 'files', 'test.zip')
+        track = run(aio.track_from_zip(path, parser='fast'))
+
+        assert_equal(track.name, 'test')
+        assert_equal([repr(w) for w in track.words],
+                     [repr(w) for w in Track.from_zip(path).words])
+
+    def test_speaker_from_zip(self):
+        speaker = run(aio.speaker_from_zip(self.path, limit=2))
+
+        assert_equal(speaker.name, 's02')
+        assert_equal([track.name for track in speaker],
+                     ['s0201a', 's0201b', 's0202a'])
+        assert_equal(len(speaker[2].words), 6)
+
+    def test_tracks(self):
+        loader = aio.AsyncLoader(limit=2)
+        tracks = collect(loader.tracks(self.path, stream=True))
+
+        assert_equal([track.name for track in tracks],
+                     ['s0201a', 's0201b', 's0202a'])
+
+        tracks = collect(loader.tracks(self.path), count=1)
+        assert_equal([track.name for track in tracks], ['s0201a'])
+
+    def test_corpus(self):
+        speakers = collect(aio.corpus(self.folder))
+
+        assert_equal([speaker.name for speaker in speakers], ['s01', 's02'])
+        assert_equal(len(speakers[1].tracks), 3)
+
+    def test_cache(self):
+        cache_dir = tempfile.mkdtemp(dir=self.folder)
+        loader = aio.AsyncLoader()
+
+        first = run(loader.speaker_from_zip(self.path, cache_dir=cache_dir))
+        assert_true(os.listdir(cache_dir))
+
+        second = run(loader.speaker_from_zip(self.path, cache_dir=cache_dir))
+        assert_equal([repr(w) for w in second[1].words],
+                     [repr(w) for w in first[1].words])
+
+    def test_limit(self):
+        lock = threading.Lock()
+        counts = {'active': 0, 'peak': 0}
+        open_track = aio._open_track
+
+        def counting(*args):
+            with lock:
+                counts['active'] += 1
+                counts['peak'] = max(counts['peak'], counts['active'])
+
+            try:
+                return open_track(*args)
+
+            finally:
+                with lock:
+                    counts['active'] -= 1
+
+        with futures.ThreadPoolExecutor(4) as executor:
+            loader = aio.AsyncLoader(executor, limit=1)
+
+            with mock.patch('buckeye.aio._open_track', counting):
+                speaker = run(loader.speaker_from_zip(self.path))
+
+        assert_equal(len(speaker.tracks), 3)
+        assert_equal(counts['peak'], 1)
+
+    def test_running_loop(self):
+        if not hasattr(asyncio, 'get_running_loop'):
+            raise SkipTest('asyncio.get_running_loop requires Python 3.7')
+
+        path = os.path.join('test', 'files', 'test.zip')
+
+        with mock.patch('asyncio.get_event_loop') as get_event_loop:
+            track = run(aio.track_from_zip(path))
+
+        assert_false(get_event_loop.called)
+        assert_equal(track.name, 'test')
+
+    @raises(ValueError)
+    def test_bad_limit(self):
+        aio.AsyncLoader(limit=0)
@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from nose.tools import *
+
+import io
+import json
+
+from buckeye import benchmark
+
+
+class TestBenchmark(object):
+
+    def test_bench_parse(self):
+        results = benchmark.bench_parse(100)
+
+        assert_equal(results['stage'], 'parse')
+        assert_true(results['entries'] >= 200)
+
+    def test_bench_track(self):
+        results = benchmark.bench_track(100)
+
+        assert_equal(results['stage'], 'track')
+        assert_true(results['entries'] >= 200)
+        assert_true(results['seconds'] > 0)
+
+    def test_bench_utterances(self):
+        results = benchmark.bench_utterances(100)
+
+        assert_equal(results['stage'], 'utterances')
+        assert_equal(results['entries'], 100)
+        assert_equal(results['utterances'], 1)
+
+        results = benchmark.bench_utterances(100, sep=0.5)
+        assert_true(results['utterances'] > 1)
+
+        baseline = benchmark.bench_utterances(100, sep=0.5, baseline=True)
+        assert_equal(baseline['stage'], 'utterances_baseline')
+        assert_equal(baseline['utterances'], results['utterances'])
+
+    def test_bench_entries(self):
+        results = benchmark.bench_entries(100)
+
+        assert_equal(results['stage'], 'entries')
+        assert_true(results['entries'] >= 200)
+
+        baseline = benchmark.bench_entries(100, baseline=True)
+        assert_equal(baseline['stage'], 'entries_baseline')
+        assert_equal(baseline['entries'], results['entries'])
+
+        if 'bytes_per_entry' in results:
+            assert_true(baseline['bytes_per_entry'] >
+                        results['bytes_per_entry'])
+
+    def test_bench_align(self):
+        results = benchmark.bench_align(100)
+
+        assert_equal(results['stage'], 'align')
+        assert_true(results['entries_per_second'] > 0)
+
+    def test_bench_clips(self):
+        results = benchmark.bench_clips(50)
+
+        assert_equal(results['stage'], 'clips')
+        assert_equal(results['clips'], 50)
+
+        results = benchmark.bench_clips(50, batch=True)
+        assert_equal(results['stage'], 'clips_batch')
+
+    def test_bench_speaker(self):
+        results = benchmark.bench_speaker(50, tracks=2, stream=True)
+
+        assert_equal(results['stage'], 'speaker_stream')
+        assert_equal(results['tracks'], 2)
+        assert_true(results['tracks_per_second'] > 0)
+
+    def test_bench_cache(self):
+        results = benchmark.bench_cache(50, speakers=2, tracks=2)
+
+        assert_equal(results['stage'], 'cache')
+        assert_equal(results['tracks'], 4)
+        assert_true(results['entries'] >= 4 * 100)
+
+    def test_main_json(self):
+        # sys.stdout takes native strings, which are bytes on Python 2
+        output = io.BytesIO() if str is bytes else io.StringIO()
+
+        with mock.patch('buckeye.benchmark.sys.stdout', output):
+            benchmark.main(['--words', '50', '--clip-words', '20',
+                            '--speaker-words', '20', '--baseline-words', '20',
+                            '--json'])
+
+        report = json.loads(output.getvalue())
+
+        assert_equal(report['options']['words'], 50)
+        assert_equal([r['stage'] for r in report['results']],
+                     ['parse', 'track', 'entries', 'entries_baseline',
+                      'align', 'utterances', 'utterances_baseline', 'clips',
+                      'clips_batch', 'speaker', 'speaker_stream', 'cache'])
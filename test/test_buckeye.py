@@ -10,15 +10,25 @@ except ImportError:
 
 from nose.tools import *
 
+import bisect
+import errno
 import io
 import os
+import pickle
+import random
+import shutil
 import struct
+import tempfile
 import zipfile
 
-from buckeye import corpus, process_logs, process_phones, process_words
+from buckeye import corpus, corpus_parallel
+from buckeye import align_words, process_logs, process_phones, process_words
 
-from buckeye import Speaker, Track
+from buckeye import Speaker, Track, TrackCache, Utterance
 
+from buckeye.synth import synthetic_track
+from buckeye.buckeye import _merge_offsets, _pack_track, _unpack_track
+from buckeye.buckeye import buffer_type, track_size
 from buckeye.containers import Pause, Word
 
 LOG = """header
@@ -65,6 +75,27 @@ with io.open(os.path.join('test', 'files', 'noise.wav'), 'rb') as wav:
     WAV = wav.read()
 
 
+def make_speaker_zip(folder, name, tracks=('01a', '01b', '02a')):
+    """Write a zipped speaker archive with nested track archives."""
+    path = os.path.join(folder, name + '.zip')
+
+    with zipfile.ZipFile(path, 'w') as speaker:
+        for suffix in tracks:
+            track = name + suffix
+
+            inner = io.BytesIO()
+            with zipfile.ZipFile(inner, 'w', zipfile.ZIP_DEFLATED) as data:
+                data.writestr(track + '.words', WORDS.encode('latin-1'))
+                data.writestr(track + '.phones', PHONES.encode('latin-1'))
+                data.writestr(track + '.log', LOG.encode('latin-1'))
+                data.writestr(track + '.txt', TXT.encode('latin-1'))
+                data.writestr(track + '.wav', WAV)
+
+            speaker.writestr('{}/{}.zip'.format(name, track), inner.getvalue())
+
+    return path
+
+
 class TestSpeaker(object):
 
     @classmethod
@@ -123,6 +154,238 @@ class TestSpeaker(object):
         assert_equal(str(self.speaker), '<Speaker s02 (f, o)>')
 
 
+class TestSpeakerWorkers(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.path = make_speaker_zip(cls.folder, 's01')
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_workers(self):
+        serial = Speaker.from_zip(self.path)
+        parallel = Speaker.from_zip(self.path, workers=2)
+
+        assert_equal([t.name for t in parallel],
+                     ['s0101a', 's0101b', 's0102a'])
+
+        for left, right in zip(serial, parallel):
+            assert_equal([repr(w) for w in left.words],
+                         [repr(w) for w in right.words])
+            assert_equal([repr(p) for p in left.phones],
+                         [repr(p) for p in right.phones])
+            assert_equal(right.words[1].phones[0].seg, 'k')
+
+    def test_workers_wavs(self):
+        speaker = Speaker.from_zip(self.path, load_wavs=True, workers=2)
+
+        for track in speaker:
+            assert_equal(track.wav.getnframes(), 9520)
+
+    def test_workers_mapped_wavs(self):
+        folder = os.path.join(self.folder, 'wavs')
+        speaker = Speaker.from_zip(self.path, load_wavs=folder, workers=2)
+
+        assert_equal(sorted(os.listdir(folder)),
+                     ['s0101a.wav', 's0101b.wav', 's0102a.wav'])
+
+        for track in speaker:
+            assert_equal(len(track.frames(0, 0.01)), 2 * 80)
+            track.close()
+
+    def test_threads(self):
+        serial = Speaker.from_zip(self.path)
+        threaded = Speaker.from_zip(self.path, load_wavs=True, threads=2)
+
+        assert_equal([t.name for t in threaded],
+                     ['s0101a', 's0101b', 's0102a'])
+
+        for left, right in zip(serial, threaded):
+            assert_equal([repr(w) for w in left.words],
+                         [repr(w) for w in right.words])
+            assert_equal(right.wav.getnframes(), 9520)
+
+    def test_threads_cache(self):
+        cache_dir = os.path.join(self.folder, 'cache')
+
+        Speaker.from_zip(self.path, cache_dir=cache_dir, threads=2)
+        speaker = Speaker.from_zip(self.path, cache_dir=cache_dir, threads=2)
+
+        assert_equal(len(speaker[2].words), 6)
+        assert_equal(len(os.listdir(cache_dir)), 3)
+
+    def test_stream(self):
+        serial = Speaker.from_zip(self.path)
+        streamed = Speaker.from_zip(self.path, load_wavs=True, stream=True)
+
+        for left, right in zip(serial, streamed):
+            assert_equal([repr(w) for w in left.words],
+                         [repr(w) for w in right.words])
+            assert_equal([repr(p) for p in left.phones],
+                         [repr(p) for p in right.phones])
+            assert_equal(left.txt, right.txt)
+            assert_equal(right.wav.getnframes(), 9520)
+
+    def test_stream_threads(self):
+        speaker = Speaker.from_zip(self.path, threads=2, stream=True)
+
+        assert_equal([len(t.words) for t in speaker], [6, 6, 6])
+
+
+class TestLazySpeaker(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.path = make_speaker_zip(cls.folder, 's01')
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_lazy(self):
+        with mock.patch('buckeye.buckeye.Track.from_zip') as from_zip:
+            speaker = Speaker.from_zip(self.path, lazy=True)
+            assert_false(from_zip.called)
+
+        assert_equal(speaker.name, 's01')
+        assert_equal(len(speaker.tracks), 3)
+        assert_equal(speaker.tracks.names, ['s0101a', 's0101b', 's0102a'])
+
+    def test_getitem(self):
+        speaker = Speaker.from_zip(self.path, lazy=True)
+
+        track = speaker[1]
+
+        assert_equal(track.name, 's0101b')
+        assert_equal(len(track.words), 6)
+        assert_equal(track.words[1].phones[0].seg, 'k')
+        assert_is(speaker[1], track)
+        assert_equal([t.name for t in speaker[:2]], ['s0101a', 's0101b'])
+
+    def test_iter(self):
+        speaker = Speaker.from_zip(self.path, True, lazy=True)
+        tracks = list(speaker)
+
+        assert_equal([t.name for t in tracks], ['s0101a', 's0101b', 's0102a'])
+        assert_equal(tracks[2].wav.getnframes(), 9520)
+
+    def test_max_tracks(self):
+        speaker = Speaker.from_zip(self.path, lazy=True, max_tracks=2)
+
+        first = speaker[0]
+        speaker[1]
+        assert_is(speaker[0], first)
+
+        speaker[2]
+        assert_equal(list(speaker.tracks._loaded),
+                     ['s01/s0101a.zip', 's01/s0102a.zip'])
+
+        speaker[1]
+        assert_equal(len(speaker.tracks._loaded), 2)
+        assert_not_in('s01/s0101a.zip', speaker.tracks._loaded)
+
+    def test_max_tracks_closes_wav(self):
+        speaker = Speaker.from_zip(self.path, True, lazy=True, max_tracks=1)
+
+        first = speaker[0]
+
+        with mock.patch.object(first, 'close') as close:
+            speaker[1]
+            assert_true(close.called)
+
+    def test_stream(self):
+        speaker = Speaker.from_zip(self.path, lazy=True, stream=True)
+
+        assert_equal(speaker[0].words[1].phones[0].seg, 'k')
+
+
+class TestTrackCache(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        make_speaker_zip(cls.folder, 's01')
+        make_speaker_zip(cls.folder, 's02', ('01a',))
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_get(self):
+        cache = TrackCache(self.folder)
+
+        track = cache.get('s0101b')
+
+        assert_equal(track.name, 's0101b')
+        assert_equal(len(track.words), 6)
+        assert_is(cache.get('s0101b'), track)
+        assert_equal((cache.hits, cache.misses), (1, 1))
+        assert_in('s0101b', cache)
+        assert_equal(cache.size, track_size(track))
+
+    def test_max_tracks(self):
+        cache = TrackCache(self.folder, max_tracks=2)
+
+        cache.get('s0101a')
+        cache.get('s0101b')
+        cache.get('s0101a')
+        cache.get('s0201a')
+
+        assert_equal(len(cache), 2)
+        assert_equal(cache.evictions, 1)
+        assert_not_in('s0101b', cache)
+        assert_in('s0101a', cache)
+
+    def test_max_bytes(self):
+        size = track_size(TrackCache(self.folder).get('s0101a'))
+        cache = TrackCache(self.folder, max_bytes=int(size * 1.5))
+
+        cache.get('s0101a')
+        cache.get('s0101b')
+
+        assert_equal(len(cache), 1)
+        assert_equal(cache.size, size)
+
+        # the newest track is kept even if it is over the limit
+        cache = TrackCache(self.folder, max_bytes=1)
+        cache.get('s0101a')
+
+        assert_equal(len(cache), 1)
+
+    def test_eviction_closes_wav(self):
+        cache = TrackCache(self.folder, load_wavs=True, max_tracks=1)
+
+        track = cache.get('s0101a')
+        without_wav = TrackCache(self.folder).get('s0101a')
+
+        # the .wav file in memory is counted
+        assert_true(track_size(track) > track_size(without_wav))
+
+        with mock.patch.object(track, 'close') as close:
+            cache.get('s0101b')
+            assert_true(close.called)
+
+    def test_clear(self):
+        with TrackCache(self.folder) as cache:
+            cache.get('s0101a')
+            cache.get('s0102a')
+
+        assert_equal(len(cache), 0)
+        assert_equal(cache.size, 0)
+
+    @raises(ValueError)
+    def test_bad_name(self):
+        TrackCache(self.folder).get('s01.zip')
+
+    @raises(KeyError)
+    def test_missing_track(self):
+        TrackCache(self.folder).get('s0106b')
+
+
 class TestTrack(object):
 
     @classmethod
@@ -193,6 +456,80 @@ class TestTrack(object):
         assert_equal(track.txt, [TXT.strip()])
         assert_equal(track.wav.getnframes(), 9520)
 
+    def test_toplevel_zip_stream(self):
+        zip = os.path.join('test', 'files', 'test.zip')
+
+        track = Track.from_zip(zip, stream=True)
+        expected = Track.from_zip(zip)
+
+        assert_equal([repr(w) for w in track.words],
+                     [repr(w) for w in expected.words])
+        assert_equal([repr(l) for l in track.log],
+                     [repr(l) for l in expected.log])
+        assert_equal(track.txt, [TXT.strip()])
+
+    def test_align_phones_deferred(self):
+        zip = os.path.join('test', 'files', 'test.zip')
+
+        track = Track.from_zip(zip, align_phones=False)
+        assert_is_none(track.words[1].phones)
+
+        track.align_phones()
+        assert_equal([p.seg for p in track.words[1].phones], ['k', 'ae', 't'])
+        assert_is(track.words[1].phones[0], track.phones[2])
+
+    def test_merge_offsets(self):
+        rng = random.Random(0)
+        values = sorted(rng.uniform(0, 10) for _ in range(100))
+
+        for keys in (sorted(rng.uniform(-1, 11) for _ in range(50)),
+                     [rng.uniform(-1, 11) for _ in range(50)],
+                     values[::3]):
+            assert_equal(_merge_offsets(values, keys),
+                         [bisect.bisect_left(values, key) for key in keys])
+
+    def test_word_flags(self):
+        files = synthetic_track(500, seed=1)
+        track = Track('synthetic', *(io.StringIO(files[extension]) for
+                                     extension in ('.words', '.phones', '.log',
+                                                   '.txt')))
+
+        expected = [(w.misaligned, w.syllables(), w.syllables(True))
+                    if isinstance(w, Word) else (w.misaligned, -1, -1)
+                    for w in track.words]
+
+        flags = track.word_flags()
+
+        assert_is(track.word_flags(), flags)
+        assert_equal(list(zip(flags['misaligned'], flags['syllables'],
+                              flags['phonetic_syllables'])), expected)
+        assert_equal([(w.misaligned, w.syllables(), w.syllables(True))
+                      if isinstance(w, Word) else (w.misaligned, -1, -1)
+                      for w in track.words], expected)
+
+    def test_word_flags_cleared(self):
+        zip = os.path.join('test', 'files', 'test.zip')
+        track = Track.from_zip(zip)
+
+        assert_equal(list(track.word_flags()['misaligned']), [0] * 6)
+
+        track.phones[2]._beg = 0.01
+        track.align_phones()
+
+        assert_true(track.words[1].misaligned)
+        assert_equal(track.words[0].syllables(phonetic=True), 1)
+        assert_equal(list(track.word_flags()['misaligned']), [1, 1] + [0] * 4)
+
+    def test_pickle(self):
+        track = pickle.loads(pickle.dumps(self.track, -1))
+
+        assert_equal(len(track.words), 6)
+        assert_equal(track.words[1].phones[0].seg, 'k')
+        assert_equal(track.wav.getnframes(), 9520)
+
+        self.track.wav.rewind()
+        assert_equal(track.wav.readframes(10), self.track.wav.readframes(10))
+
     def test_repr(self):
         assert_equal(repr(self.track), 'Track("s0201a")')
 
@@ -370,6 +707,277 @@ class TestTrack(object):
         assert_equal(logs[0].entry, '<VOICE=modal>')
         assert_equal(logs[1].entry, '<VOICE=creaky>')
 
+    def test_query(self):
+        entries = self.track.query(0.24, 0.37)
+
+        assert_equal(entries['log'], self.track.get_logs(0.24, 0.37))
+        assert_equal(entries['words'], self.track.words[1:2])
+        assert_equal(entries['phones'], self.track.phones[3:4])
+
+    def test_query_tiers(self):
+        entries = self.track.query(0.05, 0.2, tiers=('phones',))
+
+        assert_equal(list(entries), ['phones'])
+        assert_equal([p.seg for p in entries['phones']], ['dh', 'ah', 'k'])
+
+    def test_query_log_matches_get_logs(self):
+        for beg, end in [(-1.0, 0.0), (2.0, 3.0), (0.24, 0.99), (0.35, 0.99),
+                         (0.39, 0.22), (1.0, 1.2), (0.98, 1.2)]:
+            assert_equal(self.track.query(beg, end, ['log'])['log'],
+                         self.track.get_logs(beg, end))
+
+    @raises(ValueError)
+    def test_query_unknown_tier(self):
+        self.track.query(0.0, 1.0, tiers=('utterances',))
+
+
+class TestWavMap(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.zip = os.path.join('test', 'files', 'test.zip')
+
+        cls.track = Track.from_zip(cls.zip, load_wav=True)
+        cls.mapped = Track.from_zip(cls.zip, load_wav=cls.folder)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.mapped.close()
+        shutil.rmtree(cls.folder)
+
+    def test_extract(self):
+        path = os.path.join(self.folder, 'test.wav')
+
+        assert_true(os.path.isfile(path))
+        assert_equal(self.mapped._wav_path, path)
+        assert_equal(self.mapped.wav.getnframes(), 9520)
+
+        with mock.patch('buckeye.buckeye.shutil.copyfileobj') as copy:
+            track = Track.from_zip(self.zip, load_wav=self.folder)
+            assert_false(copy.called)
+
+        track.close()
+
+    def test_extract_new_folder(self):
+        folder = os.path.join(self.folder, 'threads')
+        path = make_speaker_zip(self.folder, 's01', ('01a', '01b', '02a'))
+
+        speaker = Speaker.from_zip(path, load_wavs=folder, threads=3)
+
+        assert_equal(sorted(os.listdir(folder)),
+                     ['s0101a.wav', 's0101b.wav', 's0102a.wav'])
+
+        for track in speaker:
+            track.close()
+
+    def test_extract_race(self):
+        folder = os.path.join(self.folder, 'race')
+        os.makedirs(folder)
+
+        # another thread created the folder after it was checked
+        with mock.patch('buckeye.buckeye.os.makedirs') as makedirs:
+            makedirs.side_effect = OSError(errno.EEXIST, 'File exists')
+            track = Track.from_zip(self.zip, load_wav=folder)
+
+        assert_equal(track.wav.getnframes(), 9520)
+        track.close()
+
+    def test_extract_failure(self):
+        folder = os.path.join(self.folder, 'failure')
+
+        with mock.patch('buckeye.buckeye.shutil.copyfileobj') as copy:
+            copy.side_effect = IOError('No space left on device')
+            assert_raises(IOError, Track.from_zip, self.zip,
+                          load_wav=folder)
+
+        assert_equal(os.listdir(folder), [])
+
+    def test_frames(self):
+        for beg, end in [(0.0625, 0.075), (0, 0.01), (0.5, 0.6), (0.1, 0.05)]:
+            assert_equal(bytes(self.mapped.frames(beg, end)),
+                         bytes(self.track.frames(beg, end)))
+
+    def test_frames_is_view(self):
+        frames = self.mapped.frames(0.0625, 0.075)
+
+        assert_equal(len(frames), 200)
+
+        if buffer_type is None:
+            assert_is_not(frames.obj, None)
+
+        else:
+            assert_is_instance(frames, buffer_type)
+
+    def test_frames_buffer(self):
+        # the Python 2 path, with an equivalent of the buffer builtin
+        def buffer(data, offset, size):
+            return bytes(data[offset:offset + size])
+
+        expected = self.track.samples(0.0625, 0.075, 'float32')
+
+        with mock.patch('buckeye.buckeye.buffer_type', buffer):
+            assert_equal(bytes(self.mapped.frames(0.0625, 0.075)),
+                         bytes(self.track.frames(0.0625, 0.075)))
+            assert_equal(self.mapped.samples(0.0625, 0.075, 'float32')
+                         .tolist(), expected.tolist())
+            assert_equal(len(self.mapped.frames(0.075, 0.0625)), 0)
+
+    @raises(Exception)
+    def test_frames_out_of_range(self):
+        self.mapped.frames(-1.0, 0.5)
+
+    def test_clip_wav(self):
+        expected = io.BytesIO()
+        self.track.clip_wav(expected, 0.0625, 0.075)
+
+        clip = io.BytesIO()
+        self.mapped.clip_wav(clip, 0.0625, 0.075)
+
+        assert_equal(clip.getvalue(), expected.getvalue())
+
+    def test_clip_wavs(self):
+        intervals = [('a', 0.5, 0.6), ('b', 0.0625, 0.075), ('c', 0.0, 0.7),
+                     ('d', 0.55, 2.0)]
+
+        for track in (self.track, self.mapped):
+            folder = tempfile.mkdtemp(dir=self.folder)
+            paths = track.clip_wavs(intervals, folder, chunk=0.1)
+
+            assert_equal(paths, [os.path.join(folder, name + '.wav')
+                                 for name, beg, end in intervals])
+
+            for path, (name, beg, end) in zip(paths, intervals):
+                expected = io.BytesIO()
+                self.track.clip_wav(expected, beg, end)
+
+                with io.open(path, 'rb') as clip:
+                    assert_equal(clip.read(), expected.getvalue())
+
+    def test_clip_wavs_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        intervals = [('a', 0.5, 0.6), ('b', 0.0625, 0.075)]
+        clips = self.mapped.clip_wavs(intervals)
+
+        assert_equal(len(clips), 2)
+        assert_equal(clips[1].tolist(),
+                     self.track.samples(0.0625, 0.075).tolist())
+
+    def test_samples(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        samples = self.mapped.samples(0.0625, 0.075)
+
+        assert_equal(samples.dtype, numpy.int16)
+        assert_equal(samples[:3].tolist(), [11779, -14105, -27182])
+        assert_equal(samples.tolist(),
+                     self.track.samples(0.0625, 0.075).tolist())
+
+    def test_samples_float(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        samples = self.mapped.samples(0.0625, 0.075, dtype='float32')
+
+        assert_equal(samples.dtype, numpy.float32)
+        assert_equal(samples[:3].tolist(),
+                     [11779 / 32768, -14105 / 32768, -27182 / 32768])
+
+    @raises(ValueError)
+    def test_samples_int_dtype(self):
+        self.mapped.samples(0.0625, 0.075, dtype='int32')
+
+    def test_samples_batch(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        intervals = [(0.5, 0.6), (0.0625, 0.075), (0.1, 0.05), (0.55, 2.0)]
+
+        for track in (self.track, self.mapped):
+            samples, offsets = track.samples_batch(intervals, chunk=0.1)
+
+            assert_equal(offsets.tolist(), [0, 800, 900, 900, 6020])
+            assert_equal(samples.dtype, numpy.int16)
+
+            for i, (beg, end) in enumerate(intervals):
+                assert_equal(samples[offsets[i]:offsets[i + 1]].tolist(),
+                             self.track.samples(beg, end).tolist())
+
+    def test_samples_batch_entries(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        words = self.mapped.words[:3]
+        samples, offsets = self.mapped.samples_batch(words, 'float32')
+
+        assert_equal(samples.dtype, numpy.float32)
+        assert_equal(len(offsets), 4)
+        assert_equal(samples[offsets[1]:offsets[2]].tolist(),
+                     words[1].samples(self.mapped, 'float32').tolist())
+
+        samples, offsets = self.mapped.samples_batch([])
+
+        assert_equal(len(samples), 0)
+        assert_equal(offsets.tolist(), [0])
+
+    def test_entry_samples(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        word = self.mapped.words[1]
+        phone = word.phones[0]
+        utterance = Utterance(self.mapped.words[1:3])
+
+        assert_equal(word.samples(self.mapped).tolist(),
+                     self.track.samples(word.beg, word.end).tolist())
+        assert_equal(phone.samples(self.mapped).tolist(),
+                     self.track.samples(phone.beg, phone.end).tolist())
+        assert_equal(utterance.samples(self.mapped).tolist(),
+                     self.track.samples(utterance.beg,
+                                        utterance.end).tolist())
+
+    def test_pickle(self):
+        track = pickle.loads(pickle.dumps(self.mapped, -1))
+
+        assert_equal(track._wav_path, self.mapped._wav_path)
+        assert_equal(bytes(track.frames(0, 0.01)),
+                     bytes(self.track.frames(0, 0.01)))
+
+        track.close()
+
+    def test_default_init(self):
+        path = os.path.join('test', 'files', 'noise.wav')
+        track = Track('test', *[os.path.join('test', 'files', 'test' + ext)
+                                for ext in ('.words', '.phones', '.log',
+                                            '.txt')], wav=path)
+
+        assert_equal(track._wav_path, path)
+        assert_equal(bytes(track.frames(0.0625, 0.075)),
+                     bytes(self.track.frames(0.0625, 0.075)))
+
+        track.close()
+
 
 class TestCorpus(object):
 
@@ -378,9 +986,12 @@ class TestCorpus(object):
     def test_corpus(self, SpeakerMock, GlobMock):
         GlobMock.return_value = ['s02.zip', 's03.zip', 's01.zip']
 
-        expected_calls = [mock.call('s01.zip', False),
-                          mock.call('s02.zip', False),
-                          mock.call('s03.zip', False)]
+        options = {'cache_dir': None, 'lazy': False, 'max_tracks': None,
+                   'threads': None, 'stream': False}
+
+        expected_calls = [mock.call('s01.zip', False, **options),
+                          mock.call('s02.zip', False, **options),
+                          mock.call('s03.zip', False, **options)]
 
         for speaker in corpus(''):
             pass
@@ -388,6 +999,166 @@ class TestCorpus(object):
         assert_equal(SpeakerMock.from_zip.call_args_list, expected_calls)
 
 
+class TestCorpusParallel(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+
+        for name in ('s03', 's01', 's02'):
+            make_speaker_zip(cls.folder, name, ('01a',))
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_ordered(self):
+        speakers = list(corpus_parallel(self.folder, workers=2))
+
+        assert_equal([s.name for s in speakers], ['s01', 's02', 's03'])
+        assert_equal(len(speakers[0][0].words), 6)
+
+    def test_unordered(self):
+        speakers = corpus_parallel(self.folder, workers=2, ordered=False)
+
+        assert_equal(sorted(s.name for s in speakers), ['s01', 's02', 's03'])
+
+    def test_corpus_workers(self):
+        speakers = list(corpus(self.folder, workers=2))
+
+        assert_equal([s.name for s in speakers], ['s01', 's02', 's03'])
+
+    def test_corpus_workers_stream(self):
+        speakers = list(corpus(self.folder, workers=2, stream=True))
+
+        track = speakers[1][0]
+
+        assert_equal(track.name, 's0201a')
+        assert_is(track.words[1]._phones, track.phones)
+        assert_equal([p.seg for p in track.words[1].phones], ['k', 'ae', 't'])
+
+    @raises(ValueError)
+    def test_corpus_workers_lazy(self):
+        list(corpus(self.folder, workers=2, lazy=True))
+
+    @raises(ValueError)
+    def test_corpus_workers_threads(self):
+        list(corpus(self.folder, workers=2, threads=2))
+
+    def test_pack_track(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'),
+                               load_wav=True)
+        frames = bytes(track.frames(0, 0.01))
+
+        packed = pickle.loads(pickle.dumps(_pack_track(track), -1))
+        unpacked = _unpack_track(packed)
+
+        assert_equal(unpacked.name, 'test')
+        assert_equal([repr(w) for w in unpacked.words],
+                     [repr(w) for w in track.words])
+        assert_equal([repr(l) for l in unpacked.log],
+                     [repr(l) for l in track.log])
+        assert_equal(unpacked.txt, track.txt)
+        assert_equal(bytes(unpacked.frames(0, 0.01)), frames)
+
+
+class TestAlignWords(object):
+
+    def setup(self):
+        self.track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+
+    def check_phones(self, words):
+        words = list(words)
+
+        assert_equal(len(words), len(self.track.words))
+
+        for word, expected in zip(words, self.track.words):
+            assert_equal([repr(p) for p in word.phones],
+                         [repr(p) for p in expected.phones])
+
+    def test_align_words(self):
+        words = process_words(io.StringIO(WORDS))
+        phones = process_phones(io.StringIO(PHONES))
+
+        self.check_phones(align_words(words, phones))
+
+    def test_backwards_word(self):
+        self.track.words[1]._end = 0.12
+        self.track.words[2]._beg = 0.12
+        self.track._set_phones()
+
+        words = list(process_words(io.StringIO(WORDS)))
+        words[1]._end = 0.12
+        words[2]._beg = 0.12
+
+        aligned = align_words(words, process_phones(io.StringIO(PHONES)))
+
+        self.check_phones(aligned)
+
+    def test_lazy(self):
+        phones = iter(process_phones(io.StringIO(PHONES)))
+        words = align_words(process_words(io.StringIO(WORDS)), phones)
+
+        first = next(words)
+
+        assert_equal([p.seg for p in first.phones], ['dh', 'ah'])
+        assert_equal(next(phones).seg, 'ae')
+
+    def test_quirks(self):
+        for seed in range(5):
+            files = synthetic_track(500, seed=seed, quirks=True)
+            track = Track('s0101a', *(io.StringIO(files[extension])
+                                      for extension in ('.words', '.phones',
+                                                        '.log', '.txt')))
+
+            words = process_words(io.StringIO(files['.words']))
+            phones = process_phones(io.StringIO(files['.phones']))
+
+            aligned = align_words(words, phones)
+
+            for word, expected in zip(aligned, track.words):
+                assert_equal([repr(p) for p in word.phones],
+                             [repr(p) for p in expected.phones])
+
+    def test_backwards_window(self):
+        # the entry after the backwards one overlaps two earlier entries
+        self.track.words[3]._end = 0.12
+        self.track.words[4]._beg = 0.12
+        self.track._set_phones()
+
+        words = list(process_words(io.StringIO(WORDS)))
+        words[3]._end = 0.12
+        words[4]._beg = 0.12
+
+        aligned = align_words(words, process_phones(io.StringIO(PHONES)),
+                              window=1.0)
+
+        self.check_phones(aligned)
+
+    @raises(ValueError)
+    def test_backwards_past_window(self):
+        words = list(process_words(io.StringIO(WORDS)))
+        words[4]._end = 0.1
+        words[5]._beg = 0.1
+
+        list(align_words(words, process_phones(io.StringIO(PHONES)),
+                         window=0.1))
+
+    def test_iter_aligned(self):
+        path = os.path.join('test', 'files', 'test.zip')
+
+        self.check_phones(Track.iter_aligned(path))
+
+    def test_iter_aligned_closes(self):
+        path = os.path.join('test', 'files', 'test.zip')
+
+        with mock.patch.object(zipfile.ZipFile, 'close',
+                               autospec=True) as close:
+            list(Track.iter_aligned(path))
+
+        assert_true(close.called)
+
+
 class TestProcessLogs(object):
 
     @classmethod
@@ -0,0 +1,174 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from nose.tools import *
+
+import errno
+import os
+import shutil
+import tempfile
+
+from buckeye import Speaker, Track, corpus
+from buckeye import cache
+
+from test_buckeye import make_speaker_zip
+
+
+class TestCache(object):
+
+    def setup(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.folder, 'cache')
+        self.path = make_speaker_zip(self.folder, 's01', ('01a', '02b'))
+
+    def teardown(self):
+        shutil.rmtree(self.folder)
+
+    def test_missing(self):
+        assert_is_none(cache.load_entries(self.cache_dir, self.path, 'x'))
+
+    def test_roundtrip(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        cache.store_entries(self.cache_dir, self.path, 's01/s0101a.zip',
+                            track.words, track.phones, track.log, track.txt)
+
+        words, phones, log, txt = cache.load_entries(self.cache_dir,
+                                                     self.path,
+                                                     's01/s0101a.zip')
+
+        assert_equal([repr(w) for w in words],
+                     [repr(w) for w in track.words])
+        assert_equal([repr(p) for p in phones],
+                     [repr(p) for p in track.phones])
+        assert_equal([repr(l) for l in log], [repr(l) for l in track.log])
+        assert_equal(txt, track.txt)
+
+    def test_invalidate(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        cache.store_entries(self.cache_dir, self.path, 's01/s0101a.zip',
+                            track.words, track.phones, track.log, track.txt)
+
+        stat = os.stat(self.path)
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert_is_none(cache.load_entries(self.cache_dir, self.path,
+                                          's01/s0101a.zip'))
+
+    def test_speaker(self):
+        speaker = Speaker.from_zip(self.path, cache_dir=self.cache_dir)
+        assert_equal(len(os.listdir(self.cache_dir)), 2)
+
+        with mock.patch('buckeye.buckeye.Track.from_zip') as from_zip:
+            cached = Speaker.from_zip(self.path, cache_dir=self.cache_dir)
+            assert_false(from_zip.called)
+
+        assert_equal([t.name for t in cached], ['s0101a', 's0102b'])
+        assert_equal(len(cached[0].words), 6)
+        assert_equal(cached[0].words[1].phones[0].seg, 'k')
+        assert_equal(cached[1].get_logs(0.24, 0.37)[0].entry, '<CONF=L>')
+
+    def test_alignment(self):
+        Speaker.from_zip(self.path, cache_dir=self.cache_dir)
+
+        with mock.patch('buckeye.buckeye.Track._set_phones') as set_phones:
+            cached = Speaker.from_zip(self.path, cache_dir=self.cache_dir)
+            assert_false(set_phones.called)
+
+        word = cached[0].words[1]
+
+        assert_is(word._phones, cached[0].phones)
+        assert_equal([p.seg for p in word.phones], ['k', 'ae', 't'])
+        assert_false(word.misaligned)
+
+    def test_unaligned(self):
+        path = os.path.join(self.folder, 'test.zip')
+        shutil.copy(os.path.join('test', 'files', 'test.zip'), path)
+
+        Track.from_zip(path, cache_dir=self.cache_dir)
+        track = Track.from_zip(path, cache_dir=self.cache_dir,
+                               align_phones=False)
+
+        assert_is_none(track.words[1].phones)
+
+        track.align_phones()
+        assert_equal([p.seg for p in track.words[1].phones], ['k', 'ae', 't'])
+
+        # entries that were stored before they were aligned
+        Track.from_zip(path, cache_dir=self.folder, align_phones=False)
+        track = Track.from_zip(path, cache_dir=self.folder)
+
+        assert_equal([p.seg for p in track.words[1].phones], ['k', 'ae', 't'])
+
+    def test_speaker_wavs(self):
+        Speaker.from_zip(self.path, cache_dir=self.cache_dir)
+        cached = Speaker.from_zip(self.path, True, cache_dir=self.cache_dir)
+
+        assert_equal(cached[0].wav.getnframes(), 9520)
+
+    def test_track(self):
+        path = os.path.join(self.folder, 'test.zip')
+        shutil.copy(os.path.join('test', 'files', 'test.zip'), path)
+
+        Track.from_zip(path, cache_dir=self.cache_dir)
+        track = Track.from_zip(path, load_wav=True, cache_dir=self.cache_dir)
+
+        assert_equal(track.name, 'test')
+        assert_equal(len(track.words), 6)
+        assert_equal(len(track.phones), 14)
+        assert_equal(track.wav.getnframes(), 9520)
+
+    def test_workers(self):
+        for name in ('s02', 's03', 's04', 's05'):
+            make_speaker_zip(self.folder, name, ('01a', '01b', '02a'))
+
+        speakers = list(corpus(self.folder, workers=4,
+                               cache_dir=self.cache_dir))
+
+        assert_equal(len(speakers), 5)
+        assert_equal(len(os.listdir(self.cache_dir)), 14)
+
+    def test_makedirs_race(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        os.makedirs(self.cache_dir)
+
+        # another process created the directory after it was checked
+        with mock.patch('buckeye.cache.os.makedirs') as makedirs:
+            makedirs.side_effect = OSError(errno.EEXIST, 'File exists')
+            cache.store_entries(self.cache_dir, self.path, 's01/s0101a.zip',
+                                track.words, track.phones, track.log,
+                                track.txt)
+
+        assert_is_not_none(cache.load_entries(self.cache_dir, self.path,
+                                              's01/s0101a.zip'))
+
+    @raises(OSError)
+    def test_makedirs_error(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+
+        with mock.patch('buckeye.cache.os.makedirs') as makedirs:
+            makedirs.side_effect = OSError(errno.EACCES, 'Permission denied')
+            cache.store_entries(self.cache_dir, self.path, 's01/s0101a.zip',
+                                track.words, track.phones, track.log,
+                                track.txt)
+
+    def test_write_error(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+
+        for target in ('buckeye.cache.pickle.dump',
+                       'buckeye.cache.os.replace'):
+            with mock.patch(target, create=True) as write:
+                write.side_effect = IOError(errno.ENOSPC,
+                                            'No space left on device')
+
+                assert_raises(IOError, cache.store_entries, self.cache_dir,
+                              self.path, 's01/s0101a.zip', track.words,
+                              track.phones, track.log, track.txt)
+
+            assert_equal(os.listdir(self.cache_dir), [])
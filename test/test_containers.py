@@ -60,6 +60,17 @@ class TestWord(object):
         assert_raises(TypeError, self.empty_word.syllables, False)
         assert_raises(TypeError, self.empty_word.syllables, True)
 
+    def test_cached_syllables(self):
+        self.word._syllables = (5, 6)
+        self.word._misaligned = True
+
+        assert_equal(self.word.syllables(), 5)
+        assert_equal(self.word.syllables(phonetic=True), 6)
+        assert_true(self.word.misaligned)
+
+        self.empty_word._syllables = (-1, -1)
+        assert_raises(TypeError, self.empty_word.syllables)
+
     @raises(AttributeError)
     def test_readonly_orthography(self):
         self.word.orthography = 'an'
@@ -105,6 +116,19 @@ class TestWord(object):
         self.word._phones = []
         assert_true(self.word.misaligned)
 
+    def test_phones_range(self):
+        phones = [Phone('th'), Phone('dh'), Phone('iy')]
+
+        self.word._phones = phones
+        self.word._phone_beg = 1
+        self.word._phone_end = 2
+
+        assert_equal(self.word.phones, phones[1:2])
+        assert_false(self.word.misaligned)
+        assert_equal(self.word.syllables(phonetic=True), 0)
+
+        self.word._phone_beg = None
+
     def test_misaligned_backwards(self):
         misaligned_word = Word('', 0.50, 0.25, phonetic=['dh'])
         misaligned_word._phones = [Phone('dh')]
@@ -133,6 +157,16 @@ class TestWord(object):
         zero_word = Word('', 0.40, 0.40)
         assert_false(zero_word.misaligned)
 
+    def test_new(self):
+        word = Word._new('the', 0.05, 0.25, ['dh', 'iy'], ['dh'], 'DT')
+
+        assert_equal(repr(word), repr(self.word))
+        assert_is_none(word.phones)
+
+    @raises(AttributeError)
+    def test_slots(self):
+        self.word.extra = None
+
     def test_repr(self):
         assert_equal(repr(self.word), "Word('the', 0.05, 0.25, ['dh', 'iy'], ['dh'], 'DT')")
 
@@ -198,6 +232,16 @@ class TestPause(object):
         zero_pause = Pause('', 0.40, 0.40)
         assert_false(zero_pause.misaligned)
 
+    def test_new(self):
+        pause = Pause._new('<SIL>', 0.0, 0.05)
+
+        assert_equal(repr(pause), repr(self.pause))
+        assert_is_none(pause.phones)
+
+    @raises(AttributeError)
+    def test_slots(self):
+        self.pause.extra = None
+
     def test_repr(self):
         assert_equal(repr(self.pause), "Pause('<SIL>', 0.0, 0.05)")
 
@@ -244,6 +288,14 @@ class TestLogEntry(object):
     def test_readonly_dur(self):
         self.log.dur = 1.0
 
+    def test_new(self):
+        log = LogEntry._new('<voiceless-vowel>', 0.45, 0.50)
+        assert_equal(repr(log), repr(self.log))
+
+    @raises(AttributeError)
+    def test_slots(self):
+        self.log.extra = None
+
     def test_repr(self):
         assert_equal(repr(self.log), "LogEntry('<voiceless-vowel>', 0.45, 0.5)")
 
@@ -290,6 +342,14 @@ class TestPhone(object):
     def test_readonly_dur(self):
         self.phone.dur = 1.0
 
+    def test_new(self):
+        phone = Phone._new('dh', 0.05, 0.15)
+        assert_equal(repr(phone), repr(self.phone))
+
+    @raises(AttributeError)
+    def test_slots(self):
+        self.phone.extra = None
+
     def test_repr(self):
         assert_equal(repr(self.phone), "Phone('dh', 0.05, 0.15)")
 
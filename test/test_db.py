@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import os
+import shutil
+import tempfile
+
+from buckeye import CorpusDB, Speaker
+from buckeye.containers import Pause, Word
+
+from test_buckeye import make_speaker_zip
+
+
+class TestCorpusDB(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        make_speaker_zip(cls.folder, 's01', ('01a', '02b'))
+        make_speaker_zip(cls.folder, 's03', ('01a',))
+
+        cls.path = os.path.join(cls.folder, 'buckeye.db')
+        cls.db = CorpusDB.from_corpus(cls.folder, cls.path)
+
+        cls.track = Speaker.from_zip(os.path.join(cls.folder, 's01.zip'))[0]
+
+    @classmethod
+    def teardown_class(cls):
+        cls.db.close()
+        shutil.rmtree(cls.folder)
+
+    def test_speakers(self):
+        assert_equal(self.db.speakers(), [('s01', 'f', 'y', 'f'),
+                                          ('s03', 'm', 'o', 'm')])
+
+    def test_tracks(self):
+        assert_equal(self.db.tracks(), ['s0101a', 's0102b', 's0301a'])
+        assert_equal(self.db.tracks('s03'), ['s0301a'])
+
+    def test_words(self):
+        words = list(self.db.words(track='s0101a'))
+
+        assert_equal([repr(w) for w in words],
+                     [repr(w) for w in self.track.words])
+        assert_is_none(words[1].phones)
+
+    def test_words_filters(self):
+        words = list(self.db.words(orthography='the', speaker_sex='m'))
+
+        assert_equal(len(words), 2)
+        assert_equal(words[0].phonetic, ['dh', 'ah'])
+
+        assert_equal(len(list(self.db.words(orthography='the'))), 6)
+        assert_equal(len(list(self.db.words(phonemic=['k', 'ae', 't']))), 3)
+        assert_equal(list(self.db.words(orthography='dog')), [])
+
+    def test_words_lazy(self):
+        words = self.db.words()
+
+        assert_false(isinstance(words, list))
+        assert_is_instance(next(words), Word)
+
+    def test_words_phones(self):
+        word = next(self.db.words(orthography='cat', phones=True))
+
+        assert_equal([repr(p) for p in word.phones],
+                     [repr(p) for p in self.track.words[1].phones])
+        assert_false(word.misaligned)
+
+    @raises(ValueError)
+    def test_unknown_filter(self):
+        list(self.db.words(word='cat'))
+
+    def test_phones(self):
+        phones = list(self.db.phones(seg='ae', speaker='s03'))
+
+        assert_equal([(p.beg, p.end) for p in phones],
+                     [(0.24, 0.37), (0.99, 1.12)])
+
+    def test_logs(self):
+        logs = list(self.db.logs(entry='<CONF=L>'))
+
+        assert_equal(len(logs), 3)
+        assert_equal(repr(logs[0]), repr(self.track.log[1]))
+
+    def test_utterances(self):
+        utterances = list(self.db.utterances(track='s0102b'))
+
+        assert_equal(len(utterances), 1)
+        assert_equal([repr(w) for w in utterances[0].words],
+                     [repr(w) for w in self.track.words])
+
+    def test_reopen(self):
+        with CorpusDB(self.path) as db:
+            assert_equal(db.tracks(), self.db.tracks())
+            assert_equal(len(list(db.phones(track='s0301a'))), 14)
+
+    def test_pause(self):
+        db = CorpusDB(':memory:')
+        speaker = Speaker.from_zip(os.path.join(self.folder, 's01.zip'))
+        speaker[0].words[0] = Pause('<SIL>', 0.0, 0.15)
+
+        db.add_speaker(speaker)
+
+        pauses = list(db.words(pause=True))
+
+        assert_equal(len(pauses), 1)
+        assert_is_instance(pauses[0], Pause)
+        assert_equal(pauses[0].entry, '<SIL>')
+
+        db.close()
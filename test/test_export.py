@@ -0,0 +1,195 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+try:
+    import unittest.mock as mock
+except ImportError:
+    import mock
+
+from nose.tools import *
+
+import io
+import os
+import shutil
+import tempfile
+
+from buckeye import Speaker, Track, words_to_utterances
+from buckeye.synth import synthetic_track
+from buckeye.export import COLUMNS, TABLES, TYPES
+from buckeye.export import track_columns, speaker_columns, to_parquet
+from buckeye.utterance import _utterance_ranges
+
+from test_buckeye import make_speaker_zip
+
+
+class TestExport(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        make_speaker_zip(cls.folder, 's01', ('01a', '02b'))
+
+        cls.speaker = Speaker.from_zip(os.path.join(cls.folder, 's01.zip'))
+        cls.track = cls.speaker[0]
+        cls.tables = track_columns(cls.track, cls.speaker)
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_columns(self):
+        for name in TABLES:
+            assert_equal(sorted(self.tables[name]), sorted(COLUMNS[name]))
+
+            lengths = set(len(values) for values in
+                          self.tables[name].values())
+            assert_equal(len(lengths), 1)
+
+    def test_metadata(self):
+        words = self.tables['words']
+
+        assert_equal(set(words['speaker']), set(['s01']))
+        assert_equal(set(words['sex']), set([self.speaker.sex]))
+        assert_equal(set(words['track']), set(['s0101a']))
+
+    def test_words(self):
+        words = self.tables['words']
+
+        assert_equal(words['label'], ['the', 'cat', 'is', 'on', 'the', 'mat'])
+        assert_equal(words['phonetic'][1], 'k ae t')
+        assert_equal(words['pos'][1], 'NN')
+        assert_equal(words['utterance'], [0] * 6)
+        assert_equal(words['phone_beg'][1:3], [2, 5])
+        assert_equal(words['phone_end'][1:3], [5, 7])
+
+    def test_phone_keys(self):
+        words = self.tables['words']
+        phones = self.tables['phones']
+
+        for i, (beg, end) in enumerate(zip(words['phone_beg'],
+                                           words['phone_end'])):
+            assert_equal(phones['word'][beg:end], [i] * (end - beg))
+
+        assert_equal(phones['seg'][2:5], ['k', 'ae', 't'])
+
+    def test_log(self):
+        assert_equal(self.tables['log']['entry'][1], '<CONF=L>')
+        assert_equal(self.tables['log']['log'], [0, 1, 2, 3])
+
+    def test_utterances(self):
+        utterances = self.tables['utterances']
+
+        assert_equal(utterances['text'], ['the cat is on the mat'])
+        assert_equal(utterances['word_beg'], [0])
+        assert_equal(utterances['word_end'], [6])
+        assert_equal(utterances['end'], [1.19])
+
+    def test_speaker_columns(self):
+        tables = speaker_columns(self.speaker)
+
+        assert_equal(len(tables['words']['word']), 12)
+        assert_equal(tables['words']['track'][5:7], ['s0101a', 's0102b'])
+
+    def test_ranges_match_words_to_utterances(self):
+        files = synthetic_track(2000, seed=3)
+        track = Track('synthetic', *(io.StringIO(files[extension]) for
+                                     extension in ('.words', '.phones', '.log',
+                                                   '.txt')))
+
+        for sep in (0.1, 0.5, float('inf')):
+            utterances = list(words_to_utterances(track.words, sep))
+            ranges = list(_utterance_ranges(track.words, sep))
+
+            assert_equal(len(ranges), len(utterances))
+
+            for (start, stop), utterance in zip(ranges, utterances):
+                assert_equal(track.words[start:stop], utterance.words)
+
+    def test_unaligned_track(self):
+        files = synthetic_track(500, seed=2, quirks=True)
+
+        def track(align_phones):
+            return Track('synthetic', *(io.StringIO(files[extension]) for
+                                        extension in ('.words', '.phones',
+                                                      '.log', '.txt')),
+                         align_phones=align_phones)
+
+        unaligned = track(False)
+        tables = track_columns(unaligned, self.speaker)
+
+        assert_is(unaligned.words[0]._phone_beg, None)
+        assert_is(unaligned.words[0].phones, None)
+        assert_in(True, tables['words']['misaligned'])
+        assert_equal(tables, track_columns(track(True), self.speaker))
+
+    def test_utterance_ranges_misaligned(self):
+        track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        words = list(track.words)
+        words[2] = type(words[2])('is', 0.59, 0.44)
+
+        assert_equal(list(_utterance_ranges(words)), [(0, 6)])
+
+    @raises(ValueError)
+    def test_unknown_table(self):
+        to_parquet(self.folder, self.folder, tables=['syllables'])
+
+    @raises(ValueError)
+    def test_unknown_column(self):
+        to_parquet(self.folder, self.folder, columns={'words': ['word_id']})
+
+    @raises(ImportError)
+    @mock.patch('buckeye.export.pyarrow', None)
+    def test_missing_pyarrow(self):
+        to_parquet(self.folder, self.folder)
+
+    def test_to_parquet(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('pyarrow is not installed')
+
+        out_dir = os.path.join(self.folder, 'parquet')
+        paths = to_parquet(self.folder, out_dir,
+                           columns={'phones': ['track', 'seg', 'word']})
+
+        assert_equal(len(paths), len(TABLES))
+        assert_in(os.path.join(out_dir, 'words', 'speaker=s01', 's01.parquet'),
+                  paths)
+
+        phones = pyarrow.parquet.read_table(
+            os.path.join(out_dir, 'phones', 'speaker=s01', 's01.parquet'))
+
+        assert_equal(phones.column_names, ['track', 'seg', 'word'])
+        assert_equal(phones.num_rows, 28)
+
+    def test_types(self):
+        for name in TABLES:
+            for column in COLUMNS[name]:
+                assert_in(column, TYPES)
+
+    def test_to_parquet_empty_column(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('pyarrow is not installed')
+
+        tables = speaker_columns(self.speaker)
+        tables['words']['pos'] = [None] * len(tables['words']['pos'])
+        tables['words']['utterance'] = [None] * len(tables['words']['pos'])
+
+        out_dir = os.path.join(self.folder, 'empty')
+
+        with mock.patch('buckeye.export.speaker_columns',
+                        return_value=tables):
+            to_parquet(self.folder, out_dir, tables=['words'])
+
+        words = pyarrow.parquet.read_table(
+            os.path.join(out_dir, 'words', 'speaker=s01', 's01.parquet'))
+
+        assert_equal(str(words.schema.field('pos').type), 'string')
+        assert_equal(str(words.schema.field('utterance').type), 'int64')
+        assert_equal(words.column('pos').null_count, words.num_rows)
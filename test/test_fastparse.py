@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import io
+import os
+
+from buckeye import Track, process_logs, process_phones, process_words
+from buckeye import fastparse
+from buckeye.synth import synthetic_track
+
+from test_buckeye import WORDS, PHONES, LOG
+
+
+PARSERS = {'.words': (process_words, fastparse.parse_words,
+                      fastparse.to_words),
+           '.phones': (process_phones, fastparse.parse_phones,
+                       fastparse.to_phones),
+           '.log': (process_logs, fastparse.parse_logs, fastparse.to_logs)}
+
+
+def check_same(extension, text):
+    process, parse, build = PARSERS[extension]
+
+    try:
+        expected = [repr(entry) for entry in process(io.StringIO(text))]
+
+    # process_words raises UnboundLocalError for some malformed entries
+    except (ValueError, EOFError, NameError) as error:
+        assert_raises((type(error), ValueError), parse, text)
+
+    else:
+        assert_equal([repr(entry) for entry in build(parse(text))], expected)
+
+
+class TestFastParse(object):
+
+    def test_fixtures(self):
+        for extension, text in (('.words', WORDS), ('.phones', PHONES),
+                                ('.log', LOG)):
+            check_same(extension, text)
+            check_same(extension, text.rstrip('\n'))
+            check_same(extension, '\n\n'.join([text[:8], text[8:]]))
+            check_same(extension, '\n\n'.join([text[:44], text[44:]]))
+
+    def test_synthetic(self):
+        files = synthetic_track(2000, seed=3)
+
+        for extension in PARSERS:
+            check_same(extension, files[extension])
+
+        for seed in range(5):
+            files = synthetic_track(500, seed=seed, quirks=True)
+
+            for extension in PARSERS:
+                check_same(extension, files[extension])
+
+    def test_missing_fields(self):
+        check_same('.words', 'header\n#\n0.15  121 the; DT\n'
+                             '0.25  121 cat; k ae t; NN\n'
+                             '0.35  121 <CUTOFF-ca=cat>; U; U; null\n')
+        check_same('.phones', 'header\n#\n    0.03  121   \n0.05 121 t\n')
+        check_same('.log', 'header\n#\n    0.07  121   \n0.10 121 <CONF=L>\n')
+
+    def test_merged_line(self):
+        check_same('.words', 'header\n#\n'
+                             '   32.2  121 <SIL>  32.2  121 {B_TRANS}; '
+                             'S; S; null\n'
+                             '   32.5  121 yeah; y ae; y ae; UH\n')
+
+    def test_phone_suffixes(self):
+        check_same('.phones', 'header\n#\n0.1 121 ah+1\n0.2 121 n; *\n'
+                              '0.3 121 em+1; *\n')
+
+    def test_misaligned(self):
+        check_same('.words', 'header\n#\n-1.0 121 {B_TRANS}; S; S; null\n'
+                             '0.5 121 the; dh iy; dh ah; DT\n'
+                             '0.4 121 cat; k ae t; k ae t; NN\n')
+
+    def test_semicolon_label(self):
+        check_same('.words', 'header\n#\n0.2 121 ;eah; y eh; y eh; UH\n')
+        check_same('.words', 'header\n#\n0.1 121 ;; ; ; null\n')
+
+    def test_irregular_lines(self):
+        for extension in PARSERS:
+            check_same(extension, 'header\n#\n0.1;121 x; a; b; c\n')
+            check_same(extension, 'header\n#\n0.1 121 x; a; b; c\n   \n')
+            check_same(extension, 'header\n#\n0.1 121 a b c\n0.2 121\n')
+            check_same(extension, 'header\n#\r\n0.1\t121 x; a; b; c\r\n')
+
+    def test_no_entries(self):
+        for extension in PARSERS:
+            check_same(extension, 'header\n#\n')
+            check_same(extension, 'header\n#')
+
+            assert_equal(len(PARSERS[extension][1]('header\n#\n')['end']), 0)
+
+    @raises(EOFError)
+    def test_no_header(self):
+        fastparse.parse_words('header#\n\n\n')
+
+    @raises(EOFError)
+    def test_blank(self):
+        fastparse.parse_phones('\n\n\n\n')
+
+    def test_columns(self):
+        columns = fastparse.parse_words(WORDS)
+
+        assert_equal(columns['label'][1], 'cat')
+        assert_equal(list(columns['beg'][:2]), [0.0, 0.15])
+        assert_equal(columns['end'][-1], 1.19)
+        assert_equal(columns['pause'], [False] * 6)
+
+    def test_track(self):
+        path = os.path.join('test', 'files', 'test.zip')
+
+        default = Track.from_zip(path)
+        fast = Track.from_zip(path, parser='fast')
+
+        for tier in ('words', 'phones', 'log'):
+            assert_equal([repr(entry) for entry in getattr(fast, tier)],
+                         [repr(entry) for entry in getattr(default, tier)])
+
+        assert_equal(fast.words[1].phones[0].seg, 'k')
+
+    @raises(ValueError)
+    def test_unknown_parser(self):
+        Track.from_zip(os.path.join('test', 'files', 'test.zip'),
+                       parser='slow')
@@ -0,0 +1,122 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import os
+import random
+import shutil
+import tempfile
+
+from buckeye import corpus, CorpusIndex
+from buckeye.index import IntervalIndex
+
+from test_buckeye import make_speaker_zip
+
+
+class TestIntervalIndex(object):
+
+    def setup(self):
+        self.begs = [0.0, 0.5, 0.2, 1.5, 1.0]
+        self.ends = [1.0, 0.7, 2.0, 1.2, 1.0]
+        self.index = IntervalIndex(self.begs, self.ends)
+
+    def test_len(self):
+        assert_equal(len(self.index), 5)
+        assert_equal(len(IntervalIndex([], [])), 0)
+
+    def test_empty(self):
+        assert_equal(IntervalIndex([], []).overlapping(0, 1), [])
+
+    def test_overlapping(self):
+        assert_equal(self.index.overlapping(0.6, 0.65), [0, 1, 2])
+        assert_equal(self.index.overlapping(1.1, 1.3), [2, 3])
+
+    def test_boundaries(self):
+        assert_equal(self.index.overlapping(-1.0, 0.0), [])
+        assert_equal(self.index.overlapping(0.7, 0.8), [0, 2])
+        assert_equal(self.index.overlapping(2.0, 3.0), [])
+
+    def test_negative_duration(self):
+        assert_equal(self.index.overlapping(1.3, 1.4), [2, 3])
+
+    def test_point(self):
+        assert_equal(self.index.overlapping(0.5, 0.5), [0, 2])
+
+    def test_backwards(self):
+        assert_equal(self.index.overlapping(0.65, 0.6), [])
+
+    def test_brute_force(self):
+        rng = random.Random(0)
+
+        begs = [rng.uniform(0, 10) for _ in range(200)]
+        ends = [beg + rng.uniform(-0.5, 2) for beg in begs]
+        index = IntervalIndex(begs, ends)
+
+        for _ in range(100):
+            beg = rng.uniform(-1, 11)
+            end = beg + rng.uniform(0, 3)
+
+            expected = [i for i in range(len(begs))
+                        if max(begs[i], ends[i]) > beg
+                        and min(begs[i], ends[i]) < end]
+
+            assert_equal(index.overlapping(beg, end), expected)
+
+
+class TestCorpusIndex(object):
+
+    def setup(self):
+        self.folder = tempfile.mkdtemp()
+        make_speaker_zip(self.folder, 's01', ('01a', '02b'))
+        make_speaker_zip(self.folder, 's02', ('01a',))
+
+        self.index = CorpusIndex.from_corpus(corpus(self.folder))
+
+    def teardown(self):
+        shutil.rmtree(self.folder)
+
+    def test_tracks(self):
+        assert_equal(self.index.speakers, ['s01', 's02'])
+        assert_equal(self.index.tracks, ['s0101a', 's0102b', 's0201a'])
+
+    def test_lookup(self):
+        assert_equal(self.index.lookup('orthography', 'cat'),
+                     [('s01', 's0101a', 1), ('s01', 's0102b', 1),
+                      ('s02', 's0201a', 1)])
+        assert_equal(self.index.lookup('orthography', 'dog'), [])
+
+    def test_lookup_pos(self):
+        assert_equal(self.index.lookup('pos', 'DT'),
+                     [('s01', 's0101a', 0), ('s01', 's0101a', 4),
+                      ('s01', 's0102b', 0), ('s01', 's0102b', 4),
+                      ('s02', 's0201a', 0), ('s02', 's0201a', 4)])
+
+    def test_lookup_transcriptions(self):
+        assert_equal(self.index.lookup('phonemic', ['dh', 'iy']),
+                     self.index.lookup('phonemic', 'dh iy'))
+        assert_equal(self.index.count('phonetic', 'dh ah'), 6)
+        assert_equal(self.index.count('phonetic', 'dh iy'), 0)
+
+    def test_keys(self):
+        assert_equal(sorted(self.index.keys('orthography')),
+                     ['cat', 'is', 'mat', 'on', 'the'])
+
+    @raises(ValueError)
+    def test_unknown_field(self):
+        self.index.lookup('word', 'cat')
+
+    def test_save_load(self):
+        path = os.path.join(self.folder, 'index.pickle')
+        self.index.save(path)
+
+        loaded = CorpusIndex.load(path)
+
+        assert_equal(loaded.tracks, self.index.tracks)
+
+        for field in CorpusIndex.FIELDS:
+            for key in self.index.keys(field):
+                assert_equal(loaded.lookup(field, key),
+                             self.index.lookup(field, key))
@@ -0,0 +1,68 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import os
+
+from buckeye import Track, PhoneSearch
+
+
+class TestPhoneSearch(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.track = Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        cls.index = PhoneSearch([cls.track])
+
+    def test_search(self):
+        matches = self.index.search('ae t')
+
+        assert_equal([(m.start, m.stop) for m in matches], [(3, 5), (12, 14)])
+        assert_equal([p.seg for p in matches[0].phones], ['ae', 't'])
+        assert_equal(matches[0].beg, 0.24)
+        assert_equal(matches[0].end, 0.44)
+        assert_is(matches[0].track, self.track)
+
+    def test_across_words(self):
+        matches = self.index.search(['t', 'ih', 'z'])
+
+        assert_equal(len(matches), 1)
+        assert_equal([w.orthography for w in matches[0].words],
+                     ['cat', 'is'])
+        assert_is(matches[0].words[0], self.track.words[1])
+
+    def test_wildcard(self):
+        matches = self.index.search('dh * m')
+
+        assert_equal([(m.start, m.stop) for m in matches], [(9, 12)])
+
+    def test_alternation(self):
+        matches = self.index.search('k|m ae')
+
+        assert_equal([m.start for m in matches], [2, 11])
+
+    def test_all_wildcards(self):
+        assert_equal(len(self.index.search('* *')), 13)
+
+    def test_no_match(self):
+        assert_equal(self.index.search('t ah n'), [])
+        assert_equal(self.index.search('zz'), [])
+
+    def test_edges(self):
+        assert_equal(len(self.index.search('* dh ah')), 1)
+        assert_equal(len(self.index.search('ae t *')), 1)
+
+    @raises(ValueError)
+    def test_empty(self):
+        self.index.search('')
+
+    def test_two_tracks(self):
+        index = PhoneSearch([self.track, self.track])
+        matches = index.search('ae t')
+
+        assert_equal(len(index.tracks), 2)
+        assert_equal(len(matches), 4)
+        assert_equal(str(matches[0]), '<PhoneMatch test [ae t] at 0.24-0.44>')
@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from buckeye import Speaker, Track
+from buckeye import stats
+
+from test_buckeye import make_speaker_zip
+
+
+class TestStats(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.path = make_speaker_zip(cls.folder, 's01', ('01a', '01b'))
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_record(self):
+        with stats.record() as recorder:
+            Speaker.from_zip(self.path)
+
+        calls = [(r['call'], r['name'], r['parent'])
+                 for r in recorder.records]
+
+        assert_equal(calls, [('Track.__init__', 's0101a', 'Track.from_zip'),
+                             ('Track.from_zip', 's0101a', 'Speaker.from_zip'),
+                             ('Track.__init__', 's0101b', 'Track.from_zip'),
+                             ('Track.from_zip', 's0101b', 'Speaker.from_zip'),
+                             ('Speaker.from_zip', 's01', None)])
+
+        init = recorder.records[0]['stages']
+
+        assert_equal(sorted(init), ['align', 'parse'])
+        assert_equal(init['parse']['calls'], 3)
+        assert_equal(init['parse']['entries'], 6 + 14 + 4)
+        assert_equal(init['align']['entries'], 6)
+
+        from_zip = recorder.records[1]['stages']
+
+        assert_equal(sorted(from_zip), ['decode', 'inflate'])
+        assert_equal(from_zip['inflate']['calls'], 4)
+        assert_true(from_zip['decode']['bytes'] > 0)
+
+        speaker = recorder.records[-1]
+
+        assert_equal(speaker['stages']['inflate']['calls'], 2)
+        assert_true(speaker['seconds'] >= 0)
+
+    def test_totals(self):
+        with stats.record() as recorder:
+            Track.from_zip(os.path.join('test', 'files', 'test.zip'),
+                           load_wav=True, parser='fast')
+
+        totals = recorder.totals()
+
+        assert_equal(sorted(totals), ['align', 'construct', 'decode',
+                                      'inflate', 'parse', 'wav'])
+        assert_equal(totals['construct']['entries'], 24)
+        assert_equal(totals['parse']['entries'], 0)
+        assert_true(totals['wav']['bytes'] > 19040)
+
+    def test_to_json(self):
+        with stats.record() as recorder:
+            Speaker.from_zip(self.path, stream=True)
+
+        results = json.loads(recorder.to_json())
+
+        assert_equal(len(results['records']), 5)
+        assert_equal(results['stages']['parse']['entries'], 2 * 24)
+        assert_not_in('decode', results['records'][0]['stages'])
+
+    def test_threads(self):
+        with stats.record() as recorder:
+            Speaker.from_zip(self.path, threads=2)
+
+        calls = sorted((r['call'], r['name']) for r in recorder.records
+                       if r['call'] is not None)
+
+        assert_equal(calls, [('Speaker.from_zip', 's01'),
+                             ('Track.__init__', 's0101a'),
+                             ('Track.__init__', 's0101b'),
+                             ('Track.from_zip', 's0101a'),
+                             ('Track.from_zip', 's0101b')])
+
+        # reading the track archives in the threads isn't part of a call
+        orphans = [r for r in recorder.records if r['call'] is None]
+
+        assert_equal(len(orphans), 2)
+        assert_equal(list(orphans[0]['stages']), ['inflate'])
+
+    def test_overlapping_stages(self):
+        def parse():
+            with stats.call('Track.from_zip', 's0101b'):
+                with stats.stage('parse'):
+                    pass
+
+        with stats.record() as recorder:
+            with stats.call('Track.from_zip', 's0101a'):
+                with stats.stage('inflate'):
+                    pass
+
+                with stats.stage('parse'):
+                    thread = threading.Thread(target=parse)
+                    thread.start()
+                    thread.join()
+
+        objects = [(r['name'], name, stage['objects'])
+                   for r in recorder.records
+                   for name, stage in sorted(r['stages'].items())]
+
+        assert_equal([item[:2] for item in objects],
+                     [('s0101b', 'parse'), ('s0101a', 'inflate'),
+                      ('s0101a', 'parse')])
+        assert_is(objects[0][2], None)
+        assert_is(objects[2][2], None)
+
+        if hasattr(sys, 'getallocatedblocks'):
+            assert_is_not(objects[1][2], None)
+
+    def test_observer(self):
+        records = []
+        stats.add_observer(records.append)
+
+        try:
+            Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+
+        finally:
+            stats.remove_observer(records.append)
+
+        assert_equal([r['call'] for r in records],
+                     ['Track.__init__', 'Track.from_zip'])
+
+        Track.from_zip(os.path.join('test', 'files', 'test.zip'))
+        assert_equal(len(records), 2)
+
+    def test_disabled(self):
+        assert_is(stats.stage('parse'), stats._NULL)
+        assert_is(stats.call('Track.from_zip', 's0101a'), stats._NULL)
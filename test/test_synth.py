@@ -0,0 +1,140 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import wave
+import zipfile
+
+from buckeye import corpus, Speaker, words_to_utterances
+from buckeye import process_logs, process_phones, process_words
+from buckeye import fastparse
+from buckeye.buckeye import TRACK_RE
+from buckeye.synth import QUIRKS
+from buckeye.synth import synthetic_track, synthetic_wav
+from buckeye.synth import synthetic_speaker, synthetic_corpus
+
+
+class TestSynth(object):
+
+    def setup(self):
+        self.folder = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.folder)
+
+    def test_synthetic_track(self):
+        files = synthetic_track(200, seed=1)
+
+        words = list(process_words(io.StringIO(files['.words'])))
+        phones = list(process_phones(io.StringIO(files['.phones'])))
+
+        assert_equal(len(words), 200)
+        assert_true(len(phones) >= 200)
+        assert_false(any(word.misaligned for word in words))
+        assert_equal(words[0].entry, '{B_TRANS}')
+        assert_equal(words[-1].entry, '{E_TRANS}')
+
+    def test_synthetic_track_seed(self):
+        assert_equal(synthetic_track(50, seed=2), synthetic_track(50, seed=2))
+        assert_not_equal(synthetic_track(50, seed=2),
+                         synthetic_track(50, seed=3))
+
+    def test_quirks(self):
+        files = synthetic_track(300, seed=4, quirks=True)
+
+        words = list(process_words(io.StringIO(files['.words'])))
+        phones = list(process_phones(io.StringIO(files['.phones'])))
+        logs = list(process_logs(io.StringIO(files['.log'])))
+
+        assert_equal(len(words), 300)
+        assert_true(words[0].misaligned)
+        assert_in('<SIL>', words[0].entry)
+        assert_true(any(w.beg > w.end for w in words[1:]))
+        assert_true(any(getattr(w, 'phonetic', []) is None for w in words))
+        assert_true(any(p.seg is None for p in phones))
+        assert_true(any(l.entry is None for l in logs))
+        assert_in('\n\n', files['.words'])
+        assert_true(re.search(r'(\+1|;)\n', files['.phones']))
+
+        assert_raises(ValueError, list, words_to_utterances(words))
+
+    def test_quirks_fastparse(self):
+        for seed in range(5):
+            files = synthetic_track(200, seed, quirks=True)
+
+            for extension, process, parse, build in (
+                    ('.words', process_words, fastparse.parse_words,
+                     fastparse.to_words),
+                    ('.phones', process_phones, fastparse.parse_phones,
+                     fastparse.to_phones),
+                    ('.log', process_logs, fastparse.parse_logs,
+                     fastparse.to_logs)):
+                expected = list(process(io.StringIO(files[extension])))
+                entries = build(parse(files[extension]))
+
+                assert_equal([repr(e) for e in entries],
+                             [repr(e) for e in expected])
+
+    def test_one_quirk(self):
+        files = synthetic_track(100, seed=1, quirks=['phone_suffix'])
+        words = list(process_words(io.StringIO(files['.words'])))
+
+        assert_false(any(word.misaligned for word in words))
+        assert_true(re.search(r'(\+1|;)\n', files['.phones']))
+
+    @raises(ValueError)
+    def test_unknown_quirk(self):
+        synthetic_track(10, quirks=['typo'])
+
+    def test_synthetic_wav(self):
+        wav = wave.open(io.BytesIO(synthetic_wav(2.5, 8000)))
+
+        assert_equal(wav.getnframes(), 20000)
+        assert_equal(wav.getframerate(), 8000)
+
+    def test_synthetic_speaker(self):
+        path = synthetic_speaker(self.folder, 's02', tracks=3, words=50,
+                                 wav=True)
+
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+
+        assert_equal(names, ['s02/s0201a.zip', 's02/s0201b.zip',
+                             's02/s0202a.zip'])
+        assert_true(all(re.match(TRACK_RE, name) for name in names))
+
+        speaker = Speaker.from_zip(path, load_wavs=True)
+
+        assert_equal([t.name for t in speaker], ['s0201a', 's0201b', 's0202a'])
+        assert_equal(len(speaker[1].words), 50)
+        assert_true(speaker[1].wav.getnframes() / 16000 >
+                    speaker[1].words[-1].end)
+
+    @raises(ValueError)
+    def test_too_many_tracks(self):
+        synthetic_speaker(self.folder, tracks=13)
+
+    @raises(ValueError)
+    def test_unknown_speaker(self):
+        synthetic_speaker(self.folder, 's99')
+
+    def test_synthetic_corpus(self):
+        paths = synthetic_corpus(os.path.join(self.folder, 'corpus'),
+                                 speakers=3, tracks=2, words=20, quirks=True)
+
+        assert_equal([os.path.basename(p) for p in paths],
+                     ['s01.zip', 's02.zip', 's03.zip'])
+
+        speakers = list(corpus(os.path.join(self.folder, 'corpus')))
+
+        assert_equal([s.name for s in speakers], ['s01', 's02', 's03'])
+        assert_equal(sum(len(s.tracks) for s in speakers), 6)
+        assert_not_equal(speakers[0][0].txt, speakers[1][0].txt)
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from nose.tools import *
+
+import io
+import os
+
+from buckeye import Track, TrackTable, Vocabulary
+from buckeye import process_logs, process_phones, process_words
+from buckeye import fastparse
+from buckeye.synth import synthetic_track
+from buckeye.table import WORD_COLUMNS, PHONE_COLUMNS, LOG_COLUMNS
+
+
+class TestVocabulary(object):
+
+    def setup(self):
+        self.labels = Vocabulary(['the', 'cat'])
+
+    def test_code(self):
+        assert_equal(self.labels.code('the'), 0)
+        assert_equal(self.labels.code('cat'), 1)
+        assert_equal(self.labels.code('mat'), 2)
+        assert_equal(self.labels.code(None), -1)
+        assert_equal(len(self.labels), 3)
+
+    def test_getitem(self):
+        assert_equal(self.labels[1], 'cat')
+        assert_is_none(self.labels[-1])
+
+    def test_find(self):
+        assert_equal(self.labels.find('cat'), 1)
+        assert_equal(self.labels.find('mat'), -2)
+        assert_not_in('mat', self.labels)
+
+
+class TestTrackTable(object):
+
+    @classmethod
+    def setup_class(cls):
+        cls.path = os.path.join('test', 'files', 'test.zip')
+        cls.track = Track.from_zip(cls.path)
+        cls.table = cls.track.as_table()
+
+    def test_columns(self):
+        assert_equal(len(self.table.word_beg), 6)
+        assert_equal(len(self.table.phone_beg), 14)
+        assert_equal(len(self.table.log_beg), 4)
+
+        assert_equal(list(self.table.word_end),
+                     [w.end for w in self.track.words])
+        assert_equal(self.table.labels[self.table.word_label[1]], 'cat')
+        assert_equal(self.table.labels[self.table.word_phonetic[0]], 'dh ah')
+        assert_equal(list(self.table.word_pause), [0] * 6)
+
+    def test_phone_offsets(self):
+        assert_equal(self.table.word_phone_beg[1], 2)
+        assert_equal(self.table.word_phone_end[1], 5)
+
+    def test_words(self):
+        assert_equal(len(self.table.words), 6)
+        assert_equal([repr(w) for w in self.table.words],
+                     [repr(w) for w in self.track.words])
+        assert_equal([p.seg for p in self.table.words[1].phones],
+                     ['k', 'ae', 't'])
+        assert_equal(repr(self.table.words[-1]), repr(self.track.words[-1]))
+
+    def test_phones_and_log(self):
+        assert_equal([repr(p) for p in self.table.phones[2:5]],
+                     [repr(p) for p in self.track.phones[2:5]])
+        assert_equal([repr(l) for l in self.table.log],
+                     [repr(l) for l in self.track.log])
+
+    @raises(IndexError)
+    def test_out_of_range(self):
+        self.table.words[6]
+
+    def test_from_zip(self):
+        table = TrackTable.from_zip(self.path, labels=self.table.labels)
+
+        assert_equal(table.name, 'test')
+        assert_equal(list(table.word_label), list(self.table.word_label))
+        assert_equal(list(table.phone_seg), list(self.table.phone_seg))
+        assert_equal(list(table.word_phone_end),
+                     list(self.table.word_phone_end))
+
+    def test_from_zip_fast(self):
+        table = TrackTable.from_zip(self.path, labels=self.table.labels,
+                                    parser='fast')
+
+        for column in WORD_COLUMNS + PHONE_COLUMNS + LOG_COLUMNS:
+            assert_equal(list(getattr(table, column)),
+                         list(getattr(self.table, column)))
+
+    def test_from_columns(self):
+        files = synthetic_track(500, seed=2)
+
+        expected = TrackTable.from_entries(
+            'synthetic', process_words(io.StringIO(files['.words'])),
+            process_phones(io.StringIO(files['.phones'])),
+            process_logs(io.StringIO(files['.log'])))
+
+        table = TrackTable.from_columns(
+            'synthetic', fastparse.parse_words(files['.words']),
+            fastparse.parse_phones(files['.phones']),
+            fastparse.parse_logs(files['.log']), expected.labels)
+
+        for column in WORD_COLUMNS + PHONE_COLUMNS + LOG_COLUMNS:
+            assert_equal(list(getattr(table, column)),
+                         list(getattr(expected, column)))
+
+    @raises(ValueError)
+    def test_from_zip_unknown_parser(self):
+        TrackTable.from_zip(self.path, parser='slow')
+
+    def test_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        arrays = self.table.arrays()
+
+        assert_equal(arrays['word_beg'].dtype, numpy.float64)
+        assert_almost_equal(arrays['word_end'].sum(),
+                            sum(w.end for w in self.track.words))
+        assert_equal(arrays['phone_seg'][0], self.table.phone_seg[0])
+
+    def test_utterance_bounds(self):
+        try:
+            import numpy
+        except ImportError:
+            from nose import SkipTest
+            raise SkipTest('NumPy is not installed')
+
+        assert_equal(self.table.utterance_bounds().tolist(), [[0, 6]])
+        assert_equal(len(self.table.utterance_bounds([0.5, 1.0])), 2)
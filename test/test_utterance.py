@@ -3,10 +3,13 @@ from __future__ import division
 from __future__ import print_function
 
 from nose.tools import *
+from nose import SkipTest
+
+import random
 
 from buckeye.containers import Word, Pause
 from buckeye.utterance import Utterance
-from buckeye.utterance import words_to_utterances
+from buckeye.utterance import words_to_utterances, utterance_bounds
 
 
 class TestUtterance(object):
@@ -419,3 +422,77 @@ class TestWordsToUtterances(object):
         assert_equal(words[6].orthography, utterances[1][0].orthography)
         assert_equal(words[6].phonemic, utterances[1][0].phonemic)
         assert_equal(words[6].phonetic, utterances[1][0].phonetic)
+
+
+class TestUtteranceBounds(object):
+
+    @classmethod
+    def setup_class(cls):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest('NumPy is not installed')
+
+        rng = random.Random(0)
+        cls.tracks = []
+
+        for i in range(100):
+            items = []
+            time = 0.0
+
+            for j in range(rng.randint(0, 60)):
+                dur = rng.choice([0.05, 0.1, 0.13, 0.2, 0.3, 0.7])
+
+                if rng.random() < 0.45:
+                    items.append(Pause('<SIL>', time, time + dur))
+
+                else:
+                    items.append(Word('uh', time, time + dur))
+
+                time += dur
+
+            cls.tracks.append(items)
+
+        cls.seps = [0.1, 0.2, 0.3, 0.35, 0.5, 1.0]
+
+    def check_bounds(self, items, strip_pauses):
+        begs = [item.beg for item in items]
+        ends = [item.end for item in items]
+        pauses = [isinstance(item, Pause) for item in items]
+
+        bounds = utterance_bounds(begs, ends, pauses, self.seps, strip_pauses)
+
+        for sep, rows in zip(self.seps, bounds):
+            expected = [(items.index(utt[0]), items.index(utt[-1]) + 1)
+                        for utt in words_to_utterances(items, sep,
+                                                       strip_pauses)]
+
+            assert_equal([tuple(row) for row in rows.tolist()], expected)
+
+    def test_strip_pauses(self):
+        for items in self.tracks:
+            self.check_bounds(items, True)
+
+    def test_keep_pauses(self):
+        for items in self.tracks:
+            self.check_bounds(items, False)
+
+    def test_scalar_sep(self):
+        items = self.tracks[1]
+
+        begs = [item.beg for item in items]
+        ends = [item.end for item in items]
+        pauses = [isinstance(item, Pause) for item in items]
+
+        bounds = utterance_bounds(begs, ends, pauses, 0.5)
+
+        assert_equal(bounds.shape[1], 2)
+        assert_equal(len(bounds), len(list(words_to_utterances(items))))
+
+    def test_empty(self):
+        assert_equal(utterance_bounds([], [], [], 0.5).shape, (0, 2))
+        assert_equal(utterance_bounds([], [], [], 0.5, False).shape, (0, 2))
+
+    @raises(ValueError)
+    def test_nonpositive_sep(self):
+        utterance_bounds([0.0], [1.0], [False], 0)